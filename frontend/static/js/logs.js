@@ -18,6 +18,9 @@ window.LogsModule = {
     totalPages: 1,
     pageSize: 20,
     totalLogs: 0,
+    nextCursor: null, // Cursor for the next (older) page
+    prevCursor: null, // Cursor for the previous (newer) page
+    pageCursor: null, // Cursor query for the page being loaded, e.g. 'before=...'
     
     // Element references
     elements: {},
@@ -36,8 +39,7 @@ window.LogsModule = {
         
         // Load initial logs for the default app without resetting pagination
         console.log('[LogsModule] Loading initial logs...');
-        this.loadLogsFromAPI(this.currentLogApp);
-        this.setupLogPolling(this.currentLogApp);
+        this.loadLogsAndStream(this.currentLogApp);
         
         this.initialized = true;
         console.log('[LogsModule] Initialization complete');
@@ -344,16 +346,82 @@ window.LogsModule = {
             this.elements.logConnectionStatus.className = '';
         }
         
-        // Load logs for the current page (don't always reset to page 1)
+        // Load logs for the current page (don't always reset to page 1), then follow new ones live
         console.log(`[LogsModule] connectEventSource - loading page ${this.currentPage} for app ${appType}`);
-        this.loadLogsFromAPI(appType);
-        
-        // Set up polling with user's configured interval
-        this.setupLogPolling(appType);
+        this.loadLogsAndStream(appType);
         
         // Status will be updated by loadLogsFromAPI on success/failure
     },
     
+    // Load the current page, then stream logs written after it
+    loadLogsAndStream: function(appType) {
+        this.closeLogStreams();
+        if (this.logPollingInterval) {
+            clearInterval(this.logPollingInterval);
+            this.logPollingInterval = null;
+        }
+        this.loadLogsFromAPI(appType).then(latestId => {
+            // The user may have switched apps while the page was loading
+            if (appType === this.currentLogApp && !this.eventSources[appType] && !this.logPollingInterval) {
+                this.setupLogStream(appType, latestId);
+            }
+        });
+    },
+    
+    // Stream new logs from the server (/logs) as they are written, falling back to polling
+    setupLogStream: function(appType, lastId) {
+        if (typeof EventSource === 'undefined') {
+            this.setupLogPolling(appType);
+            return;
+        }
+        
+        // last_id resumes right after the page we just loaded; reconnects send Last-Event-ID themselves
+        let streamUrl = `./logs?app=${encodeURIComponent(appType)}`;
+        const currentLogLevel = this.elements.logLevelSelect ? this.elements.logLevelSelect.value : 'all';
+        if (currentLogLevel !== 'all') {
+            streamUrl += `&level=${currentLogLevel.toUpperCase()}`;
+        }
+        if (lastId !== undefined && lastId !== null) {
+            streamUrl += `&last_id=${lastId}`;
+        }
+        
+        const source = new EventSource(streamUrl);
+        let opened = false;
+        let failures = 0;
+        source.onopen = () => {
+            opened = true;
+            failures = 0;
+        };
+        source.onmessage = (event) => {
+            // Live entries only belong on the newest page
+            if (this.currentPage === 1) {
+                this.processLogsFromAPI([event.data], appType, true);
+            }
+        };
+        source.addEventListener('reset', () => {
+            // More logs were missed while disconnected than the server replays - reload the page
+            if (this.currentPage === 1) {
+                this.loadLogsFromAPI(appType, false);
+            }
+        });
+        source.onerror = () => {
+            // EventSource reconnects on its own after a working stream drops (e.g. the server
+            // cut off a slow client). Fall back to polling when it gives up (a 429 when too
+            // many streams are open closes it), when the first connect fails, or when
+            // reconnects keep failing.
+            failures++;
+            if (source.readyState === EventSource.CLOSED || !opened || failures >= 3) {
+                console.warn(`[LogsModule] Log stream for ${appType} unavailable, falling back to polling`);
+                source.close();
+                if (this.eventSources[appType] === source) {
+                    delete this.eventSources[appType];
+                    this.setupLogPolling(appType);
+                }
+            }
+        };
+        this.eventSources[appType] = source;
+    },
+    
     // Set up log polling with user's configured interval
     setupLogPolling: function(appType) {
         // Fetch the log refresh interval from general settings
@@ -394,24 +462,25 @@ window.LogsModule = {
         const apiUrl = `./api/logs/${appType}`;
         
         // For polling, always get latest logs (offset=0, small limit)
-        // For pagination, use current page and page size
+        // For pagination, follow the cursor of the page we came from so deep pages stay cheap
         let limit, offset;
+        const pageCursor = isPolling || this.currentPage === 1 ? null : this.pageCursor;
         if (isPolling) {
             limit = 20;
             offset = 0;
         } else {
             limit = this.pageSize;
-            offset = (this.currentPage - 1) * this.pageSize;
+            offset = pageCursor ? 0 : (this.currentPage - 1) * this.pageSize;
         }
         
         // Include level filter in API call if a specific level is selected
         const currentLogLevel = this.elements.logLevelSelect ? this.elements.logLevelSelect.value : 'all';
-        let apiParams = `limit=${limit}&offset=${offset}`;
+        let apiParams = pageCursor ? `limit=${limit}&${pageCursor}` : `limit=${limit}&offset=${offset}`;
         if (currentLogLevel !== 'all') {
             apiParams += `&level=${currentLogLevel.toUpperCase()}`;
         }
         
-        HuntarrUtils.fetchWithTimeout(`${apiUrl}?${apiParams}`)
+        return HuntarrUtils.fetchWithTimeout(`${apiUrl}?${apiParams}`)
             .then(response => {
                 return response.json();
             })
@@ -423,6 +492,8 @@ window.LogsModule = {
                     if (!isPolling && data.total !== undefined) {
                         this.totalLogs = data.total;
                         this.totalPages = Math.max(1, Math.ceil(this.totalLogs / this.pageSize));
+                        this.nextCursor = data.next_cursor || null;
+                        this.prevCursor = data.prev_cursor || null;
                         console.log(`[LogsModule] Updated pagination: totalLogs=${this.totalLogs}, totalPages=${this.totalPages}, currentPage=${this.currentPage}`);
                         this.updatePaginationUI();
                     } else if (isPolling) {
@@ -434,6 +505,7 @@ window.LogsModule = {
                         this.elements.logConnectionStatus.textContent = 'Connected';
                         this.elements.logConnectionStatus.className = 'status-connected';
                     }
+                    return data.latest_id;
                 } else {
                     console.error('[LogsModule] Failed to load logs:', data.error || 'No logs in response');
                     if (this.elements.logConnectionStatus) {
@@ -609,7 +681,16 @@ window.LogsModule = {
             console.log('[LogsModule] Cleared log polling interval');
         }
         
-        // Clear any remaining event sources (legacy)
+        this.closeLogStreams();
+        
+        if (this.elements.logConnectionStatus) {
+            this.elements.logConnectionStatus.textContent = 'Disconnected';
+            this.elements.logConnectionStatus.className = 'status-disconnected';
+        }
+    },
+    
+    // Close live log streams
+    closeLogStreams: function() {
         Object.keys(this.eventSources).forEach(key => {
             const source = this.eventSources[key];
             if (source) {
@@ -624,11 +705,6 @@ window.LogsModule = {
             }
             delete this.eventSources[key];
         });
-        
-        if (this.elements.logConnectionStatus) {
-            this.elements.logConnectionStatus.textContent = 'Disconnected';
-            this.elements.logConnectionStatus.className = 'status-disconnected';
-        }
     },
     
     // Clear all logs
@@ -818,8 +894,8 @@ window.LogsModule = {
         // Reset to first page when changing filter
         this.currentPage = 1;
         
-        // Reload logs from API with new filter
-        this.loadLogsFromAPI(this.currentLogApp, false);
+        // Reload logs from API with new filter and restart the live stream for it
+        this.loadLogsAndStream(this.currentLogApp);
     },
     
     // Apply filter to single entry
@@ -940,11 +1016,13 @@ window.LogsModule = {
         if (direction === 'prev' && this.currentPage > 1) {
             const oldPage = this.currentPage;
             this.currentPage--;
+            this.pageCursor = this.prevCursor ? `after=${encodeURIComponent(this.prevCursor)}` : null;
             console.log(`[LogsModule] PREV: Changed from page ${oldPage} to page ${this.currentPage}`);
             this.loadLogsFromAPI(this.currentLogApp, false);
         } else if (direction === 'next' && this.currentPage < this.totalPages) {
             const oldPage = this.currentPage;
             this.currentPage++;
+            this.pageCursor = this.nextCursor ? `before=${encodeURIComponent(this.nextCursor)}` : null;
             console.log(`[LogsModule] NEXT: Changed from page ${oldPage} to page ${this.currentPage}`);
             this.loadLogsFromAPI(this.currentLogApp, false);
         } else {
@@ -105,21 +105,21 @@ if sys.platform == 'win32' and len(sys.argv) > 1:
 
 try:
     # Import the Flask app instance
-    from primary.web_server import app
+    from src.primary.web_server import app
     # Import the background task starter function and shutdown helpers from the renamed file
-    from primary.background import start_huntarr, stop_event, shutdown_threads
+    from src.primary.background import start_huntarr, stop_event, shutdown_threads
     # Configure logging first
     import logging
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-    from primary.utils.logger import setup_main_logger, get_logger
-    from primary.utils.clean_logger import setup_clean_logging
+    from src.primary.utils.logger import setup_main_logger, get_logger
+    from src.primary.utils.clean_logger import setup_clean_logging
     
     # Initialize main logger
     huntarr_logger = setup_main_logger()
     
     # Initialize timezone from TZ environment variable
     try:
-        from primary.settings_manager import initialize_timezone_from_env
+        from src.primary.settings_manager import initialize_timezone_from_env
         initialize_timezone_from_env()
         huntarr_logger.info("Timezone initialization completed.")
     except Exception as e:
@@ -238,7 +238,7 @@ def run_web_server():
     try:
         import sys
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-        from primary.settings_manager import load_settings
+        from src.primary.settings_manager import load_settings
         
         settings = load_settings("general")
         local_access_bypass = settings.get("local_access_bypass", False)
@@ -338,7 +338,7 @@ def main_shutdown_handler(signum, frame):
     
     # Immediate database checkpoint to prevent corruption
     try:
-        from primary.utils.database import get_database, get_logs_database
+        from src.primary.utils.database import get_database, get_logs_database
         
         huntarr_logger.info("Performing emergency database checkpoint...")
         
@@ -391,7 +391,7 @@ def cleanup_handler():
     
     # Shutdown databases gracefully with timeout
     try:
-        from primary.utils.database import get_database, get_logs_database
+        from src.primary.utils.database import get_database, get_logs_database
         
         # Close main database connections
         main_db = get_database()
@@ -417,6 +417,15 @@ def cleanup_handler():
                     huntarr_logger.debug("Logs database WAL checkpoint completed")
             except Exception as logs_error:
                 huntarr_logger.warning(f"Error during logs database cleanup: {logs_error}")
+        
+        # Deliver queued log records (later ones are written synchronously), write pending
+        # repeat summaries, then close pooled connections for both databases
+        from src.primary.utils.log_queue import stop_log_listener
+        stop_log_listener()
+        from src.primary.utils.clean_logger import flush_coalesced_logs
+        flush_coalesced_logs()
+        from src.primary.utils.database import close_databases
+        close_databases()
                 
         huntarr_logger.info("Database shutdown completed")
         
@@ -446,19 +455,19 @@ def main():
     
     # Initialize databases with default configurations
     try:
-        from primary.settings_manager import initialize_database
+        from src.primary.settings_manager import initialize_database
         initialize_database()
         huntarr_logger.info("Main database initialization completed successfully")
         
         # Initialize base URL from BASE_URL environment variable early
         # This needs to happen before web server initialization
         try:
-            from primary.settings_manager import initialize_base_url_from_env
+            from src.primary.settings_manager import initialize_base_url_from_env
             initialize_base_url_from_env()
             huntarr_logger.info("Base URL initialization completed.")
             
             # Reconfigure the web server with the updated base URL
-            from primary.web_server import reconfigure_base_url
+            from src.primary.web_server import reconfigure_base_url
             reconfigure_base_url()
             huntarr_logger.info("Web server reconfigured with updated base URL.")
         except Exception as e:
@@ -466,7 +475,7 @@ def main():
         
         # Initialize database logging system (now uses main huntarr.db)
         try:
-            from primary.utils.database import get_logs_database, schedule_log_cleanup
+            from src.primary.utils.database import get_logs_database, schedule_log_cleanup
             logs_db = get_logs_database()
             schedule_log_cleanup()
             huntarr_logger.info("Database logging system initialized with scheduled cleanup.")
@@ -536,7 +545,7 @@ def main():
         else:
              huntarr_logger.info("Background thread was not started.")
 
-        # Call the shutdown_threads function from primary.main (if it does more than just join)
+        # Call the shutdown_threads function from src.primary.background (if it does more than just join)
         # This might be redundant if start_huntarr handles its own cleanup via stop_event
         # huntarr_logger.info("Calling shutdown_threads()...")
         # shutdown_threads() # Uncomment if primary.main.shutdown_threads() does more cleanup
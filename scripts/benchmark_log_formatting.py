@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Huntarr Log Formatting Benchmark
+
+Measures the per-record cost of Huntarr's logging pipeline: every record is
+formatted by the console and file handlers (LocalTimeFormatter, one
+formatter shared by both) and cleaned for logs.db by DatabaseLogHandler.
+
+"legacy" is the previous implementation (timezone looked up and a datetime
+built for every line, ANSI regex compiled per call, seven prefix re.sub
+passes, the message rendered again for the database). "current" uses the
+code in src/primary/utils. Queueing and writing are not included.
+
+Usage:
+- python scripts/benchmark_log_formatting.py
+- python scripts/benchmark_log_formatting.py --records 200000 --per-second 20
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytz
+
+# Keep Huntarr's log files and config out of the real config directory
+os.environ["HUNTARR_CONFIG_DIR"] = tempfile.mkdtemp(prefix="huntarr-bench-")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.primary.utils import timezone_utils  # noqa: E402
+
+# Serve the timezone from cache like a running instance would (and skip the settings database)
+timezone_utils._timezone_cache = pytz.timezone("Europe/Bucharest")
+timezone_utils._cache_expires = None
+
+from src.primary.utils.clean_logger import clean_log_message, record_message  # noqa: E402
+from src.primary.utils.logger import LocalTimeFormatter  # noqa: E402
+
+LOG_FORMAT = "%(asctime)s - huntarr.sonarr - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+MESSAGES = [
+    ("is_processed check: sonarr/Default, ID:%d, Found:False", True),
+    ("Still sleeping, %d seconds remaining before next cycle...", True),
+    ("Skipping already processed season %d", True),
+    ("Connecting to Sonarr instance 'Default' at http://sonarr:8989", False),
+    ("\x1b[32mSearch command completed\x1b[0m for series   %d", True),
+    ("2024-01-01 12:00:00,123 INFO: Found %d missing episodes", True),
+    ("[2024-01-01 12:00:00] Hunting for upgrades", False),
+    ("ERROR: API request failed with status %d", True),
+    # Stacked prefixes: each one is removed once, in the legacy order
+    ("2024-01-01 12:00:00,123 [2024-01-01 12:00:00] INFO:DEBUG: Retrying in %d seconds", True),
+    ("\x1b[31mDEBUG:INFO:\x1b[0m   queue   at %d items", True),
+    ("WARNING:CRITICAL: 2024-01-01 12:00:00,123 disk %d%% full", True),
+]
+
+_legacy_tz = None
+_legacy_tz_time = 0
+
+
+def legacy_get_user_timezone():
+    """Previous timezone_utils.get_user_timezone fast path (5 second TTL check)"""
+    global _legacy_tz, _legacy_tz_time
+    import time as time_module
+    current_time = time_module.time()
+    if _legacy_tz and (current_time - _legacy_tz_time) < 5:
+        return _legacy_tz
+    _legacy_tz = pytz.timezone("Europe/Bucharest")
+    _legacy_tz_time = current_time
+    return _legacy_tz
+
+
+class LegacyLocalTimeFormatter(logging.Formatter):
+    """Previous LocalTimeFormatter: timezone lookup and datetime per line"""
+
+    def _get_user_timezone(self):
+        try:
+            from src.primary.utils.timezone_utils import get_user_timezone  # noqa: F401 (import cost per line)
+            return legacy_get_user_timezone()
+        except Exception:
+            return pytz.UTC
+
+    def formatTime(self, record, datefmt=None):
+        user_tz = self._get_user_timezone()
+        import datetime as datetime_module
+        ct = datetime_module.datetime.fromtimestamp(record.created, tz=user_tz)
+        s = ct.strftime(datefmt) if datefmt else ct.strftime("%Y-%m-%d %H:%M:%S")
+        return s + f" {user_tz}"
+
+
+def legacy_clean_message(message: str) -> str:
+    """Previous CleanLogFormatter._clean_message"""
+    if not message:
+        return ""
+    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+    message = ansi_escape.sub('', message)
+    message = re.sub(r'\s+', ' ', message).strip()
+    for prefix_pattern in [
+        r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ',
+        r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] ',
+        r'^INFO:', r'^DEBUG:', r'^WARNING:', r'^ERROR:', r'^CRITICAL:',
+    ]:
+        message = re.sub(prefix_pattern, '', message)
+    return message.strip()
+
+
+def make_records(count: int, per_second: int, seed: int):
+    rng = random.Random(seed)
+    start = time.time()
+    records = []
+    for i in range(count):
+        template, has_arg = MESSAGES[rng.randrange(len(MESSAGES))]
+        args = (rng.randrange(100000),) if has_arg else None
+        record = logging.LogRecord("huntarr.sonarr", logging.INFO, __file__, 0, template, args, None)
+        record.created = start + i / per_second
+        records.append(record)
+    return records
+
+
+def run_legacy(records, formatter):
+    for record in records:
+        formatter.format(record)  # console handler
+        formatter.format(record)  # file handler
+        legacy_clean_message(record.getMessage())  # database handler
+
+
+def run_current(records, formatter):
+    for record in records:
+        formatter.format(record)  # console handler
+        formatter.format(record)  # file handler (reuses the console result)
+        clean_log_message(record_message(record))  # database handler
+
+
+def best_rate(label, run, formatter_factory, args):
+    best = 0.0
+    for _ in range(args.repeat):
+        records = make_records(args.records, args.per_second, args.seed)
+        formatter = formatter_factory()
+        start = time.perf_counter()
+        run(records, formatter)
+        best = max(best, args.records / (time.perf_counter() - start))
+    print(f"{label:10} {best:>12,.0f} records/s")
+    return best
+
+
+def benchmark(args):
+    # The cleaner must produce exactly what it did before
+    samples = [record.getMessage() for record in make_records(2000, args.per_second, args.seed)]
+    mismatches = sum(1 for message in samples if clean_log_message(message) != legacy_clean_message(message))
+    print(f"Cleaner output differences on {len(samples)} samples: {mismatches}")
+
+    print(f"{args.records:,} records, {args.per_second} per second, best of {args.repeat}")
+    legacy = best_rate("legacy", run_legacy,
+                       lambda: LegacyLocalTimeFormatter(LOG_FORMAT, datefmt=DATE_FORMAT), args)
+    current = best_rate("current", run_current,
+                        lambda: LocalTimeFormatter(LOG_FORMAT, datefmt=DATE_FORMAT), args)
+    print(f"Speedup: {current / legacy:.2f}x")
+
+    # Stage breakdown
+    messages = samples * max(1, args.records // len(samples))
+    for label, clean in (("legacy", legacy_clean_message), ("current", clean_log_message)):
+        start = time.perf_counter()
+        for message in messages:
+            clean(message)
+        print(f"clean_message {label:8} {len(messages) / (time.perf_counter() - start):>12,.0f} msgs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs current log formatting")
+    parser.add_argument("--records", type=int, default=100000, help="Records per run")
+    parser.add_argument("--per-second", type=int, default=50, help="Records logged per second of log time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    benchmark(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
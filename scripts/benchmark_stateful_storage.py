@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Huntarr Stateful Storage Benchmark
+
+Compares the legacy stateful_processed_ids layout (text app_type /
+instance_name / media_id per row plus two secondary indexes) with the
+compact layout (stateful_instances dictionary + WITHOUT ROWID
+stateful_processed keyed by (instance_id, media_key)).
+
+Reports database size after VACUUM, bulk insert time, and latency of the
+two hot paths: loading an instance's processed set and single-ID lookups.
+
+Usage:
+- python scripts/benchmark_stateful_storage.py
+- python scripts/benchmark_stateful_storage.py --instances 8 --ids 50000
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Load the key encoding directly so the benchmark doesn't initialise Huntarr
+_spec = importlib.util.spec_from_file_location(
+    "media_keys", Path(__file__).parent.parent / "src" / "primary" / "utils" / "media_keys.py"
+)
+media_keys = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(media_keys)
+
+APP_TYPES = ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros"]
+
+LEGACY_SCHEMA = [
+    '''
+    CREATE TABLE stateful_processed_ids (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_type TEXT NOT NULL,
+        instance_name TEXT NOT NULL,
+        media_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(app_type, instance_name, media_id)
+    )
+    ''',
+    'CREATE INDEX idx_stateful_processed_app_instance ON stateful_processed_ids(app_type, instance_name)',
+    'CREATE INDEX idx_stateful_processed_media_id ON stateful_processed_ids(media_id)',
+]
+
+COMPACT_SCHEMA = [
+    '''
+    CREATE TABLE stateful_instances (
+        id INTEGER PRIMARY KEY,
+        app_type TEXT NOT NULL,
+        instance_name TEXT NOT NULL,
+        UNIQUE(app_type, instance_name)
+    )
+    ''',
+    '''
+    CREATE TABLE stateful_processed (
+        instance_id INTEGER NOT NULL,
+        media_key NOT NULL,
+        created_at INTEGER NOT NULL,
+        PRIMARY KEY (instance_id, media_key)
+    ) WITHOUT ROWID
+    ''',
+]
+
+
+def generate_dataset(instances, ids_per_instance, season_ratio, seed):
+    """Return {(app_type, instance_name): [media_id, ...]} with realistic IDs"""
+    rng = random.Random(seed)
+    dataset = {}
+    for n in range(instances):
+        app_type = APP_TYPES[n % len(APP_TYPES)]
+        instance_name = f"{app_type.title()} Instance {n + 1}"
+        ids = set()
+        while len(ids) < ids_per_instance:
+            if app_type == "sonarr" and rng.random() < season_ratio:
+                ids.add(f"{rng.randint(1, 400000)}_{rng.randint(0, 40)}")
+            else:
+                ids.add(str(rng.randint(1, 5000000)))
+        dataset[(app_type, instance_name)] = sorted(ids)
+    return dataset
+
+
+def open_database(path):
+    conn = sqlite3.connect(str(path))
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    return conn
+
+
+def load_legacy(conn, dataset):
+    for statement in LEGACY_SCHEMA:
+        conn.execute(statement)
+    start = time.perf_counter()
+    for (app_type, instance_name), ids in dataset.items():
+        conn.executemany(
+            'INSERT OR IGNORE INTO stateful_processed_ids (app_type, instance_name, media_id) VALUES (?, ?, ?)',
+            ((app_type, instance_name, media_id) for media_id in ids)
+        )
+    conn.commit()
+    return time.perf_counter() - start
+
+
+def load_compact(conn, dataset):
+    for statement in COMPACT_SCHEMA:
+        conn.execute(statement)
+    start = time.perf_counter()
+    now = int(time.time())
+    for (app_type, instance_name), ids in dataset.items():
+        conn.execute('INSERT OR IGNORE INTO stateful_instances (app_type, instance_name) VALUES (?, ?)',
+                     (app_type, instance_name))
+        instance_id = conn.execute('SELECT id FROM stateful_instances WHERE app_type = ? AND instance_name = ?',
+                                   (app_type, instance_name)).fetchone()[0]
+        conn.executemany(
+            'INSERT OR IGNORE INTO stateful_processed (instance_id, media_key, created_at) VALUES (?, ?, ?)',
+            ((instance_id, media_keys.encode_media_key(media_id), now) for media_id in ids)
+        )
+    conn.commit()
+    return time.perf_counter() - start
+
+
+def database_size(conn, path):
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.execute('VACUUM')
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return os.path.getsize(path)
+
+
+def time_calls(func, args_list):
+    """Run func over args_list and return per-call latencies in milliseconds"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"avg {statistics.mean(samples):8.3f} ms   p95 {p95:8.3f} ms"
+
+
+def benchmark(args):
+    dataset = generate_dataset(args.instances, args.ids, args.season_ratio, args.seed)
+    rng = random.Random(args.seed + 1)
+    keys = list(dataset)
+    lookups = []
+    for _ in range(args.lookups):
+        key = rng.choice(keys)
+        # Half hits, half misses
+        media_id = rng.choice(dataset[key]) if rng.random() < 0.5 else str(rng.randint(5000001, 9000000))
+        lookups.append((key, media_id))
+    total_rows = sum(len(ids) for ids in dataset.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        compact_path = Path(tmp) / "compact.db"
+        legacy = open_database(legacy_path)
+        compact = open_database(compact_path)
+
+        legacy_insert = load_legacy(legacy, dataset)
+        compact_insert = load_compact(compact, dataset)
+        legacy_size = database_size(legacy, legacy_path)
+        compact_size = database_size(compact, compact_path)
+
+        instance_ids = {
+            (app_type, instance_name): instance_id
+            for app_type, instance_name, instance_id in compact.execute(
+                'SELECT app_type, instance_name, id FROM stateful_instances')
+        }
+
+        def legacy_get(key):
+            return {row[0] for row in legacy.execute(
+                'SELECT media_id FROM stateful_processed_ids WHERE app_type = ? AND instance_name = ?', key)}
+
+        def compact_get(key):
+            return {media_keys.decode_media_key(row[0]) for row in compact.execute(
+                'SELECT media_key FROM stateful_processed WHERE instance_id = ?', (instance_ids[key],))}
+
+        def legacy_is_processed(key, media_id):
+            return legacy.execute(
+                'SELECT 1 FROM stateful_processed_ids WHERE app_type = ? AND instance_name = ? AND media_id = ?',
+                (key[0], key[1], media_id)).fetchone() is not None
+
+        def compact_is_processed(key, media_id):
+            return compact.execute(
+                'SELECT 1 FROM stateful_processed WHERE instance_id = ? AND media_key = ?',
+                (instance_ids[key], media_keys.encode_media_key(media_id))).fetchone() is not None
+
+        # Both layouts must hold the same data
+        for key in keys:
+            assert legacy_get(key) == compact_get(key), f"Mismatch for {key}"
+
+        get_args = [(key,) for key in keys] * args.repeat
+        legacy_get_ms = time_calls(legacy_get, get_args)
+        compact_get_ms = time_calls(compact_get, get_args)
+        legacy_lookup_ms = time_calls(legacy_is_processed, lookups)
+        compact_lookup_ms = time_calls(compact_is_processed, lookups)
+
+        legacy.close()
+        compact.close()
+
+    print(f"Dataset: {args.instances} instances x {args.ids} IDs = {total_rows} rows "
+          f"({args.season_ratio:.0%} season keys on Sonarr instances)")
+    print()
+    print(f"{'':24}{'legacy':>18}{'compact':>18}")
+    print(f"{'Database size':24}{legacy_size / 1024:>15.0f} KB{compact_size / 1024:>15.0f} KB"
+          f"   ({compact_size / legacy_size:.0%} of legacy)")
+    print(f"{'Bulk insert':24}{legacy_insert * 1000:>15.0f} ms{compact_insert * 1000:>15.0f} ms")
+    print(f"{'Bytes per row':24}{legacy_size / total_rows:>18.1f}{compact_size / total_rows:>18.1f}")
+    print()
+    print(f"get_processed_ids  legacy : {summarize(legacy_get_ms)}")
+    print(f"get_processed_ids  compact: {summarize(compact_get_ms)}")
+    print(f"is_processed       legacy : {summarize(legacy_lookup_ms)}")
+    print(f"is_processed       compact: {summarize(compact_lookup_ms)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs compact stateful processed-ID storage")
+    parser.add_argument("--instances", type=int, default=6, help="Number of app instances")
+    parser.add_argument("--ids", type=int, default=20000, help="Processed IDs per instance")
+    parser.add_argument("--season-ratio", type=float, default=0.5,
+                        help="Share of Sonarr IDs that are <series>_<season> keys")
+    parser.add_argument("--lookups", type=int, default=20000, help="Single-ID lookups to time")
+    parser.add_argument("--repeat", type=int, default=5, help="Times each instance's full set is loaded")
+    parser.add_argument("--seed", type=int, default=42)
+    benchmark(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
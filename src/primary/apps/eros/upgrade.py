@@ -13,7 +13,7 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.eros import api as eros_api
 from src.primary.settings_manager import load_settings, get_advanced_setting
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id
 from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.state import check_state_reset
@@ -97,13 +97,8 @@ def process_cutoff_upgrades(
     eros_logger.info(f"Found {len(upgrade_eligible_data)} items eligible for quality upgrade.")
     
     # Filter out already processed items using stateful management
-    unprocessed_items = []
-    for item in upgrade_eligible_data:
-        item_id = str(item.get("id"))
-        if not is_processed("eros", instance_name, item_id):
-            unprocessed_items.append(item)
-        else:
-            eros_logger.debug(f"Skipping already processed item ID: {item_id}")
+    unprocessed_ids = set(filter_unprocessed("eros", instance_name, [str(item.get("id")) for item in upgrade_eligible_data]))
+    unprocessed_items = [item for item in upgrade_eligible_data if str(item.get("id")) in unprocessed_ids]
     
     eros_logger.info(f"Found {len(unprocessed_items)} unprocessed items out of {len(upgrade_eligible_data)} total items eligible for quality upgrade.")
     
@@ -13,7 +13,7 @@ from typing import Dict, Any, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.lidarr import api as lidarr_api
 from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_ids_bulk
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset
@@ -97,11 +97,8 @@ def process_missing_albums(
             lidarr_logger.info(f"Retrieved {len(missing_albums_data)} missing albums from random page selection.")
             
             # Convert to the expected format for album processing - keep IDs as integers
-            unprocessed_entities = []
-            for album in missing_albums_data:
-                album_id = album.get("id")  # Keep as integer, don't convert to string
-                if album_id and not is_processed("lidarr", instance_name, str(album_id)):  # Convert to string only for processed check
-                    unprocessed_entities.append(album_id)
+            album_ids = [album.get("id") for album in missing_albums_data if album.get("id")]
+            unprocessed_entities = filter_unprocessed("lidarr", instance_name, album_ids)
             
             search_entity_type = "album"
             
@@ -136,8 +133,7 @@ def process_missing_albums(
             
             # Filter out already processed artists
             lidarr_logger.info(f"Found {len(target_entities)} artists with missing albums before filtering")
-            unprocessed_entities = [eid for eid in target_entities 
-                                   if not is_processed("lidarr", instance_name, str(eid))]
+            unprocessed_entities = filter_unprocessed("lidarr", instance_name, target_entities)
             
             lidarr_logger.info(f"Found {len(unprocessed_entities)} unprocessed artists out of {len(target_entities)} total")
             search_entity_type = "artist"
@@ -224,9 +220,10 @@ def process_missing_albums(
                     if artist_info and isinstance(artist_info, dict):
                          artist_name = artist_info.get('artistName', artist_name)
                 
-                # Mark the artist as processed right away - BEFORE triggering the search
-                success = add_processed_id("lidarr", instance_name, str(artist_id))
-                lidarr_logger.debug(f"Added artist ID {artist_id} to processed list for {instance_name}, success: {success}")
+                # Mark the artist and all of its missing albums as processed right away - BEFORE triggering the search
+                album_ids = [album.get('id') for album in items_by_artist.get(artist_id, []) if album.get('id')]
+                success = add_processed_ids_bulk("lidarr", instance_name, [artist_id] + album_ids)
+                lidarr_logger.debug(f"Added artist ID {artist_id} and {len(album_ids)} album IDs to processed list for {instance_name}, success: {success}")
                 
                 # Trigger the search AFTER marking as processed
                 command_result = lidarr_api.search_artist(api_url, api_key, api_timeout, artist_id)
@@ -249,14 +246,6 @@ def process_missing_albums(
                         except Exception as e:
                             lidarr_logger.warning(f"Failed to tag artist {artist_id} with '{custom_tag}': {e}")
                 
-                # Also mark all albums from this artist as processed
-                if artist_id in items_by_artist:
-                    for album in items_by_artist[artist_id]:
-                        album_id = album.get('id')
-                        if album_id:
-                            album_success = add_processed_id("lidarr", instance_name, str(album_id))
-                            lidarr_logger.debug(f"Added album ID {album_id} to processed list for {instance_name}, success: {album_success}")
-                
                 # Log to history system
                 log_processed_media("lidarr", f"{artist_name}", artist_id, instance_name, "missing")
                 lidarr_logger.debug(f"Logged history entry for artist: {artist_name}")
@@ -312,9 +301,8 @@ def process_missing_albums(
                     lidarr_logger.info(f" {detail_line}")
 
             # Mark the albums as processed BEFORE triggering the search
-            for album_id in album_ids_to_search:
-                success = add_processed_id("lidarr", instance_name, str(album_id))
-                lidarr_logger.debug(f"Added album ID {album_id} to processed list for {instance_name}, success: {success}")
+            success = add_processed_ids_bulk("lidarr", instance_name, album_ids_to_search)
+            lidarr_logger.debug(f"Added {len(album_ids_to_search)} album IDs to processed list for {instance_name}, success: {success}")
             
             # Now trigger the search
             command_id = lidarr_api.search_albums(api_url, api_key, api_timeout, album_ids_to_search)
@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional, Callable, List, Union, Set # Added List,
 from src.primary.utils.logger import get_logger
 from src.primary.apps.lidarr import api as lidarr_api
 from src.primary.utils.history_utils import log_processed_media
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_ids_bulk
 from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset  # Add the missing import
@@ -99,13 +99,10 @@ def process_cutoff_upgrades(
         lidarr_logger.info(f"Retrieved {len(cutoff_unmet_data)} cutoff unmet albums from random page selection.")
 
         # Filter out already processed items
-        unprocessed_albums = []
-        for album in cutoff_unmet_data:
-            album_id = album.get('id')  # Keep as integer
-            if album_id and not is_processed("lidarr", instance_name, str(album_id)):  # Convert to string only for processed check
-                unprocessed_albums.append(album)
-            else:
-                lidarr_logger.debug(f"Skipping already processed album ID: {album_id}")
+        unprocessed_ids = set(filter_unprocessed(
+            "lidarr", instance_name, [album.get('id') for album in cutoff_unmet_data if album.get('id')]
+        ))
+        unprocessed_albums = [album for album in cutoff_unmet_data if album.get('id') in unprocessed_ids]
         
         lidarr_logger.info(f"Found {len(unprocessed_albums)} unprocessed albums out of {len(cutoff_unmet_data)} total albums eligible for quality upgrade.")
         
@@ -153,9 +150,8 @@ def process_cutoff_upgrades(
             # Continue processing if cap check fails - safer than stopping
 
         # Mark the albums as processed BEFORE triggering the search
-        for album_id in album_ids_to_search:
-            success = add_processed_id("lidarr", instance_name, str(album_id))
-            lidarr_logger.debug(f"Added album ID {album_id} to processed list for {instance_name}, success: {success}")
+        success = add_processed_ids_bulk("lidarr", instance_name, album_ids_to_search)
+        lidarr_logger.debug(f"Added {len(album_ids_to_search)} album IDs to processed list for {instance_name}, success: {success}")
 
         lidarr_logger.info(f"Triggering Album Search for {len(album_ids_to_search)} albums for upgrade on instance {instance_name}: {album_ids_to_search}")
         # Pass necessary details extracted above to the API function
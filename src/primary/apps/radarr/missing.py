@@ -12,7 +12,7 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.radarr import api as radarr_api
 from src.primary.stats_manager import increment_stat_only, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import load_settings, get_advanced_setting
 
@@ -174,13 +174,8 @@ def process_missing_movies(
     processing_done = False
     
     # Filter out already processed movies using stateful management
-    unprocessed_movies = []
-    for movie in missing_movies:
-        movie_id = str(movie.get("id"))
-        if not is_processed("radarr", instance_name, movie_id):
-            unprocessed_movies.append(movie)
-        else:
-            radarr_logger.debug(f"Skipping already processed movie ID: {movie_id}")
+    unprocessed_ids = set(filter_unprocessed("radarr", instance_name, [str(movie.get("id")) for movie in missing_movies]))
+    unprocessed_movies = [movie for movie in missing_movies if str(movie.get("id")) in unprocessed_ids]
     
     radarr_logger.info(f"Found {len(unprocessed_movies)} unprocessed missing movies out of {len(missing_movies)} total.")
     
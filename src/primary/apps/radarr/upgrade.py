@@ -11,7 +11,7 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.radarr import api as radarr_api
 from src.primary.stats_manager import increment_stat, increment_stat_only, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import get_advanced_setting, load_settings
 from src.primary.utils.date_utils import parse_date
@@ -122,13 +122,8 @@ def process_cutoff_upgrades(
         return False
 
     # Filter out already processed movies using stateful management
-    unprocessed_movies = []
-    for movie in upgrade_eligible_data:
-        movie_id = str(movie.get("id"))
-        if not is_processed("radarr", instance_name, movie_id):
-            unprocessed_movies.append(movie)
-        else:
-            radarr_logger.debug(f"Skipping already processed movie ID: {movie_id}")
+    unprocessed_ids = set(filter_unprocessed("radarr", instance_name, [str(movie.get("id")) for movie in upgrade_eligible_data]))
+    unprocessed_movies = [movie for movie in upgrade_eligible_data if str(movie.get("id")) in unprocessed_ids]
     
     radarr_logger.info(f"Found {len(unprocessed_movies)} unprocessed movies for upgrade out of {len(upgrade_eligible_data)} total.")
     
@@ -10,7 +10,7 @@ from typing import List, Dict, Any, Set, Callable
 from src.primary.utils.logger import get_logger
 from src.primary.apps.readarr import api as readarr_api
 from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.state import check_state_reset
@@ -99,13 +99,8 @@ def process_missing_books(
         return False
 
     # Filter out already processed books using stateful management (now book-based instead of author-based)
-    unprocessed_books = []
-    for book in missing_books_data:
-        book_id = str(book.get("id"))
-        if not is_processed("readarr", instance_name, book_id):
-            unprocessed_books.append(book)
-        else:
-            readarr_logger.debug(f"Skipping already processed book ID: {book_id}")
+    unprocessed_ids = set(filter_unprocessed("readarr", instance_name, [str(book.get("id")) for book in missing_books_data]))
+    unprocessed_books = [book for book in missing_books_data if str(book.get("id")) in unprocessed_ids]
 
     readarr_logger.info(f"Found {len(unprocessed_books)} unprocessed missing books out of {len(missing_books_data)} total.")
     
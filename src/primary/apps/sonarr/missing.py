@@ -13,7 +13,7 @@ from src.primary.utils.logger import get_logger
 from src.primary.settings_manager import load_settings, get_advanced_setting
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.stats_manager import increment_stat, increment_stat_only, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id, add_processed_ids_bulk
 from src.primary.apps.sonarr import api as sonarr_api
 
 # Get logger for the Sonarr app
@@ -166,13 +166,14 @@ def process_missing_seasons_packs_mode(
     seasons_list.sort(key=lambda x: x['episode_count'], reverse=True)
     
     # Filter out already processed seasons
-    unprocessed_seasons = []
-    for season in seasons_list:
-        season_id = f"{season['series_id']}_{season['season_number']}"
-        if not is_processed("sonarr", instance_name, season_id):
-            unprocessed_seasons.append(season)
-        else:
-            sonarr_logger.debug(f"Skipping already processed season ID: {season_id}")
+    unprocessed_ids = set(filter_unprocessed(
+        "sonarr", instance_name,
+        [f"{season['series_id']}_{season['season_number']}" for season in seasons_list]
+    ))
+    unprocessed_seasons = [
+        season for season in seasons_list
+        if f"{season['series_id']}_{season['season_number']}" in unprocessed_ids
+    ]
     
     sonarr_logger.info(f"Found {len(unprocessed_seasons)} unprocessed seasons with missing episodes out of {len(seasons_list)} total.")
     
@@ -295,13 +296,10 @@ def process_missing_shows_mode(
         return False
     
     # Filter out shows that have been processed
-    unprocessed_series = []
-    for series in series_with_missing:
-        series_id = str(series.get("series_id"))
-        if not is_processed("sonarr", instance_name, series_id):
-            unprocessed_series.append(series)
-        else:
-            sonarr_logger.debug(f"Skipping already processed series ID: {series_id}")
+    unprocessed_ids = set(filter_unprocessed(
+        "sonarr", instance_name, [str(series.get("series_id")) for series in series_with_missing]
+    ))
+    unprocessed_series = [series for series in series_with_missing if str(series.get("series_id")) in unprocessed_ids]
     
     sonarr_logger.info(f"Found {len(unprocessed_series)} unprocessed series with missing episodes out of {len(series_with_missing)} total.")
     
@@ -404,11 +402,10 @@ def process_missing_shows_mode(
                 sonarr_logger.warning(f"Failed to tag series {show_id} with '{custom_tag}': {e}")
             
             # Add episode IDs to stateful manager IMMEDIATELY after processing each batch
+            success = add_processed_ids_bulk("sonarr", instance_name, episode_ids)
+            sonarr_logger.debug(f"Added {len(episode_ids)} processed episode IDs, success: {success}")
+            
             for episode_id in episode_ids:
-                # Force flush to disk by calling add_processed_id immediately for each ID
-                success = add_processed_id("sonarr", instance_name, str(episode_id))
-                sonarr_logger.debug(f"Added processed ID: {episode_id}, success: {success}")
-                
                 # Log each episode to history
                 # Find the corresponding episode data 
                 for episode in missing_episodes:
@@ -512,13 +509,10 @@ def process_missing_episodes_mode(
         return False
     
     # Filter out already processed episodes
-    unprocessed_episodes = []
-    for episode in missing_episodes:
-        episode_id = str(episode.get('id'))
-        if not is_processed("sonarr", instance_name, episode_id):
-            unprocessed_episodes.append(episode)
-        else:
-            sonarr_logger.debug(f"Skipping already processed episode ID: {episode_id}")
+    unprocessed_ids = set(filter_unprocessed(
+        "sonarr", instance_name, [str(episode.get('id')) for episode in missing_episodes]
+    ))
+    unprocessed_episodes = [episode for episode in missing_episodes if str(episode.get('id')) in unprocessed_ids]
     
     sonarr_logger.info(f"Found {len(unprocessed_episodes)} unprocessed episodes out of {len(missing_episodes)} total.")
     
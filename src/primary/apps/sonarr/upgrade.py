@@ -9,7 +9,7 @@ from typing import List, Dict, Any, Set, Callable, Union
 from src.primary.utils.logger import get_logger
 from src.primary.apps.sonarr import api as sonarr_api
 from src.primary.stats_manager import increment_stat, check_hourly_cap_exceeded
-from src.primary.stateful_manager import is_processed, add_processed_id
+from src.primary.stateful_manager import filter_unprocessed, add_processed_id, add_processed_ids_bulk
 from src.primary.utils.history_utils import log_processed_media
 from src.primary.settings_manager import get_advanced_setting, load_settings
 
@@ -164,13 +164,14 @@ def process_upgrade_seasons_mode(
     
     # CRITICAL FIX: Filter out already processed seasons at the season level
     # This prevents the same season pack upgrade from being processed repeatedly
-    unprocessed_seasons = []
-    for series_id, season_number, episode_count, series_title in available_seasons:
-        season_id = f"{series_id}_{season_number}"
-        if not is_processed("sonarr", instance_name, season_id):
-            unprocessed_seasons.append((series_id, season_number, episode_count, series_title))
-        else:
-            sonarr_logger.debug(f"Skipping already processed season ID: {season_id} ({series_title} - Season {season_number})")
+    unprocessed_ids = set(filter_unprocessed(
+        "sonarr", instance_name,
+        [f"{series_id}_{season_number}" for series_id, season_number, _, _ in available_seasons]
+    ))
+    unprocessed_seasons = [
+        season for season in available_seasons
+        if f"{season[0]}_{season[1]}" in unprocessed_ids
+    ]
     
     sonarr_logger.info(f"Found {len(unprocessed_seasons)} unprocessed seasons out of {len(available_seasons)} total seasons with cutoff unmet episodes.")
     
@@ -241,20 +242,17 @@ def process_upgrade_seasons_mode(
                 # Log this as a season pack upgrade in the history
                 log_season_pack_upgrade(api_url, api_key, api_timeout, series_id, season_number, instance_name)
                 
-                # CRITICAL FIX: Mark the season as processed at the season level to prevent reprocessing
+                # CRITICAL FIX: Mark the season as processed at the season level to prevent reprocessing,
+                # together with its episodes in a single write
                 season_id = f"{series_id}_{season_number}"
-                add_processed_id("sonarr", instance_name, season_id)
-                sonarr_logger.debug(f"Marked season ID {season_id} as processed for upgrades ({series_title} - Season {season_number})")
+                add_processed_ids_bulk("sonarr", instance_name, [season_id] + [str(episode_id) for episode_id in episode_ids])
+                sonarr_logger.debug(f"Marked season ID {season_id} and {len(episode_ids)} episodes as processed for upgrades ({series_title} - Season {season_number})")
                 
                 # We'll increment stats individually for each episode instead of in batch
                 # increment_stat("sonarr", "upgraded", len(episode_ids))
                 # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
                 
-                # Mark episodes as processed using stateful management
                 for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
                     # CRITICAL FIX: Use increment_stat_only to avoid double-counting API calls
                     # The API call is already tracked in search_season(), so we only increment stats here
                     from src.primary.stats_manager import increment_stat_only
@@ -436,10 +434,10 @@ def process_upgrade_shows_mode(
                 # sonarr_logger.debug(f"Incremented sonarr upgraded statistics by {len(episode_ids)}")
                 
                 # Mark episodes as processed using stateful management
+                add_processed_ids_bulk("sonarr", instance_name, episode_ids)
+                sonarr_logger.debug(f"Marked {len(episode_ids)} episode IDs as processed for upgrades")
+                
                 for episode_id in episode_ids:
-                    add_processed_id("sonarr", instance_name, str(episode_id))
-                    sonarr_logger.debug(f"Marked episode ID {episode_id} as processed for upgrades")
-                    
                     # Increment stats for this episode (consistent with Radarr's approach)
                     increment_stat("sonarr", "upgraded")
                     sonarr_logger.debug(f"Incremented sonarr upgraded statistic for episode {episode_id}")
@@ -527,13 +525,10 @@ def process_upgrade_episodes_mode(
         return processed_any
     
     # Filter out already processed episodes
-    unprocessed_episodes = []
-    for episode in cutoff_unmet_episodes:
-        episode_id = str(episode.get('id'))
-        if not is_processed("sonarr", instance_name, episode_id):
-            unprocessed_episodes.append(episode)
-        else:
-            sonarr_logger.debug(f"Skipping already processed episode ID: {episode_id}")
+    unprocessed_ids = set(filter_unprocessed(
+        "sonarr", instance_name, [str(episode.get('id')) for episode in cutoff_unmet_episodes]
+    ))
+    unprocessed_episodes = [episode for episode in cutoff_unmet_episodes if str(episode.get('id')) in unprocessed_ids]
     
     sonarr_logger.info(f"Found {len(unprocessed_episodes)} unprocessed episodes needing upgrades out of {len(cutoff_unmet_episodes)} total.")
     
@@ -19,6 +19,7 @@ import requests
 from typing import Dict, List, Any, Optional
 
 from src.primary.utils.logger import get_logger
+from src.primary.utils.log_context import set_log_context
 from src.primary.settings_manager import load_settings
 from src.primary.utils.database import get_database
 from src.primary.apps.swaparr.stats_manager import increment_swaparr_stat
@@ -898,6 +899,7 @@ def run_swaparr():
                 continue
             
             swaparr_enabled_instances += 1
+            set_log_context(instance_name=instance_name)
             swaparr_logger.info(f"Processing {app_name} instance '{instance_name}' - Swaparr enabled")
             
             # Check if Swaparr has been disabled during processing
@@ -915,6 +917,7 @@ def run_swaparr():
                 SWAPARR_STATS['errors_encountered'] += 1
                 processed_instances += 1
     
+    set_log_context(instance_name=None)
     stats = get_session_stats()
     swaparr_logger.info(f"=== SWAPARR cycle completed. Processed {processed_instances} Swaparr-enabled app instances. ===")
     
@@ -5,6 +5,7 @@ Enhanced with better statistics tracking and status reporting.
 
 from flask import Blueprint, request, jsonify
 import os
+import copy
 import json
 from src.primary.utils.logger import get_logger
 from src.primary.settings_manager import load_settings, save_settings
@@ -135,8 +136,8 @@ def update_settings():
     if not data:
         return jsonify({"success": False, "message": "No data provided"}), 400
     
-    # Load current settings
-    settings = load_settings("swaparr")
+    # Load current settings (a copy: the loaded dict is shared with the settings cache)
+    settings = copy.deepcopy(load_settings("swaparr"))
     
     # Update settings with provided data
     for key, value in data.items():
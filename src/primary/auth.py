@@ -19,6 +19,7 @@ import re # Import the re module for regex
 import requests
 import uuid
 import sqlite3
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple, Union
 from flask import request, redirect, url_for, session
 from .utils.logger import logger # Ensure logger is imported
@@ -52,7 +53,7 @@ def get_user_data(username: str = None) -> Dict[str, Any]:
         # This is used in legacy code that expects single user
         try:
             # Get the first user from the database
-            with sqlite3.connect(db.db_path) as conn:
+            with db.get_connection() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute('SELECT * FROM users LIMIT 1')
                 row = cursor.fetchone()
@@ -288,120 +289,131 @@ def update_session_username(session_id: str, new_username: str) -> bool:
     logger.debug(f"Updated session {session_id} username to '{new_username}'")
     return True
 
-def authenticate_request():
-    """Flask route decorator to check if user is authenticated"""
+# Route classes for authenticate_request
+ROUTE_SETUP = "setup"        # Setup/user pages, always reachable (returns from external auth like Plex)
+ROUTE_PUBLIC = "public"      # Static files, API setup, health check, ping, sponsors
+ROUTE_LOGIN = "login"        # Login, Plex auth, recovery key, 2FA and general settings endpoints
+ROUTE_PROTECTED = "protected"
+
+_SETUP_PATHS = frozenset(('/setup', '/user'))
+_PUBLIC_PATHS = frozenset(('/favicon.ico', '/api/health', '/ping', '/api/github_sponsors', '/api/sponsors/init'))
+_PUBLIC_PREFIXES = ('/static/', '/api/setup')
+_LOGIN_PATHS = frozenset(('/api/settings/general',))
+_LOGIN_PREFIXES = ('/login', '/api/login', '/api/auth/plex', '/auth/recovery-key', '/api/user/2fa/')
+# Commonly polled API endpoints, logged less to reduce verbosity
+_POLLING_ENDPOINTS = ('/api/logs/', '/api/cycle/', '/api/hourly-caps', '/api/swaparr/status')
+
+# Common local network IP ranges (entries ending in '.' are prefixes)
+LOCAL_NETWORKS = (
+    '127.0.0.1',      # localhost
+    '::1',            # localhost IPv6
+    '10.',            # 10.0.0.0/8
+    '172.16.',        # 172.16.0.0/12
+    '172.17.',
+    '172.18.',
+    '172.19.',
+    '172.20.',
+    '172.21.',
+    '172.22.',
+    '172.23.',
+    '172.24.',
+    '172.25.',
+    '172.26.',
+    '172.27.',
+    '172.28.',
+    '172.29.',
+    '172.30.',
+    '172.31.',
+    '192.168.'        # 192.168.0.0/16
+)
+_LOCAL_ADDRESSES = frozenset(network for network in LOCAL_NETWORKS if not network.endswith('.'))
+_LOCAL_PREFIXES = tuple(network for network in LOCAL_NETWORKS if network.endswith('.'))
 
-    # Skip authentication for static files and the login/setup pages
-    static_path = "/static/"
-    login_path = "/login"
-    api_login_path = "/api/login"
-    api_auth_plex_path = "/api/auth/plex"
-    setup_path = "/setup"
-    user_path = "/user"
-    api_setup_path = "/api/setup"
-    favicon_path = "/favicon.ico"
-    health_check_path = "/api/health"
-    ping_path = "/ping"
+@lru_cache(maxsize=1024)
+def classify_route(path: str) -> Tuple[str, bool]:
+    """Return (route class, is polling endpoint) for a request path; worked out once per path"""
+    is_polling_endpoint = any(endpoint in path for endpoint in _POLLING_ENDPOINTS)
+    if path in _SETUP_PATHS:
+        return ROUTE_SETUP, is_polling_endpoint
+    if path.startswith(_PUBLIC_PREFIXES) or path in _PUBLIC_PATHS:
+        return ROUTE_PUBLIC, is_polling_endpoint
+    if path.startswith(_LOGIN_PREFIXES) or path in _LOGIN_PATHS:
+        return ROUTE_LOGIN, is_polling_endpoint
+    return ROUTE_PROTECTED, is_polling_endpoint
 
-    # Check if this is a commonly polled API endpoint to reduce log verbosity
-    is_polling_endpoint = any(endpoint in request.path for endpoint in [
-        '/api/logs/', '/api/cycle/', '/api/hourly-caps', '/api/swaparr/status'
-    ])
+def is_local_address(address: Optional[str]) -> bool:
+    """Check whether an IP address belongs to one of the LOCAL_NETWORKS"""
+    return bool(address) and (address in _LOCAL_ADDRESSES or address.startswith(_LOCAL_PREFIXES))
+
+def _setup_redirect(reason: str):
+    """Redirect to the setup page, honouring the configured base URL"""
+    try:
+        from src.primary.settings_manager import get_setting
+        base_url = get_setting('general', 'base_url', '')
+        if base_url and not base_url.startswith('/'):
+            base_url = f'/{base_url}'
+        if base_url and base_url.endswith('/'):
+            base_url = base_url.rstrip('/')
+        setup_url = f"{base_url}/setup" if base_url else "/setup"
+        logger.debug(f"Redirecting to setup{reason} with base URL: {setup_url}")
+        return redirect(setup_url)
+    except Exception as e:
+        logger.warning(f"Error getting base URL for setup redirect: {e}")
+        return redirect(url_for("common.setup"))
+
+def authenticate_request():
+    """Flask route decorator to check if user is authenticated
     
-    if not is_polling_endpoint:
-        pass  # Path checking debug removed to reduce log spam
+    Runs before every request, so the common case stays cheap: the route class
+    is cached per path, "user exists" and "setup in progress" come from the
+    database's cached state, and the bypass flags from the settings cache.
+    """
+    route, is_polling_endpoint = classify_route(request.path)
 
     # FIRST: Always allow setup and user page access - this handles returns from external auth like Plex
-    if request.path in ['/setup', '/user']:
+    if route == ROUTE_SETUP:
         if not is_polling_endpoint:
             logger.debug(f"Allowing setup/user page access for path: {request.path}")
         return None
 
     # Skip authentication for static files, API setup, health check path, ping, and github sponsors
-    if request.path.startswith((static_path, api_setup_path)) or request.path in (favicon_path, health_check_path, ping_path, '/api/github_sponsors', '/api/sponsors/init'):
+    if route == ROUTE_PUBLIC:
         return None
     
     # Skip authentication for login pages, Plex auth endpoints, recovery key endpoints, and setup-related user endpoints
     # This must come BEFORE setup checks to allow API access during setup
-    recovery_key_path = "/auth/recovery-key"
-    api_user_2fa_path = "/api/user/2fa/"
-    api_settings_general_path = "/api/settings/general"
-    
-    # Check if request is for login/auth paths (including Plex auth) - skip authentication
-    if request.path.startswith((login_path, api_login_path, api_auth_plex_path, recovery_key_path, api_user_2fa_path)) or request.path == api_settings_general_path:
+    if route == ROUTE_LOGIN:
         if not is_polling_endpoint:
             # Reduced logging frequency for common paths to prevent spam
             if hash(request.path) % 20 == 0:  # Log ~5% of auth skips
                 logger.debug(f"Skipping authentication for login/plex/recovery/2fa/settings path '{request.path}'")
         return None
     
+    db = get_database()
+    
     # If no user exists, redirect to setup
-    if not user_exists():
+    if not db.user_exists():
         if not is_polling_endpoint:
             logger.debug(f"No user exists, redirecting to setup")
-        
-        # Get the base URL from settings to ensure proper subpath redirect
-        try:
-            from src.primary.settings_manager import get_setting
-            base_url = get_setting('general', 'base_url', '')
-            if base_url and not base_url.startswith('/'):
-                base_url = f'/{base_url}'
-            if base_url and base_url.endswith('/'):
-                base_url = base_url.rstrip('/')
-            setup_url = f"{base_url}/setup" if base_url else "/setup"
-            logger.debug(f"Redirecting to setup with base URL: {setup_url}")
-            return redirect(setup_url)
-        except Exception as e:
-            logger.warning(f"Error getting base URL for setup redirect: {e}")
-            return redirect(url_for("common.setup"))
+        return _setup_redirect("")
     
     # If user exists but setup is in progress, redirect to setup
     try:
-        from src.primary.utils.database import get_database
-        db = get_database()
         if db.is_setup_in_progress():
             if not is_polling_endpoint:
                 logger.debug(f"Setup is in progress, redirecting to setup")
-            
-            # Get the base URL from settings to ensure proper subpath redirect
-            try:
-                from src.primary.settings_manager import get_setting
-                base_url = get_setting('general', 'base_url', '')
-                if base_url and not base_url.startswith('/'):
-                    base_url = f'/{base_url}'
-                if base_url and base_url.endswith('/'):
-                    base_url = base_url.rstrip('/')
-                setup_url = f"{base_url}/setup" if base_url else "/setup"
-                logger.debug(f"Redirecting to setup (in progress) with base URL: {setup_url}")
-                return redirect(setup_url)
-            except Exception as e:
-                logger.warning(f"Error getting base URL for setup redirect: {e}")
-                return redirect(url_for("common.setup"))
+            return _setup_redirect(" (in progress)")
     except Exception as e:
         logger.error(f"Error checking setup progress in auth middleware: {e}")
         # Don't block access if we can't check setup progress
     
-    # Load general settings
+    # Load general settings (cached until they are saved or changed in the database)
     local_access_bypass = False
     proxy_auth_bypass = False
     try:
-        # Force reload settings from disk to ensure we have the latest
-        from src.primary.settings_manager import load_settings
-        from src.primary import settings_manager
-        
-        # Ensure we're getting fresh settings by clearing any cache
-        if hasattr(settings_manager, 'settings_cache'):
-            settings_manager.settings_cache = {}
-            
-        settings = load_settings("general")  # Specify 'general' as the app_type
-        general_settings = settings
-        local_access_bypass = general_settings.get("local_access_bypass", False)
-        proxy_auth_bypass = general_settings.get("proxy_auth_bypass", False)
-        
-        # Log settings only for non-polling endpoints to reduce spam
-        if not is_polling_endpoint:
-            pass
-
+        from src.primary.settings_manager import get_setting
+        local_access_bypass = get_setting("general", "local_access_bypass", False)
+        proxy_auth_bypass = get_setting("general", "proxy_auth_bypass", False)
     except Exception as e:
         logger.error(f"Error loading authentication bypass settings: {e}", exc_info=True)
     
@@ -415,29 +427,6 @@ def authenticate_request():
         pass  # IP address debug removed to reduce log spam
     
     if local_access_bypass:
-        # Common local network IP ranges
-        local_networks = [
-            '127.0.0.1',      # localhost
-            '::1',            # localhost IPv6
-            '10.',            # 10.0.0.0/8
-            '172.16.',        # 172.16.0.0/12
-            '172.17.',
-            '172.18.',
-            '172.19.',
-            '172.20.',
-            '172.21.',
-            '172.22.',
-            '172.23.',
-            '172.24.',
-            '172.25.',
-            '172.26.',
-            '172.27.',
-            '172.28.',
-            '172.29.',
-            '172.30.',
-            '172.31.',
-            '192.168.'        # 192.168.0.0/16
-        ]
         is_local = False
         
         # Check if request is coming through a proxy
@@ -448,17 +437,11 @@ def authenticate_request():
             possible_client_ip = forwarded_for.split(',')[0].strip()
             
             # Check if this forwarded IP is a local network IP
-            for network in local_networks:
-                if possible_client_ip == network or (network.endswith('.') and possible_client_ip.startswith(network)):
-                    is_local = True
-                    break
+            is_local = is_local_address(possible_client_ip)
         
         # Check if direct remote_addr is a local network IP if not already determined
         if not is_local:
-            for network in local_networks:
-                if remote_addr == network or (network.endswith('.') and remote_addr.startswith(network)):
-                    is_local = True
-                    break
+            is_local = is_local_address(remote_addr)
                     
         if is_local:
             if not is_polling_endpoint:
@@ -702,7 +685,7 @@ def disable_2fa_with_password_and_otp(username: str, password: str, otp_code: st
 
 def change_username(current_username: str, new_username: str, password: str) -> bool:
     """Change the username for the current user"""
-    from .utils.database import get_database
+    from src.primary.utils.database import get_database
     
     db = get_database()
     
@@ -727,7 +710,7 @@ def change_username(current_username: str, new_username: str, password: str) ->
 
 def change_password(current_password: str, new_password: str) -> bool:
     """Change the password for the current user"""
-    from .utils.database import get_database
+    from src.primary.utils.database import get_database
     
     # Get current username from session to identify the user
     from .routes.common import get_user_for_request
@@ -22,6 +22,7 @@ __version__ = "1.0.0" # Consider updating this based on changes
 
 # Set up logging first
 from src.primary.utils.logger import setup_main_logger, get_logger # Import get_logger
+from src.primary.utils.log_context import clear_log_context, new_cycle_id, set_log_context
 logger = setup_main_logger()
 
 # Import necessary modules
@@ -169,377 +170,387 @@ def app_specific_loop(app_type: str) -> None:
         # --- State Reset Check --- #
         check_state_reset(app_type)
 
-        app_logger.info(f"=== Starting {app_type.upper()} cycle ===")
-
-        # Mark cycle as started (set cyclelock to True)
+        # Everything logged from here on carries this cycle's id (see log_context.py)
+        set_log_context(cycle_id=new_cycle_id(), instance_name=None, operation=None)
         try:
-            from src.primary.cycle_tracker import start_cycle
-            start_cycle(app_type)
-        except Exception as e:
-            app_logger.warning(f"Failed to mark cycle start for {app_type}: {e}")
-            # Non-critical, continue execution
+            app_logger.info(f"=== Starting {app_type.upper()} cycle ===")
 
-        # Check if we need to use multi-instance mode
-        instances_to_process = []
-        
-        # Use the dynamically loaded function (if found)
-        if get_instances_func:
-            # Multi-instance mode supported
+            # Mark cycle as started (set cyclelock to True)
             try:
-                instances_to_process = get_instances_func() # Call the dynamically loaded function
-                if instances_to_process:
-                    # Instance count logging removed to reduce log spam
-                    pass
+                from src.primary.cycle_tracker import start_cycle
+                start_cycle(app_type)
+            except Exception as e:
+                app_logger.warning(f"Failed to mark cycle start for {app_type}: {e}")
+                # Non-critical, continue execution
+
+            # Check if we need to use multi-instance mode
+            instances_to_process = []
+        
+            # Use the dynamically loaded function (if found)
+            if get_instances_func:
+                # Multi-instance mode supported
+                try:
+                    instances_to_process = get_instances_func() # Call the dynamically loaded function
+                    if instances_to_process:
+                        # Instance count logging removed to reduce log spam
+                        pass
+                    else:
+                        # No instances found via get_configured_instances
+                        app_logger.debug(f"No configured {app_type} instances found. Skipping cycle.")
+                        stop_event.wait(sleep_duration)
+                        continue
+                except Exception as e:
+                    app_logger.error(f"Error calling get_configured_instances function: {e}", exc_info=True)
+                    stop_event.wait(60)
+                    continue
+            else:
+                # get_instances_func is None (either not defined in app module or import failed earlier)
+                # Fallback to single instance mode using base settings if available
+                api_url = app_settings.get("api_url")
+                api_key = app_settings.get("api_key")
+                instance_name = app_settings.get("name", f"{app_type.capitalize()} Default") # Use 'name' or default
+            
+                if api_url and api_key:
+                    app_logger.info(f"Processing {app_type} as single instance: {instance_name}")
+                    # Create a list with a single dict matching the multi-instance structure
+                    instances_to_process = [{
+                        "instance_name": instance_name, 
+                        "api_url": api_url, 
+                        "api_key": api_key
+                    }]
                 else:
-                    # No instances found via get_configured_instances
-                    app_logger.debug(f"No configured {app_type} instances found. Skipping cycle.")
+                    app_logger.warning(f"No 'get_configured_instances' function found and no valid single instance config (URL/Key) for {app_type}. Skipping cycle.")
                     stop_event.wait(sleep_duration)
                     continue
-            except Exception as e:
-                app_logger.error(f"Error calling get_configured_instances function: {e}", exc_info=True)
-                stop_event.wait(60)
-                continue
-        else:
-            # get_instances_func is None (either not defined in app module or import failed earlier)
-            # Fallback to single instance mode using base settings if available
-            api_url = app_settings.get("api_url")
-            api_key = app_settings.get("api_key")
-            instance_name = app_settings.get("name", f"{app_type.capitalize()} Default") # Use 'name' or default
             
-            if api_url and api_key:
-                app_logger.info(f"Processing {app_type} as single instance: {instance_name}")
-                # Create a list with a single dict matching the multi-instance structure
-                instances_to_process = [{
-                    "instance_name": instance_name, 
-                    "api_url": api_url, 
-                    "api_key": api_key
-                }]
-            else:
-                app_logger.warning(f"No 'get_configured_instances' function found and no valid single instance config (URL/Key) for {app_type}. Skipping cycle.")
+            # If after all checks, instances_to_process is still empty
+            if not instances_to_process:
+                app_logger.warning(f"No valid {app_type} instances to process this cycle (unexpected state). Skipping.")
                 stop_event.wait(sleep_duration)
                 continue
             
-        # If after all checks, instances_to_process is still empty
-        if not instances_to_process:
-            app_logger.warning(f"No valid {app_type} instances to process this cycle (unexpected state). Skipping.")
-            stop_event.wait(sleep_duration)
-            continue
-            
-        # Process each instance dictionary returned by get_configured_instances
-        processed_any_items = False
-        enabled_instances = []
+            # Process each instance dictionary returned by get_configured_instances
+            processed_any_items = False
+            enabled_instances = []
         
-        for instance_details in instances_to_process:
-            if stop_event.is_set():
-                break
+            for instance_details in instances_to_process:
+                if stop_event.is_set():
+                    break
                 
-            instance_name = instance_details.get("instance_name", "Default") # Use the dict from get_configured_instances
-            app_logger.info(f"Processing {app_type} instance: {instance_name}")
+                instance_name = instance_details.get("instance_name", "Default") # Use the dict from get_configured_instances
+                set_log_context(instance_name=instance_name, operation=None)
+                app_logger.info(f"Processing {app_type} instance: {instance_name}")
             
-            # Get instance-specific settings from the instance_details dict
-            api_url = instance_details.get("api_url", "")
-            api_key = instance_details.get("api_key", "")
+                # Get instance-specific settings from the instance_details dict
+                api_url = instance_details.get("api_url", "")
+                api_key = instance_details.get("api_key", "")
 
-            # Get global/shared settings from app_settings loaded at the start of the loop
-            # Example: monitored_only = app_settings.get("monitored_only", True)
+                # Get global/shared settings from app_settings loaded at the start of the loop
+                # Example: monitored_only = app_settings.get("monitored_only", True)
 
-            # --- Connection Check --- #
-            if not api_url or not api_key:
-                app_logger.warning(f"Missing API URL or Key for instance '{instance_name}'. Skipping.")
-                continue
-            try:
-                # Use instance details for connection check
-                app_logger.debug(f"Checking connection to {app_type} instance '{instance_name}' at {api_url} with timeout {api_timeout}s")
-                connected = check_connection(api_url, api_key, api_timeout=api_timeout)
-                if not connected:
-                    app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}. Skipping.")
+                # --- Connection Check --- #
+                if not api_url or not api_key:
+                    app_logger.warning(f"Missing API URL or Key for instance '{instance_name}'. Skipping.")
                     continue
-                app_logger.debug(f"Successfully connected to {app_type} instance: {instance_name}")
-            except Exception as e:
-                app_logger.error(f"Error connecting to {app_type} instance '{instance_name}': {e}", exc_info=True)
-                continue # Skip this instance if connection fails
+                try:
+                    # Use instance details for connection check
+                    app_logger.debug(f"Checking connection to {app_type} instance '{instance_name}' at {api_url} with timeout {api_timeout}s")
+                    connected = check_connection(api_url, api_key, api_timeout=api_timeout)
+                    if not connected:
+                        app_logger.warning(f"Failed to connect to {app_type} instance '{instance_name}' at {api_url}. Skipping.")
+                        continue
+                    app_logger.debug(f"Successfully connected to {app_type} instance: {instance_name}")
+                except Exception as e:
+                    app_logger.error(f"Error connecting to {app_type} instance '{instance_name}': {e}", exc_info=True)
+                    continue # Skip this instance if connection fails
                 
-            # --- API Cap Check --- #
-            try:
-                # Check if hourly API cap is exceeded
-                if check_hourly_cap_exceeded(app_type):
-                    # Get the current cap status for logging
-                    from src.primary.stats_manager import get_hourly_cap_status
-                    cap_status = get_hourly_cap_status(app_type)
-                    app_logger.info(f"{app_type.upper()} hourly cap reached {cap_status['current_usage']} of {cap_status['limit']} (app-specific limit). Skipping cycle!")
-                    continue # Skip this instance if API cap is exceeded
-            except Exception as e:
-                app_logger.error(f"Error checking hourly API cap for {app_type}: {e}", exc_info=True)
-                # Continue with the cycle even if cap check fails - safer than skipping
-
-            # --- Check if Hunt Modes are Enabled --- #
-            # For per-instance settings, get values from instance details
-            # For apps without per-instance settings, fall back to global app settings
-            if app_type == "sonarr":
-                hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
-            elif app_type == "radarr":
-                hunt_missing_value = instance_details.get("hunt_missing_movies", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_movies", 0)  # Default to 0
-            elif app_type == "lidarr":
-                hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
-            elif app_type == "readarr":
-                hunt_missing_value = instance_details.get("hunt_missing_books", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_books", 0)  # Default to 0
-            elif app_type == "whisparr":
-                hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
-            elif app_type == "eros":
-                hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
-                hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
-            else:
-                # Fall back to global settings for other apps
-                hunt_missing_value = app_settings.get(hunt_missing_setting, 0)
-                hunt_upgrade_value = app_settings.get(hunt_upgrade_setting, 0)
+                # --- API Cap Check --- #
+                try:
+                    # Check if hourly API cap is exceeded
+                    if check_hourly_cap_exceeded(app_type):
+                        # Get the current cap status for logging
+                        from src.primary.stats_manager import get_hourly_cap_status
+                        cap_status = get_hourly_cap_status(app_type)
+                        app_logger.info(f"{app_type.upper()} hourly cap reached {cap_status['current_usage']} of {cap_status['limit']} (app-specific limit). Skipping cycle!")
+                        continue # Skip this instance if API cap is exceeded
+                except Exception as e:
+                    app_logger.error(f"Error checking hourly API cap for {app_type}: {e}", exc_info=True)
+                    # Continue with the cycle even if cap check fails - safer than skipping
+
+                # --- Check if Hunt Modes are Enabled --- #
+                # For per-instance settings, get values from instance details
+                # For apps without per-instance settings, fall back to global app settings
+                if app_type == "sonarr":
+                    hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
+                elif app_type == "radarr":
+                    hunt_missing_value = instance_details.get("hunt_missing_movies", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_movies", 0)  # Default to 0
+                elif app_type == "lidarr":
+                    hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
+                elif app_type == "readarr":
+                    hunt_missing_value = instance_details.get("hunt_missing_books", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_books", 0)  # Default to 0
+                elif app_type == "whisparr":
+                    hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
+                elif app_type == "eros":
+                    hunt_missing_value = instance_details.get("hunt_missing_items", 1)  # Default to 1
+                    hunt_upgrade_value = instance_details.get("hunt_upgrade_items", 0)  # Default to 0
+                else:
+                    # Fall back to global settings for other apps
+                    hunt_missing_value = app_settings.get(hunt_missing_setting, 0)
+                    hunt_upgrade_value = app_settings.get(hunt_upgrade_setting, 0)
 
-            hunt_missing_enabled = hunt_missing_value > 0
-            hunt_upgrade_enabled = hunt_upgrade_value > 0
+                hunt_missing_enabled = hunt_missing_value > 0
+                hunt_upgrade_enabled = hunt_upgrade_value > 0
             
-            # Debug logging for per-instance hunt values
-            app_logger.info(f"Instance '{instance_name}' - Missing: {hunt_missing_value} (enabled: {hunt_missing_enabled}), Upgrade: {hunt_upgrade_value} (enabled: {hunt_upgrade_enabled})")
+                # Debug logging for per-instance hunt values
+                app_logger.info(f"Instance '{instance_name}' - Missing: {hunt_missing_value} (enabled: {hunt_missing_enabled}), Upgrade: {hunt_upgrade_value} (enabled: {hunt_upgrade_enabled})")
 
-            # --- Queue Size Check --- # Moved inside loop
-            # Get maximum_download_queue_size from general settings (still using minimum_download_queue_size key for backward compatibility)
-            general_settings = settings_manager.load_settings('general')
-            max_queue_size = general_settings.get("minimum_download_queue_size", -1)
+                # --- Queue Size Check --- # Moved inside loop
+                # Get maximum_download_queue_size from general settings (still using minimum_download_queue_size key for backward compatibility)
+                general_settings = settings_manager.load_settings('general')
+                max_queue_size = general_settings.get("minimum_download_queue_size", -1)
     
             
-            if max_queue_size >= 0:
-                try:
-                    # Use instance details for queue check
-                    current_queue_size = get_queue_size(api_url, api_key, api_timeout)
-                    if current_queue_size >= max_queue_size:
-                        app_logger.info(f"Download queue size ({current_queue_size}) meets or exceeds maximum ({max_queue_size}) for {instance_name}. Skipping cycle for this instance.")
-                        continue # Skip processing for this instance
-                    else:
-                        app_logger.info(f"Queue size ({current_queue_size}) is below maximum ({max_queue_size}). Proceeding.")
-                except Exception as e:
-                    app_logger.warning(f"Could not get download queue size for {instance_name}. Proceeding anyway. Error: {e}", exc_info=False) # Log less verbosely
+                if max_queue_size >= 0:
+                    try:
+                        # Use instance details for queue check
+                        current_queue_size = get_queue_size(api_url, api_key, api_timeout)
+                        if current_queue_size >= max_queue_size:
+                            app_logger.info(f"Download queue size ({current_queue_size}) meets or exceeds maximum ({max_queue_size}) for {instance_name}. Skipping cycle for this instance.")
+                            continue # Skip processing for this instance
+                        else:
+                            app_logger.info(f"Queue size ({current_queue_size}) is below maximum ({max_queue_size}). Proceeding.")
+                    except Exception as e:
+                        app_logger.warning(f"Could not get download queue size for {instance_name}. Proceeding anyway. Error: {e}", exc_info=False) # Log less verbosely
             
-            # Prepare args dictionary for processing functions
-            # Combine instance details with general app settings for the processing functions
-            # Assuming app_settings already contains most general settings, add instance specifics
-            combined_settings = app_settings.copy() # Start with general settings
-            combined_settings.update(instance_details) # Add/overwrite with instance specifics (name, url, key)
+                # Prepare args dictionary for processing functions
+                # Combine instance details with general app settings for the processing functions
+                # Assuming app_settings already contains most general settings, add instance specifics
+                combined_settings = app_settings.copy() # Start with general settings
+                combined_settings.update(instance_details) # Add/overwrite with instance specifics (name, url, key)
             
-            # Ensure settings from database are consistently used for all apps
-            combined_settings["api_timeout"] = settings_manager.get_advanced_setting("api_timeout", 120)
-            combined_settings["command_wait_delay"] = settings_manager.get_advanced_setting("command_wait_delay", 1)
-            combined_settings["command_wait_attempts"] = settings_manager.get_advanced_setting("command_wait_attempts", 600)
+                # Ensure settings from database are consistently used for all apps
+                combined_settings["api_timeout"] = settings_manager.get_advanced_setting("api_timeout", 120)
+                combined_settings["command_wait_delay"] = settings_manager.get_advanced_setting("command_wait_delay", 1)
+                combined_settings["command_wait_attempts"] = settings_manager.get_advanced_setting("command_wait_attempts", 600)
             
-            # Define the stop check function
-            stop_check_func = stop_event.is_set
+                # Define the stop check function
+                stop_check_func = stop_event.is_set
 
-            # --- Process Missing --- #
-            if hunt_missing_enabled and process_missing:
-                try:
-                    # Extract settings for direct function calls
-                    api_url = combined_settings.get("api_url", "").strip()
-                    api_key = combined_settings.get("api_key", "").strip()
-                    api_timeout = combined_settings.get("api_timeout", 120)
-                    monitored_only = combined_settings.get("monitored_only", True)
-                    skip_future_episodes = combined_settings.get("skip_future_episodes", True)
-                    hunt_missing_items = hunt_missing_value  # Use per-instance value
-                    hunt_missing_mode = instance_details.get("hunt_missing_mode", "seasons_packs")
-                    command_wait_delay = combined_settings.get("command_wait_delay", 1)
-                    command_wait_attempts = combined_settings.get("command_wait_attempts", 600)
-                    
-                    if app_type == "sonarr":
-                        processed_missing = process_missing(
-                            api_url=api_url,
-                            api_key=api_key,
-                            instance_name=instance_name,  # Added the required instance_name parameter
-                            api_timeout=api_timeout,
-                            monitored_only=monitored_only,
-                            skip_future_episodes=skip_future_episodes,
-                            hunt_missing_items=hunt_missing_items,
-                            hunt_missing_mode=hunt_missing_mode,
-                            command_wait_delay=command_wait_delay,
-                            command_wait_attempts=command_wait_attempts,
-                            stop_check=stop_check_func
-                        )
-                    else:
-                        # For other apps that still use the old signature
-                        processed_missing = process_missing(app_settings=combined_settings, stop_check=stop_check_func)
-                        
-                    if processed_missing:
-                        processed_any_items = True
-                except Exception as e:
-                    app_logger.error(f"Error during missing processing for {instance_name}: {e}", exc_info=True)
-
-            # --- Process Upgrades --- #
-            if hunt_upgrade_enabled and process_upgrades:
-                try:
-                    # Extract settings for direct function calls (only for Sonarr)
-                    if app_type == "sonarr":
+                # --- Process Missing --- #
+                if hunt_missing_enabled and process_missing:
+                    set_log_context(operation="missing")
+                    try:
+                        # Extract settings for direct function calls
                         api_url = combined_settings.get("api_url", "").strip()
                         api_key = combined_settings.get("api_key", "").strip()
                         api_timeout = combined_settings.get("api_timeout", 120)
                         monitored_only = combined_settings.get("monitored_only", True)
-                        hunt_upgrade_items = hunt_upgrade_value  # Use per-instance value
-                        upgrade_mode = instance_details.get("upgrade_mode", "seasons_packs")
+                        skip_future_episodes = combined_settings.get("skip_future_episodes", True)
+                        hunt_missing_items = hunt_missing_value  # Use per-instance value
+                        hunt_missing_mode = instance_details.get("hunt_missing_mode", "seasons_packs")
                         command_wait_delay = combined_settings.get("command_wait_delay", 1)
                         command_wait_attempts = combined_settings.get("command_wait_attempts", 600)
+                    
+                        if app_type == "sonarr":
+                            processed_missing = process_missing(
+                                api_url=api_url,
+                                api_key=api_key,
+                                instance_name=instance_name,  # Added the required instance_name parameter
+                                api_timeout=api_timeout,
+                                monitored_only=monitored_only,
+                                skip_future_episodes=skip_future_episodes,
+                                hunt_missing_items=hunt_missing_items,
+                                hunt_missing_mode=hunt_missing_mode,
+                                command_wait_delay=command_wait_delay,
+                                command_wait_attempts=command_wait_attempts,
+                                stop_check=stop_check_func
+                            )
+                        else:
+                            # For other apps that still use the old signature
+                            processed_missing = process_missing(app_settings=combined_settings, stop_check=stop_check_func)
                         
-                        processed_upgrades = process_upgrades(
-                            api_url=api_url,
-                            api_key=api_key,
-                            instance_name=instance_name,  # Added the required instance_name parameter
-                            api_timeout=api_timeout,
-                            monitored_only=monitored_only,
-                            hunt_upgrade_items=hunt_upgrade_items,
-                            upgrade_mode=upgrade_mode,
-                            command_wait_delay=command_wait_delay,
-                            command_wait_attempts=command_wait_attempts,
-                            stop_check=stop_check_func
-                        )
-                    else:
-                        # For other apps that still use the old signature
-                        processed_upgrades = process_upgrades(app_settings=combined_settings, stop_check=stop_check_func)
+                        if processed_missing:
+                            processed_any_items = True
+                    except Exception as e:
+                        app_logger.error(f"Error during missing processing for {instance_name}: {e}", exc_info=True)
+
+                # --- Process Upgrades --- #
+                if hunt_upgrade_enabled and process_upgrades:
+                    set_log_context(operation="upgrade")
+                    try:
+                        # Extract settings for direct function calls (only for Sonarr)
+                        if app_type == "sonarr":
+                            api_url = combined_settings.get("api_url", "").strip()
+                            api_key = combined_settings.get("api_key", "").strip()
+                            api_timeout = combined_settings.get("api_timeout", 120)
+                            monitored_only = combined_settings.get("monitored_only", True)
+                            hunt_upgrade_items = hunt_upgrade_value  # Use per-instance value
+                            upgrade_mode = instance_details.get("upgrade_mode", "seasons_packs")
+                            command_wait_delay = combined_settings.get("command_wait_delay", 1)
+                            command_wait_attempts = combined_settings.get("command_wait_attempts", 600)
                         
-                    if processed_upgrades:
-                        processed_any_items = True
-                except Exception as e:
-                    app_logger.error(f"Error during upgrade processing for {instance_name}: {e}", exc_info=True)
+                            processed_upgrades = process_upgrades(
+                                api_url=api_url,
+                                api_key=api_key,
+                                instance_name=instance_name,  # Added the required instance_name parameter
+                                api_timeout=api_timeout,
+                                monitored_only=monitored_only,
+                                hunt_upgrade_items=hunt_upgrade_items,
+                                upgrade_mode=upgrade_mode,
+                                command_wait_delay=command_wait_delay,
+                                command_wait_attempts=command_wait_attempts,
+                                stop_check=stop_check_func
+                            )
+                        else:
+                            # For other apps that still use the old signature
+                            processed_upgrades = process_upgrades(app_settings=combined_settings, stop_check=stop_check_func)
+                        
+                        if processed_upgrades:
+                            processed_any_items = True
+                    except Exception as e:
+                        app_logger.error(f"Error during upgrade processing for {instance_name}: {e}", exc_info=True)
 
 
 
-            # Small delay between instances if needed (optional)
-            if not stop_event.is_set():
-                 time.sleep(1) # Short pause
-            enabled_instances.append(instance_name)
+                # Small delay between instances if needed (optional)
+                if not stop_event.is_set():
+                     time.sleep(1) # Short pause
+                enabled_instances.append(instance_name)
 
-        # --- Cycle End & Sleep --- #
-        calculate_reset_time(app_type) # Pass app_type here if needed by the function
+            # --- Cycle End & Sleep --- #
+            set_log_context(instance_name=None, operation=None)
+            calculate_reset_time(app_type) # Pass app_type here if needed by the function
 
-        # Log cycle completion
-        if processed_any_items:
-            app_logger.info(f"=== {app_type.upper()} cycle finished. Processed items across instances. ===")
-        else:
-            app_logger.info(f"=== {app_type.upper()} cycle finished. No items processed in any instance. ===")
+            # Log cycle completion
+            if processed_any_items:
+                app_logger.info(f"=== {app_type.upper()} cycle finished. Processed items across instances. ===")
+            else:
+                app_logger.info(f"=== {app_type.upper()} cycle finished. No items processed in any instance. ===")
             
-        # Add state management summary logging for user clarity (only for hunting apps, not Swaparr)
-        if app_type != "swaparr":
-            try:
-                from src.primary.stateful_manager import get_state_management_summary
+            # Add state management summary logging for user clarity (only for hunting apps, not Swaparr)
+            if app_type != "swaparr":
+                try:
+                    from src.primary.stateful_manager import get_state_management_summary
                 
-                # Get summary for each enabled instance with per-instance settings
-                instance_summaries = []
-                total_processed = 0
-                has_any_processed = False
+                    # Get summary for each enabled instance with per-instance settings
+                    instance_summaries = []
+                    total_processed = 0
+                    has_any_processed = False
                 
-                for instance_name in enabled_instances:
-                    # Get per-instance settings
-                    instance_hours = None
-                    instance_enabled = True
-                    instance_mode = "custom"
+                    for instance_name in enabled_instances:
+                        # Get per-instance settings
+                        instance_hours = None
+                        instance_enabled = True
+                        instance_mode = "custom"
                     
-                    try:
-                        # Look up the instance in the configured instances
-                        if configured_instances and app_type in configured_instances:
-                            for instance_details in configured_instances[app_type]:
-                                if instance_details.get("instance_name") == instance_name:
-                                    instance_hours = instance_details.get("state_management_hours", 168)
-                                    instance_mode = instance_details.get("state_management_mode", "custom")
-                                    instance_enabled = (instance_mode != "disabled")
-                                    break
-                    except Exception as e:
-                        app_logger.warning(f"Could not load instance settings for {instance_name}: {e}")
-                        instance_hours = 168  # Default fallback
+                        try:
+                            # Look up the instance in the configured instances
+                            if configured_instances and app_type in configured_instances:
+                                for instance_details in configured_instances[app_type]:
+                                    if instance_details.get("instance_name") == instance_name:
+                                        instance_hours = instance_details.get("state_management_hours", 168)
+                                        instance_mode = instance_details.get("state_management_mode", "custom")
+                                        instance_enabled = (instance_mode != "disabled")
+                                        break
+                        except Exception as e:
+                            app_logger.warning(f"Could not load instance settings for {instance_name}: {e}")
+                            instance_hours = 168  # Default fallback
                     
-                    # Get summary for this instance
-                    summary = get_state_management_summary(app_type, instance_name, instance_hours)
+                        # Get summary for this instance
+                        summary = get_state_management_summary(app_type, instance_name, instance_hours)
                     
-                    # Store instance-specific information
-                    instance_summaries.append({
-                        "name": instance_name,
-                        "enabled": instance_enabled,
-                        "mode": instance_mode,
-                        "hours": instance_hours,
-                        "processed_count": summary["processed_count"],
-                        "next_reset_time": summary["next_reset_time"],
-                        "has_processed_items": summary["has_processed_items"]
-                    })
+                        # Store instance-specific information
+                        instance_summaries.append({
+                            "name": instance_name,
+                            "enabled": instance_enabled,
+                            "mode": instance_mode,
+                            "hours": instance_hours,
+                            "processed_count": summary["processed_count"],
+                            "next_reset_time": summary["next_reset_time"],
+                            "has_processed_items": summary["has_processed_items"]
+                        })
                     
-                    # Only count if state management is enabled for this instance
-                    if instance_enabled and summary["has_processed_items"]:
-                        total_processed += summary["processed_count"]
-                        has_any_processed = True
+                        # Only count if state management is enabled for this instance
+                        if instance_enabled and summary["has_processed_items"]:
+                            total_processed += summary["processed_count"]
+                            has_any_processed = True
                 
-                # Log per-instance state management info
-                if instance_summaries:
-                    app_logger.info(f"=== STATE MANAGEMENT SUMMARY FOR {app_type.upper()} ===")
+                    # Log per-instance state management info
+                    if instance_summaries:
+                        app_logger.info(f"=== STATE MANAGEMENT SUMMARY FOR {app_type.upper()} ===")
                     
-                    for inst in instance_summaries:
-                        if inst["enabled"]:
-                            if inst["processed_count"] > 0:
-                                app_logger.info(f"  {inst['name']}: {inst['processed_count']} items tracked, next reset: {inst['next_reset_time']} ({inst['hours']}h interval)")
+                        for inst in instance_summaries:
+                            if inst["enabled"]:
+                                if inst["processed_count"] > 0:
+                                    app_logger.info(f"  {inst['name']}: {inst['processed_count']} items tracked, next reset: {inst['next_reset_time']} ({inst['hours']}h interval)")
+                                else:
+                                    app_logger.info(f"  {inst['name']}: No items tracked yet, next reset: {inst['next_reset_time']} ({inst['hours']}h interval)")
                             else:
-                                app_logger.info(f"  {inst['name']}: No items tracked yet, next reset: {inst['next_reset_time']} ({inst['hours']}h interval)")
-                        else:
-                            app_logger.info(f"  {inst['name']}: State management disabled")
+                                app_logger.info(f"  {inst['name']}: State management disabled")
                     
-                    # Overall summary
-                    if not processed_any_items and has_any_processed:
-                        # Items were skipped due to state management
-                        app_logger.info(f"RESULT: {total_processed} items skipped due to state management (already processed)")
-                    elif processed_any_items:
-                        # Items were processed, show summary
-                        app_logger.info(f"RESULT: Items processed successfully. Total tracked across instances: {total_processed}")
-                    else:
-                        # No items processed and no state management blocking
-                        if total_processed > 0:
-                            app_logger.info(f"RESULT: No new items found. Total tracked across instances: {total_processed}")
+                        # Overall summary
+                        if not processed_any_items and has_any_processed:
+                            # Items were skipped due to state management
+                            app_logger.info(f"RESULT: {total_processed} items skipped due to state management (already processed)")
+                        elif processed_any_items:
+                            # Items were processed, show summary
+                            app_logger.info(f"RESULT: Items processed successfully. Total tracked across instances: {total_processed}")
                         else:
-                            app_logger.info(f"RESULT: No items to process and no items tracked yet")
+                            # No items processed and no state management blocking
+                            if total_processed > 0:
+                                app_logger.info(f"RESULT: No new items found. Total tracked across instances: {total_processed}")
+                            else:
+                                app_logger.info(f"RESULT: No items to process and no items tracked yet")
                     
-            except Exception as e:
-                app_logger.warning(f"Could not generate state management summary: {e}")
-        else:
-            # Swaparr uses its own state management for strikes and removed downloads
-            app_logger.debug(f"Swaparr uses its own strike/removal tracking, not the hunting state manager")
+                except Exception as e:
+                    app_logger.warning(f"Could not generate state management summary: {e}")
+            else:
+                # Swaparr uses its own state management for strikes and removed downloads
+                app_logger.debug(f"Swaparr uses its own strike/removal tracking, not the hunting state manager")
             
-        # Calculate sleep duration (use configured or default value)
-        sleep_seconds = app_settings.get("sleep_duration", 900)  # Default to 15 minutes
+            # Calculate sleep duration (use configured or default value)
+            sleep_seconds = app_settings.get("sleep_duration", 900)  # Default to 15 minutes
                 
-        # Sleep with periodic checks for reset file
-        # Calculate and format the time when the next cycle will begin
-        # Use user's selected timezone for all time operations
-        
-        # Get user's selected timezone
-        user_tz = _get_user_timezone()
+            # Sleep with periodic checks for reset file
+            # Calculate and format the time when the next cycle will begin
+            # Use user's selected timezone for all time operations
         
-        # Get current time in user's timezone - remove microseconds for clean timestamps
-        now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
+            # Get user's selected timezone
+            user_tz = _get_user_timezone()
         
-        # Calculate next cycle time in user's timezone without microseconds
-        next_cycle_time = now_user_tz + datetime.timedelta(seconds=sleep_seconds)
+            # Get current time in user's timezone - remove microseconds for clean timestamps
+            now_user_tz = datetime.datetime.now(user_tz).replace(microsecond=0)
         
-        app_logger.debug(f"Current time ({user_tz}): {now_user_tz.strftime('%Y-%m-%d %H:%M:%S')}")
-        app_logger.info(f"Next cycle will begin at {next_cycle_time.strftime('%Y-%m-%d %H:%M:%S')} ({user_tz})")
-        app_logger.info(f"Sleep duration: {sleep_seconds} seconds")
+            # Calculate next cycle time in user's timezone without microseconds
+            next_cycle_time = now_user_tz + datetime.timedelta(seconds=sleep_seconds)
         
-        # Update cycle tracking with user timezone time
-        next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
-        update_next_cycle(app_type, next_cycle_naive)
+            app_logger.debug(f"Current time ({user_tz}): {now_user_tz.strftime('%Y-%m-%d %H:%M:%S')}")
+            app_logger.info(f"Next cycle will begin at {next_cycle_time.strftime('%Y-%m-%d %H:%M:%S')} ({user_tz})")
+            app_logger.info(f"Sleep duration: {sleep_seconds} seconds")
         
-        # Mark cycle as ended (set cyclelock to False) and update next cycle time
-        # Use user's timezone for internal storage consistency
-        try:
-            from src.primary.cycle_tracker import end_cycle
-            # Convert timezone-aware datetime to naive for clean timestamp generation
+            # Update cycle tracking with user timezone time
             next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
-            end_cycle(app_type, next_cycle_naive)
-        except Exception as e:
-            app_logger.warning(f"Failed to mark cycle end for {app_type}: {e}")
-            # Non-critical, continue execution
+            update_next_cycle(app_type, next_cycle_naive)
         
+            # Mark cycle as ended (set cyclelock to False) and update next cycle time
+            # Use user's timezone for internal storage consistency
+            try:
+                from src.primary.cycle_tracker import end_cycle
+                # Convert timezone-aware datetime to naive for clean timestamp generation
+                next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
+                end_cycle(app_type, next_cycle_naive)
+            except Exception as e:
+                app_logger.warning(f"Failed to mark cycle end for {app_type}: {e}")
+                # Non-critical, continue execution
+        finally:
+            # The sleep until the next cycle (and anything after it) isn't part of this cycle
+            clear_log_context()
+
         app_logger.debug(f"Sleeping for {sleep_seconds} seconds before next cycle...")
                 
         # Use shorter sleep intervals and check for reset file
@@ -795,25 +806,30 @@ def swaparr_app_loop():
                 start_cycle("swaparr")
                 
                 # Start cycle
-                swaparr_logger.info("=== SWAPARR cycle started. Processing stalled downloads across all instances. ===")
-                
+                set_log_context(cycle_id=new_cycle_id(), instance_name=None, operation="swaparr")
                 try:
-                    # Run Swaparr processing
-                    run_swaparr()
-                    swaparr_logger.info("=== SWAPARR cycle finished. Processed stalled downloads across instances. ===")
-                except Exception as e:
-                    swaparr_logger.error(f"Error during Swaparr processing: {e}", exc_info=True)
-                    swaparr_logger.info("=== SWAPARR cycle finished with errors. ===")
+                    swaparr_logger.info("=== SWAPARR cycle started. Processing stalled downloads across all instances. ===")
                 
-                # End cycle tracking
-                next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
-                end_cycle("swaparr", next_cycle_naive)
-                update_next_cycle("swaparr", next_cycle_naive)
+                    try:
+                        # Run Swaparr processing
+                        run_swaparr()
+                        swaparr_logger.info("=== SWAPARR cycle finished. Processed stalled downloads across instances. ===")
+                    except Exception as e:
+                        swaparr_logger.error(f"Error during Swaparr processing: {e}", exc_info=True)
+                        swaparr_logger.info("=== SWAPARR cycle finished with errors. ===")
+                
+                    # End cycle tracking
+                    next_cycle_naive = next_cycle_time.replace(tzinfo=None) if next_cycle_time.tzinfo else next_cycle_time
+                    end_cycle("swaparr", next_cycle_naive)
+                    update_next_cycle("swaparr", next_cycle_naive)
                 
-                # Sleep duration and next cycle info (like other apps)
-                swaparr_logger.debug(f"Current time ({user_tz}): {now_user_tz.strftime('%Y-%m-%d %H:%M:%S')}")
-                swaparr_logger.info(f"Next cycle will begin at {next_cycle_time.strftime('%Y-%m-%d %H:%M:%S')} ({user_tz})")
-                swaparr_logger.info(f"Sleep duration: {sleep_duration} seconds")
+                    # Sleep duration and next cycle info (like other apps)
+                    swaparr_logger.debug(f"Current time ({user_tz}): {now_user_tz.strftime('%Y-%m-%d %H:%M:%S')}")
+                    swaparr_logger.info(f"Next cycle will begin at {next_cycle_time.strftime('%Y-%m-%d %H:%M:%S')} ({user_tz})")
+                    swaparr_logger.info(f"Sleep duration: {sleep_duration} seconds")
+                finally:
+                    # The sleep until the next cycle isn't part of this cycle
+                    clear_log_context()
                 
                 # Sleep with responsiveness to stop events and reset requests (like other apps)
                 elapsed = 0
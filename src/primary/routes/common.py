@@ -4,6 +4,7 @@ Common routes blueprint for Huntarr web interface
 """
 
 import os
+import copy
 import json
 import base64
 import io
@@ -366,7 +367,7 @@ def setup():
                         from src.primary import settings_manager
                         
                         # Load current general settings
-                        general_settings = settings_manager.load_settings('general')
+                        general_settings = copy.deepcopy(settings_manager.load_settings('general'))
                         
                         # Update the proxy_auth_bypass setting
                         general_settings['proxy_auth_bypass'] = True
@@ -657,7 +658,7 @@ def generate_recovery_key():
             data = request.json or {}
             setup_mode = data.get('setup_mode', False)
             if setup_mode:
-                from ..utils.database import get_database
+                from src.primary.utils.database import get_database
                 db = get_database()
                 setup_progress = db.get_setup_progress()
                 if setup_progress and setup_progress.get('username'):
@@ -706,7 +707,7 @@ def generate_recovery_key():
                     return jsonify({"success": False, "error": "Invalid two-factor authentication code"}), 400
 
         # Generate the recovery key
-        from ..utils.database import get_database
+        from src.primary.utils.database import get_database
         db = get_database()
         recovery_key = db.generate_recovery_key(username)
 
@@ -741,7 +742,7 @@ def verify_recovery_key():
             return jsonify({"success": False, "error": "Recovery key is required"}), 400
 
         # Check rate limiting before processing
-        from ..utils.database import get_database
+        from src.primary.utils.database import get_database
         db = get_database()
         rate_limit_check = db.check_recovery_key_rate_limit(client_ip)
         
@@ -811,7 +812,7 @@ def reset_password_with_recovery_key():
             return jsonify({"success": False, "error": "Password must be at least 8 characters long."}), 400
 
         # Check rate limiting before processing
-        from ..utils.database import get_database
+        from src.primary.utils.database import get_database
         db = get_database()
         rate_limit_check = db.check_recovery_key_rate_limit(client_ip)
         
@@ -997,7 +998,7 @@ def database_integrity():
         return jsonify({"success": False, "error": "Authentication required"}), 401
     
     try:
-        from primary.utils.database import get_database
+        from src.primary.utils.database import get_database
         
         repair = request.json.get('repair', False) if request.method == 'POST' else False
         
@@ -1019,30 +1020,60 @@ def database_integrity():
 
 @common_bp.route('/api/database/backup', methods=['POST'])
 def create_database_backup():
-    """Create a verified backup of the database"""
+    """Start an online backup of the database (runs in the background unless wait is set)"""
     # Get username handling bypass modes
     username = get_user_for_request()
     if not username:
         return jsonify({"success": False, "error": "Authentication required"}), 401
     
     try:
-        from primary.utils.database import get_database
+        from src.primary.utils.database import get_database
+        from src.primary.utils.db_backup import BackupInProgressError
         
-        backup_name = request.json.get('backup_name') if request.json else None
+        data = request.get_json(silent=True) or {}
+        backup_name = data.get('backup_name')
+        compress = bool(data.get('compress', False))
+        pages_per_step = data.get('pages_per_step')
+        step_sleep = data.get('step_sleep_ms')
+        retention = data.get('retention')
         
         db = get_database()
-        backup_path = db.create_backup(backup_name)
         
-        # Get backup file size for confirmation
-        from pathlib import Path
-        backup_size = Path(backup_path).stat().st_size
+        if data.get('wait'):
+            # Synchronous backup for callers that need the file before responding
+            backup_path = db.create_backup(backup_name, compress=compress)
+            
+            # Get backup file size for confirmation
+            from pathlib import Path
+            backup_size = Path(backup_path).stat().st_size
+            
+            return jsonify({
+                'success': True,
+                'backup_path': backup_path,
+                'backup_size': backup_size,
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        try:
+            job = db.start_backup(
+                backup_name,
+                compress=compress,
+                pages_per_step=int(pages_per_step) if pages_per_step else None,
+                step_sleep=float(step_sleep) / 1000 if step_sleep is not None else None,
+                retention=int(retention) if retention is not None else None
+            )
+        except BackupInProgressError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'backup': db.get_backup_status()
+            }), 409
         
         return jsonify({
             'success': True,
-            'backup_path': backup_path,
-            'backup_size': backup_size,
+            'backup': job,
             'timestamp': datetime.now().isoformat()
-        })
+        }), 202
         
     except Exception as e:
         logger.error(f"Database backup creation failed: {e}")
@@ -1051,6 +1082,36 @@ def create_database_backup():
             'error': str(e)
         }), 500
 
+@common_bp.route('/api/database/backup/status', methods=['GET'])
+def database_backup_status():
+    """Get progress and status of the latest (or a specific) database backup"""
+    # Get username handling bypass modes
+    username = get_user_for_request()
+    if not username:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+    
+    try:
+        from src.primary.utils.database import get_database
+        
+        job_id = request.args.get('job_id')
+        status = get_database().get_backup_status(job_id)
+        
+        if job_id and status is None:
+            return jsonify({"success": False, "error": f"Unknown backup job {job_id}"}), 404
+        
+        return jsonify({
+            'success': True,
+            'backup': status,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Failed to get database backup status: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @common_bp.route('/api/database/maintenance', methods=['POST'])
 def trigger_database_maintenance():
     """Trigger immediate database maintenance operations"""
@@ -1060,22 +1121,17 @@ def trigger_database_maintenance():
         return jsonify({"success": False, "error": "Authentication required"}), 401
     
     try:
-        from primary.utils.database import get_database
+        from src.primary.utils.database import get_database
         
         db = get_database()
         
-        # Perform maintenance operations
+        # Full integrity check plus an immediate (forced) adaptive maintenance step
         maintenance_results = {
             'integrity_check': db.perform_integrity_check(repair=True),
-            'optimization': {'status': 'completed'},
-            'checkpoint': {'status': 'completed'}
+            'actions': db.run_maintenance(force=True),
+            'status': db.get_maintenance_status()
         }
         
-        # Run optimization and checkpoint
-        with db.get_connection() as conn:
-            conn.execute("PRAGMA optimize")
-            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
-        
         return jsonify({
             'success': True,
             'maintenance_results': maintenance_results,
@@ -1098,7 +1154,7 @@ def database_status():
         return jsonify({"success": False, "error": "Authentication required"}), 401
     
     try:
-        from primary.utils.database import get_database
+        from src.primary.utils.database import get_database
         import os
         
         db = get_database()
@@ -1126,9 +1182,28 @@ def database_status():
             'utilization': round((page_count - freelist_count) / page_count * 100, 2) if page_count > 0 else 0
         }
         
+        # Connection pool usage and (opt-in) per-statement SQL statistics
+        from src.primary.utils.database import get_logs_database
+        from src.primary.utils.sql_instrumentation import get_sql_stats
+        from src.primary.utils.clean_logger import get_log_coalescing_stats
+        from src.primary.utils.log_queue import get_log_queue_stats
+        
+        top = request.args.get('top', 25, type=int)
+        
         return jsonify({
             'success': True,
             'database_status': status_info,
+            'connection_pools': {
+                'huntarr': db.get_pool_stats(),
+                'logs': get_logs_database().get_pool_stats()
+            },
+            'maintenance': {
+                'huntarr': db.get_maintenance_status(),
+                'logs': get_logs_database().get_maintenance_status()
+            },
+            'sql_instrumentation': get_sql_stats(top=top),
+            'log_coalescing': get_log_coalescing_stats(top=top),
+            'log_queue': get_log_queue_stats(),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -1139,6 +1214,44 @@ def database_status():
             'error': str(e)
         }), 500
 
+@common_bp.route('/api/database/instrumentation', methods=['POST'])
+def configure_database_instrumentation():
+    """Enable/disable SQL statement instrumentation or reset its statistics"""
+    # Get username handling bypass modes
+    username = get_user_for_request()
+    if not username:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+    
+    try:
+        from src.primary.utils.database import get_database, get_logs_database
+        from src.primary.utils.sql_instrumentation import is_enabled, set_enabled, reset_sql_stats, get_sql_stats
+        
+        data = request.get_json() or {}
+        
+        if data.get('reset'):
+            reset_sql_stats()
+        
+        if 'enabled' in data or 'slow_query_ms' in data:
+            was_enabled = is_enabled()
+            set_enabled(data.get('enabled', was_enabled), data.get('slow_query_ms'))
+            if is_enabled() != was_enabled:
+                # Reopen pooled connections with the new connection class
+                get_database().recycle_connections()
+                get_logs_database().recycle_connections()
+        
+        return jsonify({
+            'success': True,
+            'sql_instrumentation': get_sql_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Failed to configure database instrumentation: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @common_bp.route('/api/setup/progress', methods=['GET', 'POST'])
 def setup_progress():
     """Get or save setup progress"""
@@ -4,55 +4,86 @@ Database-based log routes for Huntarr web interface
 Replaces file-based log reading with database queries
 """
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app
 from src.primary.utils.logger import get_logger
 from src.primary.utils.database import get_logs_database
+from src.primary.utils.log_partitions import to_epoch_ms
+from src.primary.utils.log_context import CONTEXT_FIELDS
 from src.primary.utils.timezone_utils import get_user_timezone
 from datetime import datetime
+from typing import Dict, List, Optional
+import csv
+import io
+import json
 import pytz
 
 logger = get_logger(__name__)
 log_routes_bp = Blueprint('log_routes', __name__)
 
-def _convert_timestamp_to_user_timezone(timestamp_str: str) -> str:
-    """Convert UTC timestamp to user's current timezone setting"""
-    try:
-        # Get current user timezone setting
-        user_timezone = get_user_timezone()
-        
-        # Parse the UTC timestamp (remove microseconds if present)
-        if '.' in timestamp_str:
-            # Remove microseconds: "2025-06-26 08:48:40.586072" -> "2025-06-26 08:48:40"
-            timestamp_str = timestamp_str.split('.')[0]
-        
-        # Remove any timezone suffix if present
-        timestamp_str = timestamp_str.replace('Z', '').replace('+00:00', '')
-        
-        # Parse as UTC datetime
+# Live log stream: keep-alive interval, reconnect delay, and most missed logs replayed on resume
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_RETRY_MS = 3000
+STREAM_RESUME_LIMIT = 1000
+# Export: rows rendered per chunk sent to the client
+EXPORT_CHUNK_ROWS = 500
+EXPORT_COLUMNS = ('id', 'timestamp', 'level', 'app_type', 'message', 'logger_name') + CONTEXT_FIELDS
+
+def _format_log_timestamps(timestamps: List[int]) -> List[str]:
+    """Render a page of epoch-millisecond log timestamps in the user's timezone
+    
+    The timezone is resolved once for the whole page, and rows logged in the
+    same second share one conversion.
+    """
+    user_timezone = get_user_timezone()
+    rendered = {}
+    formatted = []
+    for timestamp_ms in timestamps:
         try:
-            utc_dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            utc_dt = pytz.UTC.localize(utc_dt)
-        except ValueError:
-            # Try alternative format
-            utc_dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            if utc_dt.tzinfo is None:
-                utc_dt = pytz.UTC.localize(utc_dt)
-        
-        # Convert to user timezone
-        local_dt = utc_dt.astimezone(user_timezone)
-        
-        # Return formatted timestamp
-        result = local_dt.strftime('%Y-%m-%d %H:%M:%S')
-        return result
-        
-    except Exception as e:
-        logger.error(f"[LOG_CONVERT] Error converting timestamp {timestamp_str}: {e}")
-        # Fallback to original timestamp
-        return timestamp_str
+            second = int(timestamp_ms) // 1000
+        except (TypeError, ValueError):
+            # Not an epoch value - show it as stored
+            formatted.append(str(timestamp_ms))
+            continue
+        text = rendered.get(second)
+        if text is None:
+            text = datetime.fromtimestamp(second, tz=user_timezone).strftime('%Y-%m-%d %H:%M:%S')
+            rendered[second] = text
+        formatted.append(text)
+    return formatted
+
+def _format_log_lines(logs: List[dict]) -> List[str]:
+    """Format log rows for the frontend: timestamp|level|app_type|message"""
+    display_timestamps = _format_log_timestamps([log['timestamp'] for log in logs])
+    return [
+        f"{display_timestamp}|{log['level']}|{log['app_type']}|{log['message']}"
+        for display_timestamp, log in zip(display_timestamps, logs)
+    ]
+
+def _context_filters() -> Optional[Dict[str, str]]:
+    """Log context filters (instance_name, cycle_id, operation) from the query string"""
+    context = {field: request.args[field] for field in CONTEXT_FIELDS if request.args.get(field)}
+    return context or None
+
+def _sse_event(data: str, event_id: int = None, event: str = None) -> str:
+    """Encode one server-sent event (multi-line data becomes several data: lines)"""
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.extend(f"data: {line}" for line in data.split('\n'))
+    return "\n".join(lines) + "\n\n"
 
 @log_routes_bp.route('/api/logs/<app_type>')
 def get_logs(app_type):
-    """Get logs for a specific app type from database"""
+    """Get logs for a specific app type from database
+    
+    Pages by cursor when `before` (older page, from next_cursor) or `after`
+    (newer page, from prev_cursor) is given, otherwise by limit/offset.
+    `since_id` (from latest_id) returns only logs written since a previous response.
+    `instance_name`, `cycle_id` and `operation` filter on the log context recorded by
+    the hunting loops; `context` in the response lists each log's values.
+    """
     try:
         logs_db = get_logs_database()
         
@@ -61,61 +92,61 @@ def get_logs(app_type):
         limit = int(request.args.get('limit', 100))
         offset = int(request.args.get('offset', 0))
         search = request.args.get('search')
+        sort = request.args.get('sort')  # 'relevance' ranks each day's search results (newest day first)
+        before = request.args.get('before')
+        after = request.args.get('after')
+        since_id = request.args.get('since_id', type=int)
+        context = _context_filters()
         
-        # Handle 'all' app type by getting logs from all apps
-        if app_type == 'all':
-            # Get logs from all app types
-            logs = logs_db.get_logs(
-                app_type=None,  # None means all app types
-                level=level,
-                limit=limit,
-                offset=offset,
-                search=search
-            )
-        else:
-            # Map 'system' to actual app type in database
-            db_app_type = 'system' if app_type == 'system' else app_type
-            
-            # Get logs from specific app type
-            logs = logs_db.get_logs(
+        # 'all' means logs from every app type ('system' is stored as-is)
+        db_app_type = None if app_type == 'all' else app_type
+        
+        try:
+            page = logs_db.get_logs_page(
                 app_type=db_app_type,
                 level=level,
                 limit=limit,
                 offset=offset,
-                search=search
+                search=search,
+                sort=sort,
+                before=before,
+                after=after,
+                since_id=since_id,
+                context=context
             )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'logs': [],
+                'total': 0
+            }), 400
         
-        # Format logs for frontend (same format as file-based logs)
-        formatted_logs = []
-        for log in logs:
-            # Convert timestamp to user timezone
-            display_timestamp = _convert_timestamp_to_user_timezone(log['timestamp'])
-            
-            # Format as the frontend expects: timestamp|level|app_type|message
-            formatted_log = f"{display_timestamp}|{log['level']}|{log['app_type']}|{log['message']}"
-            formatted_logs.append(formatted_log)
-        
-        # Get total count for pagination
-        if app_type == 'all':
-            total_count = logs_db.get_log_count(
-                app_type=None,  # None means all app types
-                level=level,
-                search=search
-            )
-        else:
-            db_app_type = 'system' if app_type == 'system' else app_type
-            total_count = logs_db.get_log_count(
-                app_type=db_app_type,
-                level=level,
-                search=search
-            )
+        # Format logs for frontend (same format as file-based logs): timestamp|level|app_type|message
+        formatted_logs = _format_log_lines(page['logs'])
+        
+        # Get total count for pagination (exact and instant unless searching, then capped)
+        count_cap = logs_db.SEARCH_COUNT_CAP if search else None
+        total_count = logs_db.get_log_count(
+            app_type=db_app_type,
+            level=level,
+            search=search,
+            cap=count_cap,
+            context=context
+        )
         
         return jsonify({
             'success': True,
             'logs': formatted_logs,
+            'context': [{field: log.get(field) for field in CONTEXT_FIELDS} for log in page['logs']],
             'total': total_count,
+            'total_capped': bool(count_cap) and total_count >= count_cap,
             'offset': offset,
-            'limit': limit
+            'limit': limit,
+            'has_more': page['has_more'],
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor'],
+            'latest_id': max((log['id'] for log in page['logs']), default=since_id)
         })
         
     except Exception as e:
@@ -127,6 +158,137 @@ def get_logs(app_type):
             'total': 0
         }), 500
 
+@log_routes_bp.route('/logs')
+def stream_logs():
+    """Live log stream (server-sent events)
+    
+    `app` and `level` filter the stream like /api/logs. Every event carries its log ID,
+    so a reconnecting EventSource resumes from Last-Event-ID (or `last_id`) and first
+    receives the logs it missed. An `event: reset` means more logs were missed than are
+    replayed and the client should reload the page. A client that falls too far behind
+    is disconnected and resumes the same way.
+    """
+    app_type = request.args.get('app', 'all')
+    level = request.args.get('level')
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('last_id', type=int)
+    db_app_type = None if app_type == 'all' else app_type
+    
+    logs_db = get_logs_database()
+    events = logs_db.get_log_events()
+    # Subscribe before reading the backlog so nothing committed in between is missed
+    subscription = events.subscribe(db_app_type, level)
+    if subscription is None:
+        logger.warning("Too many live log streams, rejecting a new connection")
+        return Response(_sse_event("Too many active connections. Please try again later.", event="error"),
+                        mimetype='text/event-stream', status=429)
+    
+    def generate():
+        sent_id = last_id or 0
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        if last_id is not None:
+            page = logs_db.get_logs_page(app_type=db_app_type, level=level, limit=STREAM_RESUME_LIMIT,
+                                         since_id=last_id)
+            if page['has_more']:
+                yield _sse_event("", event="reset")
+            backlog = list(reversed(page['logs']))
+            for log, line in zip(backlog, _format_log_lines(backlog)):
+                yield _sse_event(line, event_id=log['id'])
+            if backlog:
+                # Pages are ordered by (timestamp, id); summary and batched rows can break id order
+                sent_id = max(sent_id, max(log['id'] for log in backlog))
+        
+        while not subscription.closed:
+            rows = events.wait(subscription, STREAM_KEEPALIVE_SECONDS)
+            if subscription.overflowed:
+                # Too far behind: end the stream, the browser reconnects with Last-Event-ID
+                logger.debug("Live log stream fell behind, disconnecting it")
+                return
+            # Rows already sent as part of the backlog come through the subscription too
+            rows = [row for row in rows if row['id'] > sent_id]
+            if not rows:
+                yield ": keep-alive\n\n"
+                continue
+            for log, line in zip(rows, _format_log_lines(rows)):
+                yield _sse_event(line, event_id=log['id'])
+            sent_id = max(sent_id, max(row['id'] for row in rows))
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    # Runs even if the client goes away before the stream starts
+    response.call_on_close(lambda: events.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable nginx buffering if using nginx
+    return response
+
+def _parse_export_time(value: str):
+    """Export range bound: epoch milliseconds or an ISO date/time (UTC unless it has an offset)"""
+    if value is None or value == '':
+        return None
+    if value.lstrip('-').isdigit():
+        return int(value)
+    return to_epoch_ms(value)
+
+@log_routes_bp.route('/api/logs/<app_type>/export')
+def export_logs(app_type):
+    """Download logs as NDJSON (default) or CSV, oldest first
+    
+    Covers archived days as well as logs.db unless `archived=false`. Filters:
+    `level`, `start`/`end` (epoch ms or ISO date/time, end exclusive), and the
+    log context fields `instance_name`, `cycle_id` and `operation`.
+    Rows are streamed in chunks, so exports of any size use constant memory.
+    """
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'success': False, 'error': "format must be 'ndjson' or 'csv'"}), 400
+    try:
+        start = _parse_export_time(request.args.get('start'))
+        end = _parse_export_time(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f"Invalid time range: {e}"}), 400
+    level = request.args.get('level')
+    include_archived = request.args.get('archived', 'true').lower() != 'false'
+    db_app_type = None if app_type == 'all' else app_type
+    
+    logs = get_logs_database().iter_logs(app_type=db_app_type, level=level, start=start, end=end,
+                                         include_archived=include_archived, context=_context_filters())
+    
+    def render(chunk: List[dict]) -> str:
+        records = [
+            dict({column: log.get(column) for column in EXPORT_COLUMNS},
+                 timestamp=datetime.fromtimestamp(log['timestamp'] / 1000, tz=pytz.UTC).isoformat(
+                     timespec='milliseconds'))
+            for log in chunk
+        ]
+        if export_format == 'csv':
+            out = io.StringIO()
+            csv.writer(out).writerows([[record[column] for column in EXPORT_COLUMNS] for record in records])
+            return out.getvalue()
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    
+    def generate():
+        if export_format == 'csv':
+            yield ",".join(EXPORT_COLUMNS) + "\r\n"
+        chunk = []
+        try:
+            for log in logs:
+                chunk.append(log)
+                if len(chunk) >= EXPORT_CHUNK_ROWS:
+                    yield render(chunk)
+                    chunk = []
+            if chunk:
+                yield render(chunk)
+        except Exception as e:
+            # Headers are already sent; end the download and leave a trace in the logs
+            logger.error(f"Error exporting logs for {app_type}: {e}")
+    
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    filename = f"huntarr-logs-{app_type}-{datetime.now(tz=pytz.UTC).strftime('%Y%m%d-%H%M%S')}.{extension}"
+    response = Response(generate(), mimetype='text/csv' if export_format == 'csv' else 'application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @log_routes_bp.route('/api/logs/<app_type>/clear', methods=['POST'])
 def clear_logs(app_type):
     """Clear logs for a specific app type"""
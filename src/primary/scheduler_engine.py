@@ -5,6 +5,7 @@ Handles execution of scheduled actions from database
 """
 
 import os
+import copy
 import json
 import threading
 import datetime
@@ -130,7 +131,7 @@ def execute_action(action_entry):
                     apps = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
                     for app in apps:
                         # Load settings from database
-                        config_data = load_settings(app)
+                        config_data = copy.deepcopy(load_settings(app))
                         if config_data:
                             # Update root level enabled field
                             config_data['enabled'] = False
@@ -159,7 +160,7 @@ def execute_action(action_entry):
                     base_app_name = get_base_app_name(app_type)
                     
                     # Load settings from database
-                    config_data = load_settings(base_app_name)
+                    config_data = copy.deepcopy(load_settings(base_app_name))
                     if config_data:
                         # Update root level enabled field
                         config_data['enabled'] = False
@@ -196,7 +197,7 @@ def execute_action(action_entry):
                     apps = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
                     for app in apps:
                         # Load settings from database
-                        config_data = load_settings(app)
+                        config_data = copy.deepcopy(load_settings(app))
                         if config_data:
                             # Update root level enabled field
                             config_data['enabled'] = True
@@ -225,7 +226,7 @@ def execute_action(action_entry):
                     base_app_name = get_base_app_name(app_type)
                     
                     # Load settings from database
-                    config_data = load_settings(base_app_name)
+                    config_data = copy.deepcopy(load_settings(base_app_name))
                     if config_data:
                         # Update root level enabled field
                         config_data['enabled'] = True
@@ -269,7 +270,7 @@ def execute_action(action_entry):
                         apps = ['sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros']
                         for app in apps:
                             # Load settings from database
-                            config_data = load_settings(app)
+                            config_data = copy.deepcopy(load_settings(app))
                             if config_data:
                                 config_data['hourly_cap'] = api_limit
                                 # Save settings to database
@@ -290,7 +291,7 @@ def execute_action(action_entry):
                         base_app_name = get_base_app_name(app_type)
                         
                         # Load settings from database
-                        config_data = load_settings(base_app_name)
+                        config_data = copy.deepcopy(load_settings(base_app_name))
                         if config_data:
                             config_data['hourly_cap'] = api_limit
                             # Save settings to database
@@ -6,9 +6,11 @@ Supports default configurations for different Arr applications
 """
 
 import os
+import copy
 import json
 import pathlib
 import logging
+import threading
 import time
 from typing import Dict, Any, Optional, List
 
@@ -25,27 +27,68 @@ DEFAULT_CONFIGS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'd
 # Known app types
 KNOWN_APP_TYPES = ["sonarr", "radarr", "lidarr", "readarr", "whisparr", "eros", "swaparr", "general"]
 
-# Add a settings cache with timestamps to avoid excessive database reads
-settings_cache = {}  # Format: {app_name: {'timestamp': timestamp, 'data': settings_dict}}
-CACHE_TTL = 5  # Cache time-to-live in seconds
+# Merged settings (stored values plus defaults) per app. Entries stay valid until
+# save_settings/clear_cache start a new cache generation, or the database reports that
+# the settings tables were changed elsewhere (see _check_for_external_changes).
+settings_cache = {}  # Format: {app_name: settings_dict}
+_cache_generation = 0
+_cache_lock = threading.Lock()
+_seen_settings_version = None
+
+# Parsed default_configs files by app name; each file is read once
+_default_settings_cache = {}
 
 def clear_cache(app_name=None):
     """Clear the settings cache for a specific app or all apps."""
-    global settings_cache
-    if app_name:
-        if app_name in settings_cache:
-            settings_logger.debug(f"Clearing cache for {app_name}")
-            settings_cache.pop(app_name, None)
-    else:
-        settings_logger.debug("Clearing entire settings cache")
-        settings_cache = {}
+    global settings_cache, _cache_generation
+    with _cache_lock:
+        # Loads that started before this don't get to store what they read
+        _cache_generation += 1
+        if app_name:
+            if app_name in settings_cache:
+                settings_logger.debug(f"Clearing cache for {app_name}")
+                settings_cache.pop(app_name, None)
+        else:
+            settings_logger.debug("Clearing entire settings cache")
+            settings_cache = {}
+
+def _check_for_external_changes():
+    """Drop cached settings if the settings tables changed behind save_settings
+    
+    Covers other processes and direct database writes. Polling is a PRAGMA
+    data_version on a dedicated connection, see HuntarrDatabase.get_settings_version.
+    """
+    global _seen_settings_version
+    try:
+        version = get_database().get_settings_version()
+    except Exception:
+        return
+    if version is not None and version != _seen_settings_version:
+        changed = _seen_settings_version is not None
+        _seen_settings_version = version
+        clear_cache()
+        if changed:
+            settings_logger.debug("Settings changed in the database, cleared settings cache")
+            try:
+                from src.primary.utils.timezone_utils import clear_timezone_cache
+                clear_timezone_cache()
+            except Exception as e:
+                settings_logger.warning(f"Could not clear timezone cache: {e}")
 
 def get_default_config_path(app_name: str) -> pathlib.Path:
     """Get the path to the default config file for a specific app."""
     return pathlib.Path(DEFAULT_CONFIGS_DIR) / f"{app_name}.json"
 
 def load_default_app_settings(app_name: str) -> Dict[str, Any]:
-    """Load default settings for a specific app from its JSON file."""
+    """Load default settings for a specific app (the JSON file is parsed once; callers get a copy)."""
+    defaults = _default_settings_cache.get(app_name)
+    if defaults is None:
+        defaults = _read_default_app_settings(app_name)
+        _default_settings_cache[app_name] = defaults
+    return copy.deepcopy(defaults)
+
+def _read_default_app_settings(app_name: str) -> Dict[str, Any]:
+    """Parse the default settings JSON file of an app."""
     default_file = get_default_config_path(app_name)
     if default_file.exists():
         try:
@@ -97,29 +140,26 @@ def load_settings(app_type, use_cache=True):
     
     Args:
         app_type: The app type to load settings for
-        use_cache: Whether to use the cached settings if available and recent
+        use_cache: Whether to use the cached settings if available
         
     Returns:
-        Dict containing the app settings
+        Dict containing the app settings. It is the cached dict shared with every
+        other caller: copy.deepcopy() it before changing it (e.g. to save it back).
     """
-    global settings_cache
-    
     # Only log unexpected app types that are not 'general'
     if app_type not in KNOWN_APP_TYPES and app_type != "general":
         settings_logger.warning(f"load_settings called with unexpected app_type: {app_type}")
     
+    _check_for_external_changes()
+    
     # Check if we have a valid cache entry
-    if use_cache and app_type in settings_cache:
-        cache_entry = settings_cache[app_type]
-        cache_age = time.time() - cache_entry.get('timestamp', 0)
-        
-        if cache_age < CACHE_TTL:
-            settings_logger.debug(f"Using cached settings for {app_type} (age: {cache_age:.1f}s)")
-            return cache_entry['data']
-        else:
-            settings_logger.debug(f"Cache expired for {app_type} (age: {cache_age:.1f}s)")
+    if use_cache:
+        cached = settings_cache.get(app_type)
+        if cached is not None:
+            return cached
     
     # No valid cache entry, load from database
+    generation = _cache_generation
     current_settings = {}
     
     try:
@@ -166,11 +206,10 @@ def load_settings(app_type, use_cache=True):
         settings_logger.info(f"Added missing default keys to {app_type} settings")
         save_settings(app_type, current_settings)
     
-    # Update cache
-    settings_cache[app_type] = {
-        'timestamp': time.time(),
-        'data': current_settings
-    }
+    # Update cache, unless the settings were saved or cleared while we were reading
+    with _cache_lock:
+        if generation == _cache_generation:
+            settings_cache[app_type] = current_settings
         
     return current_settings
 
@@ -450,7 +489,7 @@ def initialize_timezone_from_env():
             return
         
         # Load current general settings
-        general_settings = load_settings("general")
+        general_settings = copy.deepcopy(load_settings("general"))
         current_timezone = general_settings.get("timezone")
         
         # If timezone is not set in settings, initialize it from TZ environment variable
@@ -508,7 +547,7 @@ def initialize_base_url_from_env():
             base_url_env = base_url_env.rstrip('/')
 
         # Load current general settings
-        general_settings = load_settings("general")
+        general_settings = copy.deepcopy(load_settings("general"))
         current_base_url = general_settings.get("base_url", "").strip()
         
         # If base_url is not set in settings, initialize it from BASE_URL environment variable
@@ -590,7 +629,7 @@ def get_custom_tag(app_name: str, tag_type: str, default: str) -> str:
 
 def initialize_database():
     """Initialize database with default configurations if needed"""
-    from .utils.database import get_database
+    from src.primary.utils.database import get_database
     from pathlib import Path
     
     # Get database instance and ensure it exists
@@ -672,7 +711,7 @@ if __name__ == "__main__":
         _ensure_config_exists(app)
 
     # Test loading Sonarr settings
-    sonarr_settings = load_settings("sonarr")
+    sonarr_settings = copy.deepcopy(load_settings("sonarr"))
     settings_logger.info(f"Loaded Sonarr settings: {json.dumps(sonarr_settings, indent=2)}")
 
     # Test getting a specific setting
@@ -184,6 +184,50 @@ def get_processed_ids(app_type: str, instance_name: str) -> Set[str]:
         stateful_logger.error(f"Error reading processed IDs for {instance_name} from database: {e}")
         return set()
 
+def _get_instance_state_settings(app_type: str, instance_name: str) -> tuple:
+    """
+    Look up the state management mode and hours configured for an instance.
+    
+    Returns:
+        tuple: (mode, hours) - ("custom", 168) if the instance can't be found
+    """
+    instance_hours = 168  # Default
+    instance_mode = "custom"
+    
+    try:
+        from src.primary.settings_manager import load_settings
+        settings = load_settings(app_type)
+        
+        if settings and 'instances' in settings:
+            # Find the matching instance
+            for instance in settings['instances']:
+                if instance.get('name') == instance_name:
+                    instance_mode = instance.get('state_management_mode', 'custom')
+                    instance_hours = instance.get('state_management_hours', 168)
+                    break
+    except Exception as e:
+        stateful_logger.warning(f"Could not check state management mode for {app_type}/{instance_name}: {e}")
+        # Fall back to the defaults if we can't determine the mode
+    
+    return instance_mode, instance_hours
+
+def _prepare_instance_state(db, app_type: str, instance_name: str, instance_hours: int) -> bool:
+    """
+    Initialize per-instance state management and reset it if it has expired.
+    
+    Returns:
+        bool: True if the instance's state was reset (nothing is processed any more)
+    """
+    # Initialize per-instance state management if not already done
+    db.initialize_instance_state_management(app_type, instance_name, instance_hours)
+    
+    # Check if this instance's state has expired
+    if db.check_instance_expiration(app_type, instance_name):
+        stateful_logger.info(f"State management expired for {app_type}/{instance_name}, resetting...")
+        db.reset_instance_state_management(app_type, instance_name, instance_hours)
+        return True
+    return False
+
 def add_processed_id(app_type: str, instance_name: str, media_id: str) -> bool:
     """
     Add a media ID to the processed list for a specific app instance.
@@ -202,45 +246,17 @@ def add_processed_id(app_type: str, instance_name: str, media_id: str) -> bool:
     
     try:
         # First check if state management is enabled for this instance
-        instance_hours = 168  # Default
-        instance_mode = "custom"
+        instance_mode, instance_hours = _get_instance_state_settings(app_type, instance_name)
         
-        try:
-            from src.primary.settings_manager import load_settings
-            settings = load_settings(app_type)
-            
-            if settings and 'instances' in settings:
-                # Find the matching instance
-                for instance in settings['instances']:
-                    if instance.get('name') == instance_name:
-                        instance_mode = instance.get('state_management_mode', 'custom')
-                        instance_hours = instance.get('state_management_hours', 168)
-                        
-                        # If state management is disabled for this instance, don't add to processed list
-                        if instance_mode == 'disabled':
-                            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, not adding item {media_id} to processed list")
-                            return True  # Return True to indicate "success" (no error), but item wasn't actually added
-                        break
-        except Exception as e:
-            stateful_logger.warning(f"Could not check state management mode for {app_type}/{instance_name}: {e}")
-            # Fall back to adding anyway if we can't determine the mode
+        # If state management is disabled for this instance, don't add to processed list
+        if instance_mode == 'disabled':
+            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, not adding item {media_id} to processed list")
+            return True  # Return True to indicate "success" (no error), but item wasn't actually added
         
         db = get_database()
+        _prepare_instance_state(db, app_type, instance_name, instance_hours)
         
-        # Initialize per-instance state management if not already done
-        db.initialize_instance_state_management(app_type, instance_name, instance_hours)
-        
-        # Check if this instance's state has expired
-        if db.check_instance_expiration(app_type, instance_name):
-            stateful_logger.info(f"State management expired for {app_type}/{instance_name}, resetting before adding new ID...")
-            db.reset_instance_state_management(app_type, instance_name, instance_hours)
-        
-        # Check if already processed
-        if db.is_processed(app_type, instance_name, media_id):
-            stateful_logger.debug(f"[add_processed_id] ID {media_id} already in database for {app_type}/{instance_name}")
-            return True
-        
-        # Add the new ID
+        # INSERT OR IGNORE - an ID that is already processed is left as it is
         success = db.add_processed_id(app_type, instance_name, media_id)
         if success:
             stateful_logger.debug(f"[add_processed_id] Added ID {media_id} to database for {app_type}/{instance_name}")
@@ -250,6 +266,42 @@ def add_processed_id(app_type: str, instance_name: str, media_id: str) -> bool:
         stateful_logger.error(f"Error adding media ID {media_id} to database: {e}")
         return False
 
+def add_processed_ids_bulk(app_type: str, instance_name: str, media_ids: List[Any]) -> bool:
+    """
+    Add several media IDs to the processed list for a specific app instance in one write.
+    
+    Args:
+        app_type: The type of app (sonarr, radarr, etc.)
+        instance_name: The name of the instance
+        media_ids: The IDs of the processed media
+        
+    Returns:
+        bool: True if successful, False otherwise (or if state management is disabled)
+    """
+    if app_type not in APP_TYPES:
+        stateful_logger.warning(f"Unknown app type: {app_type}")
+        return False
+    
+    media_ids = [str(media_id) for media_id in media_ids]
+    if not media_ids:
+        return True
+    
+    try:
+        instance_mode, instance_hours = _get_instance_state_settings(app_type, instance_name)
+        if instance_mode == 'disabled':
+            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, not adding {len(media_ids)} items to processed list")
+            return True
+        
+        db = get_database()
+        _prepare_instance_state(db, app_type, instance_name, instance_hours)
+        
+        added = db.add_processed_ids_bulk(app_type, instance_name, media_ids)
+        stateful_logger.debug(f"[add_processed_ids_bulk] Added {added} of {len(media_ids)} IDs to database for {app_type}/{instance_name}")
+        return True
+    except Exception as e:
+        stateful_logger.error(f"Error adding {len(media_ids)} media IDs to database for {app_type}/{instance_name}: {e}")
+        return False
+
 def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
     """
     Check if a media ID has already been processed.
@@ -264,38 +316,15 @@ def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
     """
     try:
         # First check if state management is enabled for this instance
-        instance_hours = 168  # Default
-        instance_mode = "custom"
+        instance_mode, instance_hours = _get_instance_state_settings(app_type, instance_name)
         
-        try:
-            from src.primary.settings_manager import load_settings
-            settings = load_settings(app_type)
-            
-            if settings and 'instances' in settings:
-                # Find the matching instance
-                for instance in settings['instances']:
-                    if instance.get('name') == instance_name:
-                        instance_mode = instance.get('state_management_mode', 'custom')
-                        instance_hours = instance.get('state_management_hours', 168)
-                        
-                        # If state management is disabled for this instance, always return False (not processed)
-                        if instance_mode == 'disabled':
-                            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, treating item {media_id} as unprocessed")
-                            return False
-                        break
-        except Exception as e:
-            stateful_logger.warning(f"Could not check state management mode for {app_type}/{instance_name}: {e}")
-            # Fall back to checking anyway if we can't determine the mode
+        # If state management is disabled for this instance, always return False (not processed)
+        if instance_mode == 'disabled':
+            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, treating item {media_id} as unprocessed")
+            return False
         
         db = get_database()
-        
-        # Initialize per-instance state management if not already done
-        db.initialize_instance_state_management(app_type, instance_name, instance_hours)
-        
-        # Check if this instance's state has expired
-        if db.check_instance_expiration(app_type, instance_name):
-            stateful_logger.info(f"State management expired for {app_type}/{instance_name}, resetting...")
-            db.reset_instance_state_management(app_type, instance_name, instance_hours)
+        if _prepare_instance_state(db, app_type, instance_name, instance_hours):
             # After reset, item is not processed
             return False
         
@@ -303,17 +332,49 @@ def is_processed(app_type: str, instance_name: str, media_id: str) -> bool:
         media_id_str = str(media_id)
         is_in_db = db.is_processed(app_type, instance_name, media_id_str)
         
-        # Get total count for logging
-        processed_ids = db.get_processed_ids(app_type, instance_name)
-        total_count = len(processed_ids)
-        
-        stateful_logger.info(f"is_processed check: {app_type}/{instance_name}, ID:{media_id_str}, Found:{is_in_db}, Total IDs:{total_count}")
+        stateful_logger.debug(f"is_processed check: {app_type}/{instance_name}, ID:{media_id_str}, Found:{is_in_db}")
         
         return is_in_db
     except Exception as e:
         stateful_logger.error(f"Error checking if processed for {app_type}/{instance_name}, ID:{media_id}: {e}")
         return False
 
+def filter_unprocessed(app_type: str, instance_name: str, media_ids: List[Any]) -> List[Any]:
+    """
+    Return the media IDs that have not been processed yet, checking them all in one query.
+    
+    Args:
+        app_type: The type of app (sonarr, radarr, etc.)
+        instance_name: The name of the instance
+        media_ids: The IDs to check (ints or strings, compared as strings)
+        
+    Returns:
+        List: The unprocessed IDs in their original order and type (all of them if
+        state management is disabled or was just reset)
+    """
+    media_ids = list(media_ids)
+    if not media_ids:
+        return []
+    
+    try:
+        instance_mode, instance_hours = _get_instance_state_settings(app_type, instance_name)
+        if instance_mode == 'disabled':
+            stateful_logger.debug(f"State management disabled for {app_type}/{instance_name}, treating {len(media_ids)} items as unprocessed")
+            return media_ids
+        
+        db = get_database()
+        if _prepare_instance_state(db, app_type, instance_name, instance_hours):
+            return media_ids
+        
+        unprocessed_keys = set(db.filter_unprocessed(app_type, instance_name, [str(media_id) for media_id in media_ids]))
+        unprocessed = [media_id for media_id in media_ids if str(media_id) in unprocessed_keys]
+        
+        stateful_logger.debug(f"filter_unprocessed: {app_type}/{instance_name}, {len(unprocessed)} of {len(media_ids)} IDs unprocessed")
+        return unprocessed
+    except Exception as e:
+        stateful_logger.error(f"Error filtering processed IDs for {app_type}/{instance_name}: {e}")
+        return media_ids
+
 def get_stateful_management_info() -> Dict[str, Any]:
     """Get information about the stateful management system."""
     lock_info = get_lock_info()
@@ -354,8 +415,7 @@ def get_state_management_summary(app_type: str, instance_name: str, instance_hou
         db.initialize_instance_state_management(app_type, instance_name, expiration_hours)
         
         # Get processed IDs count
-        processed_ids = get_processed_ids(app_type, instance_name)
-        processed_count = len(processed_ids)
+        processed_count = db.get_processed_count(app_type, instance_name)
         
         # Get per-instance lock info for accurate next reset time
         lock_info = db.get_instance_lock_info(app_type, instance_name)
@@ -5,14 +5,49 @@ Provides database-only logging with clean, formatted messages for the web interf
 """
 
 import logging
+import threading
 import time
 import re
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 import pytz
 
+from src.primary.utils.log_coalescer import SWEEP_INTERVAL, LogCoalescer
+
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# Noise prefixes, removed in this order: "2024-01-01 12:00:00,123 ", "[2024-01-01 12:00:00] ", "INFO:",
+# "DEBUG:", "WARNING:", "ERROR:", "CRITICAL:". One optional group each, so stacked prefixes
+# ("INFO:DEBUG:") go exactly as they did with one anchored substitution per prefix.
+_PREFIX_RE = re.compile(
+    r'(?:\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} )?'
+    r'(?:\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] )?'
+    r'(?:INFO:)?(?:DEBUG:)?(?:WARNING:)?(?:ERROR:)?(?:CRITICAL:)?'
+)
+# First characters a noise prefix can start with; anything else skips the prefix regex
+_PREFIX_START = frozenset('0123456789[IDWEC')
+
+
+def clean_log_message(message: str) -> str:
+    """Strip ANSI codes, collapse whitespace and drop timestamp/level prefixes in one pass"""
+    if not message:
+        return ""
+    if '\x1b' in message:
+        message = _ANSI_RE.sub('', message)
+    message = ' '.join(message.split())
+    if message and message[0] in _PREFIX_START:
+        prefix_end = _PREFIX_RE.match(message).end()
+        if prefix_end:
+            message = message[prefix_end:].strip()
+    return message
+
+
+def record_message(record: logging.LogRecord) -> str:
+    """The record's rendered message, reusing the one an earlier handler's formatter stored"""
+    message = record.__dict__.get('message')
+    return message if message is not None else record.getMessage()
+
 
 class CleanLogFormatter(logging.Formatter):
     """
@@ -48,31 +83,7 @@ class CleanLogFormatter(logging.Formatter):
     
     def _clean_message(self, message: str) -> str:
         """Clean and format the log message"""
-        if not message:
-            return ""
-        
-        # Remove ANSI color codes
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        message = ansi_escape.sub('', message)
-        
-        # Remove excessive whitespace
-        message = re.sub(r'\s+', ' ', message).strip()
-        
-        # Remove common prefixes that add noise
-        prefixes_to_remove = [
-            r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ',  # Timestamp prefixes
-            r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] ',     # Bracketed timestamps
-            r'^INFO:',
-            r'^DEBUG:',
-            r'^WARNING:',
-            r'^ERROR:',
-            r'^CRITICAL:',
-        ]
-        
-        for prefix_pattern in prefixes_to_remove:
-            message = re.sub(prefix_pattern, '', message)
-        
-        return message.strip()
+        return clean_log_message(message)
     
     def format(self, record):
         """Format the log record into a clean message"""
@@ -84,7 +95,7 @@ class CleanLogFormatter(logging.Formatter):
         app_type = self._get_app_type_from_logger_name(record.name)
         
         # Clean the message
-        clean_message = self._clean_message(record.getMessage())
+        clean_message = clean_log_message(record_message(record))
         
         # Return formatted message: timestamp|level|app_type|message
         return f"{timestamp_str}|{record.levelname}|{app_type}|{clean_message}"
@@ -93,6 +104,9 @@ class CleanLogFormatter(logging.Formatter):
 class DatabaseLogHandler(logging.Handler):
     """
     Custom log handler that writes clean log messages to the logs database.
+    Records are queued and written in batches by the logs database's background
+    writer, so emit() never waits on SQLite. Bursts of the same message template
+    are collapsed into one row with a repeat count first (see log_coalescer).
     """
     
     def __init__(self, app_type: str):
@@ -113,12 +127,8 @@ class DatabaseLogHandler(logging.Handler):
         """Write the log record to the database"""
         try:
             # Get only the clean message part, not the full formatted string
-            # Check if formatter has _clean_message method (safety check)
-            if hasattr(self.formatter, '_clean_message'):
-                clean_message = self.formatter._clean_message(record.getMessage())
-            else:
-                # Fallback: use raw message if formatter doesn't have _clean_message
-                clean_message = record.getMessage()
+            # (the console/file formatters have usually rendered the message already)
+            clean_message = clean_log_message(record_message(record))
             
             # Use the app_type from constructor, or detect from logger name
             app_type = self.app_type
@@ -135,23 +145,81 @@ class DatabaseLogHandler(logging.Handler):
                 else:
                     app_type = 'system'
             
-            # Insert into database with UTC timestamp for timezone-agnostic storage
+            # Queue for the batched writer with UTC timestamp for timezone-agnostic storage
             utc_timestamp = datetime.fromtimestamp(record.created, tz=pytz.UTC)
-            self.logs_db.insert_log(
-                timestamp=utc_timestamp,
-                level=record.levelname,
+            # Log context (instance, cycle, operation) set by the hunting loops, see log_context.py
+            fields = record.__dict__
+            row = (utc_timestamp, record.levelname, app_type, clean_message, getattr(record, 'name', None),
+                   fields.get('instance_name'), fields.get('cycle_id'), fields.get('operation'))
+            # The format string identifies the template when the caller used %-style arguments
+            # (the log queue renders the message and keeps the format string in msg_template);
+            # without one the coalescer masks the numbers in the message instead
+            template = record.__dict__.get('msg_template')
+            if not isinstance(template, str):
+                template = record.msg if record.args and isinstance(record.msg, str) else None
+            self._enqueue(_coalescer.add(row, template))
+        except Exception as e:
+            # Don't use logger here to avoid infinite recursion
+            print(f"Error writing log to database: {e}")
+    
+    def _enqueue(self, rows):
+        for timestamp, level, app_type, message, logger_name, instance_name, cycle_id, operation in rows:
+            self.logs_db.enqueue_log(
+                timestamp=timestamp,
+                level=level,
                 app_type=app_type,
-                message=clean_message,
-                logger_name=getattr(record, 'name', None)
+                message=message,
+                logger_name=logger_name,
+                instance_name=instance_name,
+                cycle_id=cycle_id,
+                operation=operation
             )
+    
+    def flush(self):
+        """Write pending repeat summaries and wait for queued records to reach the database"""
+        try:
+            self._enqueue(_coalescer.flush())
         except Exception as e:
-            # Don't use logger here to avoid infinite recursion
             print(f"Error writing log to database: {e}")
+        if self._logs_db is not None:
+            self._logs_db.flush_logs()
 
 
 # Global database handlers registry
 _database_handlers: Dict[str, DatabaseLogHandler] = {}
 _setup_complete = False
+# Shared by all database handlers so quiet templates are summarized whichever app logs next
+_coalescer = LogCoalescer()
+_sweeper_stop = threading.Event()
+_sweeper_thread: Optional[threading.Thread] = None
+
+
+def get_log_coalescing_stats(top: int = 25) -> Dict[str, Any]:
+    """Repeat-coalescing counters and the most frequently emitted log templates"""
+    return _coalescer.stats(top=top)
+
+
+def _sweep_coalesced_logs():
+    """Write summaries of closed coalescing windows, even when nothing else is being logged"""
+    while not _sweeper_stop.wait(SWEEP_INTERVAL):
+        try:
+            rows = _coalescer.sweep()
+            if rows:
+                for handler in _database_handlers.values():
+                    handler._enqueue(rows)
+                    break
+        except Exception as e:
+            print(f"Error writing log to database: {e}")
+
+
+def flush_coalesced_logs():
+    """Write pending repeat summaries to the logs database (call before it is closed)"""
+    _sweeper_stop.set()
+    if _sweeper_thread is not None:
+        _sweeper_thread.join(timeout=SWEEP_INTERVAL * 2)
+    for handler in _database_handlers.values():
+        handler.flush()
+        break
 
 
 def setup_clean_logging():
@@ -159,13 +227,14 @@ def setup_clean_logging():
     Set up database logging handlers for all known logger types.
     This should be called once during application startup.
     """
-    global _setup_complete
+    global _setup_complete, _sweeper_thread
     
     # Prevent multiple setups
     if _setup_complete:
         return
     
     from src.primary.utils.logger import get_logger
+    from src.primary.utils.log_queue import add_log_sink
     
     # Known app types for Huntarr
     app_types = ['system', 'sonarr', 'radarr', 'lidarr', 'readarr', 'whisparr', 'eros', 'swaparr']
@@ -181,10 +250,11 @@ def setup_clean_logging():
         # Get the logger for this app type and add database handler
         logger = get_logger(app_type)
         
-        # Add database handler if not already added
-        if _database_handlers[app_type] not in logger.handlers:
-            logger.addHandler(_database_handlers[app_type])
+        # Add database handler to the logger's queued sinks if not already added
+        add_log_sink(logger, _database_handlers[app_type])
     
+    _sweeper_thread = threading.Thread(target=_sweep_coalesced_logs, name="log-coalescer-sweep", daemon=True)
+    _sweeper_thread.start()
     _setup_complete = True
 
 
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+SQLite connection pool for Huntarr
+Keeps a bounded set of long-lived, pre-configured connections per database file
+so callers no longer pay for connect + PRAGMA setup on every query.
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from urllib.parse import quote
+
+from src.primary.utils.sql_instrumentation import connection_factory
+from typing import Callable, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+CORRUPTION_MARKERS = ("file is not a database", "database disk image is malformed")
+
+
+def is_corruption_error(error: Exception) -> bool:
+    """Return True if a sqlite error indicates a corrupted database file"""
+    message = str(error)
+    return any(marker in message for marker in CORRUPTION_MARKERS)
+
+
+class PooledConnection:
+    """
+    Thin proxy around a pooled sqlite3.Connection.
+
+    Behaves like the underlying connection (execute, cursor, row_factory, ...).
+    Used as a context manager it commits or rolls back exactly like
+    ``with sqlite3.Connection`` and then hands the connection back to the pool.
+    """
+
+    __slots__ = ("_pool", "_conn", "_generation", "_pooled", "_released")
+
+    def __init__(self, pool: "SQLiteConnectionPool", conn: sqlite3.Connection, generation: int, pooled: bool):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_generation", generation)
+        object.__setattr__(self, "_pooled", pooled)
+        object.__setattr__(self, "_released", False)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name in PooledConnection.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for callers that never close or exit the context manager
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        """The underlying sqlite3 connection"""
+        return self._conn
+
+    def close(self):
+        """Return the connection to the pool (does not close the pooled connection)"""
+        if self._released:
+            return
+        object.__setattr__(self, "_released", True)
+        self._pool._release(self._conn, self._generation, self._pooled)
+
+
+class SQLiteConnectionPool:
+    """
+    Bounded checkout/return pool of configured SQLite connections.
+
+    - At most ``max_size`` connections are kept open; when all are checked out a
+      caller waits up to ``acquire_timeout`` seconds and then gets a temporary
+      overflow connection that is closed on return (avoids deadlocks on nested use).
+    - Idle connections are health checked with ``SELECT 1`` before reuse once they
+      have been idle longer than ``health_check_interval``.
+    - ``reset()`` drops every connection (used by corruption recovery before the
+      database file is moved away); ``close_all()`` is called on shutdown.
+    - ``read_only`` pools open ``mode=ro`` URI connections (falling back to a normal
+      open if the file cannot be opened read-only) and always set ``query_only``,
+      so they never take the write lock.
+    """
+
+    def __init__(self, db_path: Union[str, Path], configure: Callable[[sqlite3.Connection], None],
+                 name: str = "database", max_size: int = 8, acquire_timeout: float = 5.0,
+                 health_check_interval: float = 30.0, read_only: bool = False):
+        self.db_path = Path(db_path)
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.read_only = read_only
+        self._configure = configure
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle: List[tuple] = []  # (connection, last_used)
+        self._open_count = 0
+        self._generation = 0
+        self._closed = False
+
+        # Counters exposed through stats()
+        self._created = 0
+        self._reused = 0
+        self._overflow = 0
+        self._discarded = 0
+        self._waits = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        factory = connection_factory()
+        if self.read_only:
+            uri = f"file:{quote(self.db_path.resolve().as_posix())}?mode=ro"
+            try:
+                conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=factory)
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Read-only open of {self.name} failed ({e}), using query_only connection")
+                conn = sqlite3.connect(str(self.db_path), check_same_thread=False, factory=factory)
+        else:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, factory=factory)
+        if factory is not sqlite3.Connection:
+            # Label instrumented connections so statement stats are reported per database
+            conn.database_name = self.name
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection (raises on corruption or I/O errors)"""
+        conn = self._connect()
+        try:
+            self._configure(conn)
+            if self.read_only:
+                conn.execute("PRAGMA query_only = ON")
+            # Probe once when the connection is created rather than on every checkout
+            conn.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1").fetchone()
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding unhealthy {self.name} connection: {e}")
+            return False
+
+    def connection(self) -> PooledConnection:
+        """Check out a connection from the pool"""
+        deadline = None
+        with self._lock:
+            while True:
+                if self._closed:
+                    # Late callers during shutdown get a one-off connection
+                    pooled = False
+                    generation = self._generation
+                    break
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    generation = self._generation
+                    if time.monotonic() - last_used > self.health_check_interval:
+                        # Health check outside the lock
+                        self._lock.release()
+                        try:
+                            healthy = self._is_healthy(conn)
+                        finally:
+                            self._lock.acquire()
+                        if not healthy:
+                            self._discard_locked(conn)
+                            continue
+                    self._reused += 1
+                    return PooledConnection(self, conn, generation, True)
+
+                if self._open_count < self.max_size:
+                    self._open_count += 1
+                    pooled = True
+                    generation = self._generation
+                    break
+
+                if deadline is None:
+                    deadline = time.monotonic() + self.acquire_timeout
+                    self._waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._overflow += 1
+                    pooled = False
+                    generation = self._generation
+                    logger.debug(f"{self.name} pool exhausted ({self.max_size} connections), opening overflow connection")
+                    break
+                self._lock.wait(remaining)
+
+        try:
+            conn = self._open()
+        except Exception:
+            if pooled:
+                with self._lock:
+                    self._open_count -= 1
+                    self._lock.notify()
+            raise
+
+        with self._lock:
+            self._created += 1
+        return PooledConnection(self, conn, generation, pooled)
+
+    def _discard_locked(self, conn: sqlite3.Connection):
+        self._open_count -= 1
+        self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._lock.notify()
+
+    def _release(self, conn: sqlite3.Connection, generation: int, pooled: bool):
+        """Return a connection to the pool, rolling back any unfinished transaction"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            reusable = True
+        except sqlite3.Error:
+            reusable = False
+
+        if not pooled:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
+
+        with self._lock:
+            if not reusable or self._closed or generation != self._generation:
+                self._discard_locked(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    def reset(self):
+        """Close idle connections and retire checked-out ones when they are returned"""
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            for conn, _ in idle:
+                self._discard_locked(conn)
+        if idle:
+            logger.debug(f"Reset {self.name} connection pool ({len(idle)} idle connections closed)")
+
+    def close_all(self):
+        """Close every pooled connection; later checkouts get unpooled connections"""
+        with self._lock:
+            self._closed = True
+        self.reset()
+        logger.debug(f"Closed {self.name} connection pool")
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool usage counters"""
+        with self._lock:
+            return {
+                "read_only": self.read_only,
+                "max_size": self.max_size,
+                "open": self._open_count,
+                "idle": len(self._idle),
+                "in_use": self._open_count - len(self._idle),
+                "created": self._created,
+                "reused": self._reused,
+                "overflow": self._overflow,
+                "discarded": self._discarded,
+                "waits": self._waits,
+                "closed": self._closed,
+            }
@@ -5,21 +5,90 @@ Handles both app configurations, general settings, and stateful management data.
 """
 
 import os
+import copy
 import json
+import base64
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from urllib.parse import quote
+from typing import Dict, Iterator, List, Any, Optional, Set
 from datetime import datetime, timedelta
 import logging
 import time
 import shutil
+import threading
+
+from src.primary.utils.connection_pool import SQLiteConnectionPool, is_corruption_error
+from src.primary.utils.db_writer import GroupCommitWriter
+from src.primary.utils.schema_migrations import HUNTARR_MIGRATIONS, LOGS_MIGRATIONS
+from src.primary.utils.db_backup import DatabaseBackupManager
+from src.primary.utils.db_maintenance import AdaptiveMaintenance
+from src.primary.utils.media_keys import encode_media_key, decode_media_key
+from src.primary.utils.log_writer import BatchedLogWriter
+from src.primary.utils.log_search import build_match_query, ensure_log_search_index, fts5_available, fts_table_name
+from src.primary.utils.log_partitions import (
+    LOG_COLUMNS, create_partition, drop_partition, legacy_logs_exist, list_partitions, move_legacy_logs,
+    partition_day, partition_table, rebuild_logs_view, reserve_log_ids, retention_cutoff_day, to_epoch_ms
+)
+from src.primary.utils.log_buffer import RecentLogBuffer
+from src.primary.utils.log_events import LogEventBus
+from src.primary.utils.log_archive import ARCHIVE_COLUMNS, LogArchive
+from src.primary.utils.log_context import CONTEXT_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# Reads only use the read-only pool on threads that opt in (web requests, see web_server.py).
+# Hunting and background threads stay on the main pool next to the writer.
+_read_pool_opt_in = threading.local()
+
+
+def use_read_pool(enabled: bool = True):
+    """Route this thread's get_read_connection() calls to the read-only pool (or stop doing so)"""
+    _read_pool_opt_in.enabled = enabled
+
+
+def read_pool_enabled() -> bool:
+    """Return True if this thread opted in to the read-only pool"""
+    return getattr(_read_pool_opt_in, "enabled", False)
+
+
 class HuntarrDatabase:
     """Database manager for all Huntarr configurations and settings"""
     
+    # Connection pool sizing: app threads, Swaparr, scheduler and the waitress pool share it
+    POOL_MAX_SIZE = 16
+    # Read-only pool for web/API reads, sized to the waitress thread count (threads=8 in main.py)
+    READ_POOL_MAX_SIZE = 8
+    # How often get_settings_version retries after its connection failed
+    SETTINGS_WATCH_RETRY_SECONDS = 30
+    # Minimum time between PRAGMA data_version probes (changes from other processes show up this late)
+    SETTINGS_WATCH_POLL_SECONDS = 0.25
+    
     def __init__(self):
+        self._pool = None
+        self._read_pool = None
+        self._pool_lock = threading.Lock()
+        self._writer = None
+        # Per-thread future of the last write_behind() call, awaited by get_connection
+        self._pending_writes = threading.local()
+        self._backup_manager = None
+        self._maintenance = None
+        # (app_type, instance_name) -> stateful_instances.id, filled on first use
+        self._instance_ids: Dict[tuple, int] = {}
+        # Decoded general_settings rows; rebuilt after any write that bypasses save_general_settings
+        self._general_settings_lock = threading.RLock()
+        self._general_settings_snapshot = None
+        self._general_settings_generation = 0
+        # Dedicated connection polled for PRAGMA data_version, see get_settings_version
+        self._settings_watch_lock = threading.RLock()
+        self._settings_watch_conn = None
+        self._settings_data_version = None
+        self._settings_version = None
+        self._settings_watch_retry_at = 0.0
+        self._settings_watch_next_poll = 0.0
+        self._settings_watch_warned = False
+        # Users are never deleted, so once one exists authenticate_request can skip the query
+        self._user_exists = False
         self.db_path = self._get_database_path()
         self.ensure_database_exists()
     
@@ -44,25 +113,162 @@ class HuntarrDatabase:
         conn.execute('PRAGMA wal_autocheckpoint = 1000')
         conn.execute('PRAGMA busy_timeout = 30000')
     
+    def _configure_read_connection(self, conn):
+        """Configure a read-only SQLite connection (journal mode is left to the writers)"""
+        conn.execute('PRAGMA cache_size = 10000')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA mmap_size = 268435456')
+        conn.execute('PRAGMA busy_timeout = 30000')
+    
+    def _get_pool(self) -> SQLiteConnectionPool:
+        """Get the connection pool, rebuilding it if db_path has changed"""
+        pool = self._pool
+        if pool is not None and pool.db_path == Path(self.db_path):
+            return pool
+        with self._pool_lock:
+            if self._pool is None or self._pool.db_path != Path(self.db_path):
+                if self._pool is not None:
+                    self._pool.close_all()
+                self._pool = SQLiteConnectionPool(
+                    self.db_path,
+                    self._configure_connection,
+                    name="huntarr.db",
+                    max_size=self.POOL_MAX_SIZE
+                )
+            return self._pool
+    
     def get_connection(self):
-        """Get a configured SQLite connection with Synology NAS compatibility"""
+        """Get a pooled, pre-configured SQLite connection with Synology NAS compatibility
+        
+        Use as a context manager: the transaction is committed (or rolled back on error)
+        and the connection is returned to the pool on exit.
+        """
+        self._await_own_writes()
         try:
-            conn = sqlite3.connect(self.db_path)
-            self._configure_connection(conn)
-            # Test the connection by running a simple query
-            conn.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1").fetchone()
-            return conn
+            return self._get_pool().connection()
         except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
-            if "file is not a database" in str(e) or "database disk image is malformed" in str(e):
+            if is_corruption_error(e):
                 logger.error(f"Database corruption detected: {e}")
                 self._handle_database_corruption()
                 # Try connecting again after recovery
-                conn = sqlite3.connect(self.db_path)
-                self._configure_connection(conn)
-                return conn
+                return self._get_pool().connection()
             else:
                 raise
     
+    def _get_read_pool(self) -> SQLiteConnectionPool:
+        """Get the read-only connection pool, rebuilding it if db_path has changed"""
+        pool = self._read_pool
+        if pool is not None and pool.db_path == Path(self.db_path):
+            return pool
+        with self._pool_lock:
+            if self._read_pool is None or self._read_pool.db_path != Path(self.db_path):
+                if self._read_pool is not None:
+                    self._read_pool.close_all()
+                self._read_pool = SQLiteConnectionPool(
+                    self.db_path,
+                    self._configure_read_connection,
+                    name="huntarr.db (read)",
+                    max_size=self.READ_POOL_MAX_SIZE,
+                    read_only=True
+                )
+            return self._read_pool
+    
+    def get_read_connection(self):
+        """Get a pooled query_only connection for reads (dashboard and API handlers)
+        
+        Reads through this pool never take the write lock, so they are not held up by
+        the hunting loops or the group-commit writer. Writes on it raise an error.
+        Threads that have not opted in with use_read_pool() get a get_connection()
+        connection instead.
+        """
+        if not read_pool_enabled():
+            return self.get_connection()
+        self._await_own_writes()
+        try:
+            return self._get_read_pool().connection()
+        except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
+            if is_corruption_error(e):
+                logger.error(f"Database corruption detected: {e}")
+                self._handle_database_corruption()
+                return self._get_read_pool().connection()
+            else:
+                raise
+    
+    def _get_writer(self) -> GroupCommitWriter:
+        """Get the group-commit writer, creating it on first use"""
+        if self._writer is None:
+            with self._pool_lock:
+                if self._writer is None:
+                    self._writer = GroupCommitWriter(self.get_connection, name="huntarr.db")
+        return self._writer
+    
+    def submit_write(self, operation):
+        """Queue a write operation on the single writer thread
+        
+        The operation receives the writer's connection, must not commit, and its
+        return value is delivered through the returned Future once the batch commits.
+        """
+        return self._get_writer().submit(operation)
+    
+    def execute_write(self, operation):
+        """Run a write operation through the group-commit writer and wait for its result"""
+        return self._get_writer().execute(operation)
+    
+    def write_behind(self, operation):
+        """Queue a write whose result the caller does not need and return without waiting
+        
+        Errors are logged when the batch fails. The calling thread's next
+        get_connection() waits for the write first, so it still reads its own writes.
+        """
+        future = self._get_writer().submit(operation)
+        future.add_done_callback(self._log_write_behind_error)
+        self._pending_writes.future = future
+        return future
+    
+    @staticmethod
+    def _log_write_behind_error(future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Queued database write failed: {error}")
+    
+    def _await_own_writes(self):
+        """Wait for the last write_behind() write queued by this thread"""
+        future = getattr(self._pending_writes, "future", None)
+        if future is None:
+            return
+        self._pending_writes.future = None
+        try:
+            future.result()
+        except Exception:
+            pass  # Already logged by _log_write_behind_error
+    
+    def recycle_connections(self):
+        """Retire pooled connections so new ones pick up changed connection settings"""
+        for pool in (self._pool, self._read_pool):
+            if pool is not None:
+                pool.reset()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool and writer statistics"""
+        stats = self._get_pool().stats()
+        stats["read_pool"] = self._get_read_pool().stats()
+        if self._writer is not None:
+            stats["writer"] = self._writer.stats()
+        return stats
+    
+    def close(self):
+        """Flush queued writes and close all pooled connections (called on shutdown)"""
+        if self._maintenance is not None:
+            self._maintenance.stop()
+        if self._writer is not None:
+            self._writer.stop()
+        self._close_settings_watch()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close_all()
+            if self._read_pool is not None:
+                self._read_pool.close_all()
+    
     def _get_database_path(self) -> Path:
         """Get database path - use /config for Docker, Windows AppData, or local data directory"""
         # Check if running in Docker (config directory exists)
@@ -102,6 +308,16 @@ class HuntarrDatabase:
         
         logger.error(f"Handling database corruption for: {self.db_path}")
         
+        # Drop pooled connections before the file is moved away
+        if self._pool is not None:
+            self._pool.reset()
+        if self._read_pool is not None:
+            self._read_pool.reset()
+        self._instance_ids.clear()
+        self._invalidate_general_settings()
+        self._close_settings_watch()
+        self._user_exists = False
+        
         try:
             # Create backup of corrupted database if it exists
             if self.db_path.exists():
@@ -201,84 +417,69 @@ class HuntarrDatabase:
         
         return results
     
-    def create_backup(self, backup_path: str = None) -> str:
-        """Create a backup of the database using SQLite backup API"""
-        import time
-        import shutil
-        from pathlib import Path
-        
-        if not backup_path:
-            timestamp = int(time.time())
-            backup_filename = f"huntarr_backup_{timestamp}.db"
-            backup_path = self.db_path.parent / backup_filename
-        else:
-            backup_path = Path(backup_path)
+    def _get_backup_manager(self) -> DatabaseBackupManager:
+        """Get the online backup manager for the current database file"""
+        manager = self._backup_manager
+        if manager is None or manager.db_path != Path(self.db_path):
+            with self._pool_lock:
+                if self._backup_manager is None or self._backup_manager.db_path != Path(self.db_path):
+                    self._backup_manager = DatabaseBackupManager(self.db_path, prefix="huntarr_backup")
+                manager = self._backup_manager
+        return manager
+    
+    def create_backup(self, backup_path: str = None, compress: bool = False) -> str:
+        """Create a verified backup of the database using the SQLite online backup API
         
-        try:
-            # Ensure backup directory exists
-            backup_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Force WAL checkpoint before backup
-            with self.get_connection() as conn:
-                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-            
-            # Create backup using file copy (simple but effective)
-            shutil.copy2(self.db_path, backup_path)
-            
-            # Verify backup integrity
-            backup_db = HuntarrDatabase()
-            backup_db.db_path = backup_path
-            
-            if backup_db._check_database_integrity():
-                logger.info(f"Database backup created successfully: {backup_path}")
-                return str(backup_path)
-            else:
-                logger.error("Backup verification failed, removing corrupt backup")
-                backup_path.unlink(missing_ok=True)
-                raise Exception("Backup verification failed")
-                
-        except Exception as e:
-            logger.error(f"Failed to create database backup: {e}")
-            raise
+        Runs in the calling thread; use start_backup() to run it in the background.
+        """
+        job = self._get_backup_manager().run_backup(backup_path, compress=compress)
+        if job["state"] != "completed":
+            raise Exception(job["error"] or "Backup failed")
+        return job["backup_path"]
+    
+    def start_backup(self, backup_name: str = None, compress: bool = False, pages_per_step: int = None,
+                     step_sleep: float = None, retention: int = None) -> Dict[str, Any]:
+        """Start an online backup in the background and return its job status"""
+        return self._get_backup_manager().start_backup(
+            backup_name, compress=compress, pages_per_step=pages_per_step,
+            step_sleep=step_sleep, retention=retention
+        )
+    
+    def get_backup_status(self, job_id: str = None) -> Optional[Dict[str, Any]]:
+        """Get the status of a backup job (the latest one if job_id is None)"""
+        return self._get_backup_manager().get_status(job_id)
+    
+    def _get_maintenance(self) -> AdaptiveMaintenance:
+        """Get the adaptive maintenance engine for huntarr.db"""
+        if self._maintenance is None:
+            def activity():
+                stats = self._get_pool().stats()
+                return stats['created'] + stats['reused'] + stats['overflow']
+            
+            self._maintenance = AdaptiveMaintenance(
+                "huntarr.db",
+                self.db_path,
+                self.get_connection,
+                activity_probe=activity,
+                periodic_tasks=[("cleanup_rate_limits", 6 * 60 * 60, self.cleanup_expired_rate_limits)],
+                on_integrity_failure=lambda: self.perform_integrity_check(repair=True)
+            )
+        return self._maintenance
     
     def schedule_maintenance(self):
-        """Schedule regular maintenance tasks"""
-        import threading
-        import time
-        
-        def maintenance_worker():
-            while True:
-                try:
-                    # Wait 6 hours between maintenance cycles
-                    time.sleep(6 * 60 * 60)
-                    
-                    logger.info("Starting scheduled database maintenance")
-                    
-                    # Perform integrity check
-                    integrity_results = self.perform_integrity_check(repair=True)
-                    if integrity_results['status'] == 'error':
-                        logger.error("Database integrity issues detected during maintenance")
-                    
-                    # Clean up expired rate limit entries
-                    self.cleanup_expired_rate_limits()
-                    
-                    # Optimize database
-                    with self.get_connection() as conn:
-                        conn.execute("PRAGMA optimize")
-                        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
-                    
-                    logger.info("Scheduled database maintenance completed")
-                    
-                except Exception as e:
-                    logger.error(f"Database maintenance failed: {e}")
-        
-        # Start maintenance thread
-        maintenance_thread = threading.Thread(target=maintenance_worker, daemon=True)
-        maintenance_thread.start()
-        logger.info("Database maintenance scheduler started")
+        """Start the adaptive maintenance scheduler (metric driven, runs in quiet windows)"""
+        self._get_maintenance().start()
+    
+    def run_maintenance(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Run one maintenance step now; force ignores activity and thresholds"""
+        return self._get_maintenance().run_once(force=force)
+    
+    def get_maintenance_status(self) -> Dict[str, Any]:
+        """Get maintenance metrics, recent actions and pending work"""
+        return self._get_maintenance().get_status()
     
     def ensure_database_exists(self):
-        """Create database and all tables if they don't exist"""
+        """Create the database directory and apply any pending schema migrations"""
         try:
             # Ensure the database directory exists and is writable
             db_dir = self.db_path.parent
@@ -305,318 +506,25 @@ class HuntarrDatabase:
             logger.error(f"Error setting up database directory: {e}")
             raise
             
-        # Create all tables with corruption recovery
+        # Apply pending schema migrations with corruption recovery
         try:
-            self._create_all_tables()
+            self._apply_schema_migrations()
         except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
             if "file is not a database" in str(e) or "database disk image is malformed" in str(e):
-                logger.error(f"Database corruption detected during table creation: {e}")
+                logger.error(f"Database corruption detected during schema migration: {e}")
                 self._handle_database_corruption()
-                # Try creating tables again after recovery
-                self._create_all_tables()
+                # Try migrating again after recovery
+                self._apply_schema_migrations()
             else:
                 raise
                 
-    def _create_all_tables(self):
-        """Create all database tables"""
-        with self.get_connection() as conn:
-            
-            # Create app_configs table for all app settings
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS app_configs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL UNIQUE,
-                    config_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create general_settings table for general/global settings
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS general_settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    setting_key TEXT NOT NULL UNIQUE,
-                    setting_value TEXT NOT NULL,
-                    setting_type TEXT DEFAULT 'string',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create stateful_lock table for stateful management lock info
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS stateful_lock (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    created_at INTEGER NOT NULL,
-                    expires_at INTEGER NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create stateful_processed_ids table for processed media IDs
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS stateful_processed_ids (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    instance_name TEXT NOT NULL,
-                    media_id TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(app_type, instance_name, media_id)
-                )
-            ''')
-            
-            # Create stateful_instance_locks table for per-instance state management
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS stateful_instance_locks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    instance_name TEXT NOT NULL,
-                    created_at INTEGER NOT NULL,
-                    expires_at INTEGER NOT NULL,
-                    expiration_hours INTEGER NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(app_type, instance_name)
-                )
-            ''')
-            
-            # Create media_stats table for tracking hunted/upgraded media statistics
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS media_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    stat_type TEXT NOT NULL,
-                    stat_value INTEGER DEFAULT 0,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(app_type, stat_type)
-                )
-            ''')
-            
-            # Create hourly_caps table for API usage tracking
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS hourly_caps (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL UNIQUE,
-                    api_hits INTEGER DEFAULT 0,
-                    last_reset_hour INTEGER DEFAULT 0,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create sleep_data table for cycle tracking
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS sleep_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL UNIQUE,
-                    next_cycle_time TEXT,
-                    cycle_lock BOOLEAN DEFAULT FALSE,
-                    last_cycle_start TEXT,
-                    last_cycle_end TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create swaparr_stats table for Swaparr-specific statistics
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS swaparr_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    stat_key TEXT NOT NULL UNIQUE,
-                    stat_value INTEGER DEFAULT 0,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # History table moved to manager.db - remove this table if it exists
-            conn.execute('DROP TABLE IF EXISTS history')
-            
-            # Create schedules table for storing scheduled actions
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS schedules (
-                    id TEXT PRIMARY KEY,
-                    app_type TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    time_hour INTEGER NOT NULL,
-                    time_minute INTEGER NOT NULL,
-                    days TEXT NOT NULL,
-                    app_instance TEXT NOT NULL,
-                    enabled BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create state_data table for state management (processed IDs and reset times)
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS state_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    state_type TEXT NOT NULL,
-                    state_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(app_type, state_type)
-                )
-            ''')
-            
-            # Create swaparr_state table for Swaparr-specific state management
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS swaparr_state (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_name TEXT NOT NULL,
-                    state_type TEXT NOT NULL,
-                    state_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(app_name, state_type)
-                )
-            ''')
-            
-            # Create users table for authentication and user management
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL UNIQUE,
-                    password TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    two_fa_enabled BOOLEAN DEFAULT FALSE,
-                    two_fa_secret TEXT,
-                    temp_2fa_secret TEXT,
-                    plex_token TEXT,
-                    plex_user_data TEXT,
-                    recovery_key TEXT
-                )
-            ''')
-            
-            # Create sponsors table for GitHub sponsors data
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS sponsors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    login TEXT NOT NULL UNIQUE,
-                    name TEXT NOT NULL,
-                    avatar_url TEXT NOT NULL,
-                    url TEXT NOT NULL,
-                    tier TEXT DEFAULT 'Supporter',
-                    monthly_amount INTEGER DEFAULT 0,
-                    category TEXT DEFAULT 'past',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Logs table moved to separate logs.db - remove if it exists
-            conn.execute('DROP TABLE IF EXISTS logs')
-            
-            # Create recovery_key_rate_limit table for tracking failed recovery key attempts
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS recovery_key_rate_limit (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ip_address TEXT NOT NULL,
-                    username TEXT,
-                    failed_attempts INTEGER DEFAULT 0,
-                    locked_until TIMESTAMP,
-                    last_attempt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(ip_address)
-                )
-            ''')
-
-            # Create requestarr_requests table for tracking media requests
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS requestarr_requests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tmdb_id INTEGER NOT NULL,
-                    media_type TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    year INTEGER,
-                    overview TEXT,
-                    poster_path TEXT,
-                    backdrop_path TEXT,
-                    app_type TEXT NOT NULL,
-                    instance_name TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(tmdb_id, media_type, app_type, instance_name)
-                )
-            ''')
-
-            # Create hunt_history table for tracking processed media history
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS hunt_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    instance_name TEXT NOT NULL,
-                    media_id TEXT NOT NULL,
-                    processed_info TEXT NOT NULL,
-                    operation_type TEXT DEFAULT 'missing',
-                    discovered BOOLEAN DEFAULT FALSE,
-                    date_time INTEGER NOT NULL,
-                    date_time_readable TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Add temp_2fa_secret column if it doesn't exist (for existing databases)
-            try:
-                conn.execute('ALTER TABLE users ADD COLUMN temp_2fa_secret TEXT')
-                logger.info("Added temp_2fa_secret column to users table")
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
-            
-            # Add recovery_key column if it doesn't exist (for existing databases)
-            try:
-                conn.execute('ALTER TABLE users ADD COLUMN recovery_key TEXT')
-                logger.info("Added recovery_key column to users table")
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
-            
-            # Add plex_linked_at column if it doesn't exist (for existing databases)
-            try:
-                conn.execute('ALTER TABLE users ADD COLUMN plex_linked_at INTEGER')
-                logger.info("Added plex_linked_at column to users table")
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
-            
-            # Create reset_requests table for reset request management
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS reset_requests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_type TEXT NOT NULL,
-                    timestamp INTEGER NOT NULL,
-                    processed INTEGER NOT NULL,
-                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create indexes for better performance
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_app_configs_type ON app_configs(app_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_general_settings_key ON general_settings(setting_key)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_processed_app_instance ON stateful_processed_ids(app_type, instance_name)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_processed_media_id ON stateful_processed_ids(media_id)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_instance_locks_app_instance ON stateful_instance_locks(app_type, instance_name)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_media_stats_app_type ON media_stats(app_type, stat_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_hourly_caps_app_type ON hourly_caps(app_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_sleep_data_app_type ON sleep_data(app_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_stats_key ON swaparr_stats(stat_key)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_app_type ON schedules(app_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_enabled ON schedules(enabled)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_time ON schedules(time_hour, time_minute)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_state_data_app_type ON state_data(app_type, state_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_state_app_name ON swaparr_state(app_name, state_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_sponsors_login ON sponsors(login)')
-            # Logs indexes moved to logs.db
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_app_instance ON hunt_history(app_type, instance_name)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_date_time ON hunt_history(date_time)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_media_id ON hunt_history(media_id)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_operation_type ON hunt_history(operation_type)')
-            
-            conn.commit()
-            logger.info(f"Database initialized at: {self.db_path}")
+    def _apply_schema_migrations(self):
+        """Bring huntarr.db up to the latest schema version (no-op when current)"""
+        applied = HUNTARR_MIGRATIONS.apply_pending(self.get_connection)
+        if applied:
+            logger.info(f"Database initialized at: {self.db_path} (schema version {applied[-1]})")
+        else:
+            logger.debug(f"Database schema is current at: {self.db_path}")
     
     def get_app_config(self, app_type: str) -> Optional[Dict[str, Any]]:
         """Get app configuration from database"""
@@ -647,123 +555,181 @@ class HuntarrDatabase:
             conn.commit()
             # Auto-save enabled - no need to log every successful save
     
-    def get_general_settings(self) -> Dict[str, Any]:
-        """Get all general settings as a dictionary"""
-        with self.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
+    @staticmethod
+    def _encode_setting(value: Any) -> tuple:
+        """Return (setting_value, setting_type) as stored in general_settings"""
+        if isinstance(value, bool):
+            return str(value).lower(), 'boolean'
+        elif isinstance(value, int):
+            return str(value), 'integer'
+        elif isinstance(value, float):
+            return str(value), 'float'
+        elif isinstance(value, (list, dict)):
+            return json.dumps(value), 'json'
+        else:
+            return str(value), 'string'
+    
+    @staticmethod
+    def _decode_setting(value: str, setting_type: str) -> Any:
+        """Convert a stored general_settings value back to its Python type"""
+        if setting_type == 'boolean':
+            return value.lower() == 'true'
+        elif setting_type == 'integer':
+            return int(value)
+        elif setting_type == 'float':
+            return float(value)
+        elif setting_type == 'json':
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        else:  # string
+            return value
+    
+    def _invalidate_general_settings(self):
+        """Drop the general settings snapshot after a write that bypassed it"""
+        with self._general_settings_lock:
+            self._general_settings_generation += 1
+            self._general_settings_snapshot = None
+    
+    def _get_general_settings_snapshot(self) -> Dict[str, tuple]:
+        """Return {key: (setting_value, setting_type, decoded)}, loading it once per change"""
+        snapshot = self._general_settings_snapshot
+        if snapshot is not None:
+            return snapshot
+        
+        generation = self._general_settings_generation
+        with self.get_read_connection() as conn:
             cursor = conn.execute(
                 'SELECT setting_key, setting_value, setting_type FROM general_settings'
             )
-            
-            settings = {}
-            for row in cursor.fetchall():
-                key = row['setting_key']
-                value = row['setting_value']
-                setting_type = row['setting_type']
-                
-                # Convert value based on type
-                if setting_type == 'boolean':
-                    settings[key] = value.lower() == 'true'
-                elif setting_type == 'integer':
-                    settings[key] = int(value)
-                elif setting_type == 'float':
-                    settings[key] = float(value)
-                elif setting_type == 'json':
-                    try:
-                        settings[key] = json.loads(value)
-                    except json.JSONDecodeError:
-                        settings[key] = value
-                else:  # string
-                    settings[key] = value
-            
-            return settings
+            snapshot = {
+                key: (value, setting_type, self._decode_setting(value, setting_type))
+                for key, value, setting_type in cursor.fetchall()
+            }
+        
+        with self._general_settings_lock:
+            # Only publish it if no save happened while we were reading
+            if self._general_settings_generation == generation:
+                self._general_settings_snapshot = snapshot
+        return snapshot
+    
+    def get_settings_version(self) -> Optional[int]:
+        """Counter that changes whenever app_configs or general_settings change, from any process
+        
+        A dedicated connection's PRAGMA data_version only changes when another
+        connection committed something, so the counter itself (kept by triggers) is
+        only read after a commit. A change also drops the general settings snapshot,
+        which may have been bypassed. The probe runs at most every
+        SETTINGS_WATCH_POLL_SECONDS; calls in between return the last version
+        without taking the lock. Returns None if the counter can't be read; the
+        connection is then retried at most every SETTINGS_WATCH_RETRY_SECONDS.
+        """
+        if time.monotonic() < self._settings_watch_next_poll:
+            return self._settings_version
+        with self._settings_watch_lock:
+            try:
+                conn = self._settings_watch_conn
+                if conn is None:
+                    if time.monotonic() < self._settings_watch_retry_at:
+                        return None
+                    conn = self._open_settings_watch()
+                    self._settings_watch_conn = conn
+                data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+                self._settings_watch_next_poll = time.monotonic() + self.SETTINGS_WATCH_POLL_SECONDS
+                if data_version == self._settings_data_version:
+                    return self._settings_version
+                version = conn.execute('SELECT version FROM settings_version').fetchone()[0]
+            except sqlite3.Error as e:
+                if not self._settings_watch_warned:
+                    self._settings_watch_warned = True
+                    logger.warning(f"Could not read settings version, changes made outside this process "
+                                   f"will not refresh cached settings: {e}")
+                self._close_settings_watch()
+                self._settings_watch_retry_at = time.monotonic() + self.SETTINGS_WATCH_RETRY_SECONDS
+                return None
+            self._settings_data_version = data_version
+            if version != self._settings_version:
+                if self._settings_version is not None:
+                    self._invalidate_general_settings()
+                self._settings_version = version
+            return version
+    
+    def _open_settings_watch(self) -> sqlite3.Connection:
+        """Read-only connection for get_settings_version (URI built like the read pool's)"""
+        uri = f"file:{quote(self.db_path.resolve().as_posix())}?mode=ro"
+        try:
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Read-only open of huntarr.db failed ({e}), using query_only connection")
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute('PRAGMA query_only = ON')
+        self._configure_read_connection(conn)
+        return conn
+    
+    def _close_settings_watch(self):
+        with self._settings_watch_lock:
+            conn, self._settings_watch_conn = self._settings_watch_conn, None
+            self._settings_data_version = None
+            self._settings_watch_next_poll = 0.0
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+    
+    @staticmethod
+    def _copy_setting(value: Any) -> Any:
+        # Callers modify the returned settings before saving them, keep the snapshot private
+        return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+    
+    def get_general_settings(self) -> Dict[str, Any]:
+        """Get all general settings as a dictionary"""
+        return {
+            key: self._copy_setting(decoded)
+            for key, (_, _, decoded) in self._get_general_settings_snapshot().items()
+        }
     
     def save_general_settings(self, settings: Dict[str, Any]):
-        """Save general settings to database"""
-        with self.get_connection() as conn:
+        """Save general settings to database, writing only the keys that changed"""
+        with self._general_settings_lock:
+            snapshot = self._get_general_settings_snapshot()
+            changes = []
             for key, value in settings.items():
-                # Determine type and convert value
-                if isinstance(value, bool):
-                    setting_type = 'boolean'
-                    setting_value = str(value).lower()
-                elif isinstance(value, int):
-                    setting_type = 'integer'
-                    setting_value = str(value)
-                elif isinstance(value, float):
-                    setting_type = 'float'
-                    setting_value = str(value)
-                elif isinstance(value, (list, dict)):
-                    setting_type = 'json'
-                    setting_value = json.dumps(value)
-                else:
-                    setting_type = 'string'
-                    setting_value = str(value)
-                
-                conn.execute('''
+                setting_value, setting_type = self._encode_setting(value)
+                current = snapshot.get(key)
+                if current is None or current[0] != setting_value or current[1] != setting_type:
+                    changes.append((key, setting_value, setting_type))
+            
+            if not changes:
+                return
+            
+            with self.get_connection() as conn:
+                conn.executemany('''
                     INSERT OR REPLACE INTO general_settings 
                     (setting_key, setting_value, setting_type, updated_at)
                     VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (key, setting_value, setting_type))
+                ''', changes)
+                conn.commit()
             
-            conn.commit()
+            updated = dict(snapshot)
+            for key, setting_value, setting_type in changes:
+                updated[key] = (setting_value, setting_type, self._decode_setting(setting_value, setting_type))
+            self._general_settings_generation += 1
+            self._general_settings_snapshot = updated
             # Auto-save enabled - no need to log every successful save
     
     def get_general_setting(self, key: str, default: Any = None) -> Any:
         """Get a specific general setting"""
-        with self.get_connection() as conn:
-            cursor = conn.execute(
-                'SELECT setting_value, setting_type FROM general_settings WHERE setting_key = ?',
-                (key,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                value, setting_type = row
-                
-                # Convert value based on type
-                if setting_type == 'boolean':
-                    return value.lower() == 'true'
-                elif setting_type == 'integer':
-                    return int(value)
-                elif setting_type == 'float':
-                    return float(value)
-                elif setting_type == 'json':
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        return value
-                else:  # string
-                    return value
-            
+        entry = self._get_general_settings_snapshot().get(key)
+        if entry is None:
             return default
+        return self._copy_setting(entry[2])
     
     def set_general_setting(self, key: str, value: Any):
         """Set a specific general setting"""
-        # Determine type and convert value
-        if isinstance(value, bool):
-            setting_type = 'boolean'
-            setting_value = str(value).lower()
-        elif isinstance(value, int):
-            setting_type = 'integer'
-            setting_value = str(value)
-        elif isinstance(value, float):
-            setting_type = 'float'
-            setting_value = str(value)
-        elif isinstance(value, (list, dict)):
-            setting_type = 'json'
-            setting_value = json.dumps(value)
-        else:
-            setting_type = 'string'
-            setting_value = str(value)
-        
-        with self.get_connection() as conn:
-            conn.execute('''
-                INSERT OR REPLACE INTO general_settings 
-                (setting_key, setting_value, setting_type, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (key, setting_value, setting_type))
-            conn.commit()
-            logger.debug(f"Set general setting {key} = {value}")
+        self.save_general_settings({key: value})
+        logger.debug(f"Set general setting {key} = {value}")
     
     def get_version(self) -> str:
         """Get the current version from database"""
@@ -832,47 +798,143 @@ class HuntarrDatabase:
             conn.commit()
             logger.debug(f"Set stateful lock: created_at={created_at}, expires_at={expires_at}")
     
+    def _cached_instance_id(self, app_type: str, instance_name: str) -> Optional[int]:
+        """Look up an instance id in the stateful_instances dictionary (None if unknown)"""
+        key = (app_type, instance_name)
+        instance_id = self._instance_ids.get(key)
+        if instance_id is not None:
+            return instance_id
+        with self.get_read_connection() as conn:
+            row = conn.execute(
+                'SELECT id FROM stateful_instances WHERE app_type = ? AND instance_name = ?',
+                key
+            ).fetchone()
+        if row:
+            self._instance_ids[key] = row[0]
+            return row[0]
+        return None
+    
+    @staticmethod
+    def _ensure_instance_id(conn, app_type: str, instance_name: str) -> int:
+        """Return the dictionary id for an instance, creating it on the given write connection"""
+        conn.execute('''
+            INSERT OR IGNORE INTO stateful_instances (app_type, instance_name)
+            VALUES (?, ?)
+        ''', (app_type, instance_name))
+        return conn.execute(
+            'SELECT id FROM stateful_instances WHERE app_type = ? AND instance_name = ?',
+            (app_type, instance_name)
+        ).fetchone()[0]
+    
     def get_processed_ids(self, app_type: str, instance_name: str) -> Set[str]:
         """Get processed media IDs for a specific app instance"""
-        with self.get_connection() as conn:
-            cursor = conn.execute('''
-                SELECT media_id FROM stateful_processed_ids 
-                WHERE app_type = ? AND instance_name = ?
-            ''', (app_type, instance_name))
-            
-            return {row[0] for row in cursor.fetchall()}
+        instance_id = self._cached_instance_id(app_type, instance_name)
+        if instance_id is None:
+            return set()
+        with self.get_read_connection() as conn:
+            cursor = conn.execute(
+                'SELECT media_key FROM stateful_processed WHERE instance_id = ?',
+                (instance_id,)
+            )
+            return {decode_media_key(row[0]) for row in cursor.fetchall()}
     
     def add_processed_id(self, app_type: str, instance_name: str, media_id: str) -> bool:
         """Add a processed media ID for a specific app instance"""
+        cached_id = self._instance_ids.get((app_type, instance_name))
+        
+        def _insert(conn):
+            instance_id = cached_id or self._ensure_instance_id(conn, app_type, instance_name)
+            conn.execute('''
+                INSERT OR IGNORE INTO stateful_processed (instance_id, media_key, created_at)
+                VALUES (?, ?, ?)
+            ''', (instance_id, encode_media_key(media_id), int(time.time())))
+            return instance_id
+        
         try:
-            with self.get_connection() as conn:
-                conn.execute('''
-                    INSERT OR IGNORE INTO stateful_processed_ids 
-                    (app_type, instance_name, media_id)
-                    VALUES (?, ?, ?)
-                ''', (app_type, instance_name, str(media_id)))
-                conn.commit()
-                logger.debug(f"Added processed ID {media_id} for {app_type}/{instance_name}")
-                return True
+            # Only cache the id once the batch that may have created it is committed
+            self._instance_ids[(app_type, instance_name)] = self.execute_write(_insert)
+            logger.debug(f"Added processed ID {media_id} for {app_type}/{instance_name}")
+            return True
         except Exception as e:
             logger.error(f"Error adding processed ID {media_id} for {app_type}/{instance_name}: {e}")
             return False
     
     def is_processed(self, app_type: str, instance_name: str, media_id: str) -> bool:
         """Check if a media ID has been processed for a specific app instance"""
+        instance_id = self._cached_instance_id(app_type, instance_name)
+        if instance_id is None:
+            return False
         with self.get_connection() as conn:
             cursor = conn.execute('''
-                SELECT 1 FROM stateful_processed_ids 
-                WHERE app_type = ? AND instance_name = ? AND media_id = ?
-            ''', (app_type, instance_name, str(media_id)))
+                SELECT 1 FROM stateful_processed 
+                WHERE instance_id = ? AND media_key = ?
+            ''', (instance_id, encode_media_key(media_id)))
             
             return cursor.fetchone() is not None
     
+    def filter_unprocessed(self, app_type: str, instance_name: str, media_ids: List[Any]) -> List[Any]:
+        """Return the media IDs that have not been processed, in their original order
+        
+        All IDs are checked with one query: the encoded keys are passed as a JSON
+        array and joined against stateful_processed through json_each().
+        """
+        media_ids = list(media_ids)
+        if not media_ids:
+            return []
+        instance_id = self._cached_instance_id(app_type, instance_name)
+        if instance_id is None:
+            return media_ids
+        
+        keys = [encode_media_key(media_id) for media_id in media_ids]
+        with self.get_read_connection() as conn:
+            cursor = conn.execute('''
+                SELECT p.media_key FROM json_each(?) j
+                JOIN stateful_processed p ON p.instance_id = ? AND p.media_key = j.value
+            ''', (json.dumps(keys), instance_id))
+            processed = {row[0] for row in cursor.fetchall()}
+        
+        if not processed:
+            return media_ids
+        return [media_id for media_id, key in zip(media_ids, keys) if key not in processed]
+    
+    def add_processed_ids_bulk(self, app_type: str, instance_name: str, media_ids: List[Any]) -> int:
+        """Add several processed media IDs in one write; returns the number of new IDs"""
+        keys = list(dict.fromkeys(encode_media_key(media_id) for media_id in media_ids))
+        if not keys:
+            return 0
+        cached_id = self._instance_ids.get((app_type, instance_name))
+        created_at = int(time.time())
+        
+        def _insert(conn):
+            instance_id = cached_id or self._ensure_instance_id(conn, app_type, instance_name)
+            before = conn.total_changes
+            conn.executemany('''
+                INSERT OR IGNORE INTO stateful_processed (instance_id, media_key, created_at)
+                VALUES (?, ?, ?)
+            ''', [(instance_id, key, created_at) for key in keys])
+            return instance_id, conn.total_changes - before
+        
+        instance_id, added = self.execute_write(_insert)
+        self._instance_ids[(app_type, instance_name)] = instance_id
+        logger.debug(f"Added {added} of {len(keys)} processed IDs for {app_type}/{instance_name}")
+        return added
+    
+    def get_processed_count(self, app_type: str, instance_name: str) -> int:
+        """Count processed media IDs for a specific app instance"""
+        instance_id = self._cached_instance_id(app_type, instance_name)
+        if instance_id is None:
+            return 0
+        with self.get_read_connection() as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM stateful_processed WHERE instance_id = ?',
+                (instance_id,)
+            ).fetchone()[0]
+    
     def clear_all_stateful_data(self):
         """Clear all stateful management data (for reset)"""
         with self.get_connection() as conn:
-            # Clear processed IDs
-            conn.execute('DELETE FROM stateful_processed_ids')
+            # Clear processed IDs (the instance dictionary is kept, ids stay valid)
+            conn.execute('DELETE FROM stateful_processed')
             # Clear lock info
             conn.execute('DELETE FROM stateful_lock')
             # Clear per-instance locks
@@ -882,17 +944,17 @@ class HuntarrDatabase:
     
     def get_stateful_summary(self, app_type: str, instance_name: str) -> Dict[str, Any]:
         """Get summary of stateful data for an app instance"""
-        processed_ids = self.get_processed_ids(app_type, instance_name)
+        processed_count = self.get_processed_count(app_type, instance_name)
         return {
-            "processed_count": len(processed_ids),
-            "has_processed_items": len(processed_ids) > 0
+            "processed_count": processed_count,
+            "has_processed_items": processed_count > 0
         }
     
     # Per-Instance State Management Methods
     
     def get_instance_lock_info(self, app_type: str, instance_name: str) -> Dict[str, Any]:
         """Get state management lock information for a specific instance"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.execute('''
                 SELECT created_at, expires_at, expiration_hours 
                 FROM stateful_instance_locks 
@@ -910,13 +972,14 @@ class HuntarrDatabase:
     
     def set_instance_lock_info(self, app_type: str, instance_name: str, created_at: int, expires_at: int, expiration_hours: int):
         """Set state management lock information for a specific instance"""
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO stateful_instance_locks 
                 (app_type, instance_name, created_at, expires_at, expiration_hours, updated_at)
                 VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             ''', (app_type, instance_name, created_at, expires_at, expiration_hours))
-            conn.commit()
+        
+        self.execute_write(_upsert)
     
     def check_instance_expiration(self, app_type: str, instance_name: str) -> bool:
         """Check if state management has expired for a specific instance"""
@@ -934,8 +997,10 @@ class HuntarrDatabase:
         """Clear processed IDs for a specific instance"""
         with self.get_connection() as conn:
             conn.execute('''
-                DELETE FROM stateful_processed_ids 
-                WHERE app_type = ? AND instance_name = ?
+                DELETE FROM stateful_processed 
+                WHERE instance_id IN (
+                    SELECT id FROM stateful_instances WHERE app_type = ? AND instance_name = ?
+                )
             ''', (app_type, instance_name))
             conn.commit()
             logger.info(f"Cleared processed IDs for {app_type}/{instance_name}")
@@ -981,8 +1046,9 @@ class HuntarrDatabase:
                 has_lock_data = cursor.fetchone()[0] > 0
                 
                 cursor = conn.execute('''
-                    SELECT COUNT(*) FROM stateful_processed_ids 
-                    WHERE app_type = ? AND instance_name = ?
+                    SELECT COUNT(*) FROM stateful_processed p
+                    JOIN stateful_instances i ON i.id = p.instance_id
+                    WHERE i.app_type = ? AND i.instance_name = ?
                 ''', (app_type, old_instance_name))
                 has_processed_data = cursor.fetchone()[0] > 0
                 
@@ -998,8 +1064,9 @@ class HuntarrDatabase:
                 new_has_lock_data = cursor.fetchone()[0] > 0
                 
                 cursor = conn.execute('''
-                    SELECT COUNT(*) FROM stateful_processed_ids 
-                    WHERE app_type = ? AND instance_name = ?
+                    SELECT COUNT(*) FROM stateful_processed p
+                    JOIN stateful_instances i ON i.id = p.instance_id
+                    WHERE i.app_type = ? AND i.instance_name = ?
                 ''', (app_type, new_instance_name))
                 new_has_processed_data = cursor.fetchone()[0] > 0
                 
@@ -1018,16 +1085,23 @@ class HuntarrDatabase:
                 
                 # Migrate processed IDs
                 if has_processed_data:
+                    # Processed IDs reference the instance by id, so renaming the
+                    # dictionary entry moves them; drop an empty entry for the new name first
                     conn.execute('''
-                        UPDATE stateful_processed_ids 
-                        SET instance_name = ?, updated_at = CURRENT_TIMESTAMP
+                        DELETE FROM stateful_instances 
+                        WHERE app_type = ? AND instance_name = ?
+                    ''', (app_type, new_instance_name))
+                    conn.execute('''
+                        UPDATE stateful_instances 
+                        SET instance_name = ?
                         WHERE app_type = ? AND instance_name = ?
                     ''', (new_instance_name, app_type, old_instance_name))
                     
                     # Get count of migrated IDs for logging
                     cursor = conn.execute('''
-                        SELECT COUNT(*) FROM stateful_processed_ids 
-                        WHERE app_type = ? AND instance_name = ?
+                        SELECT COUNT(*) FROM stateful_processed p
+                        JOIN stateful_instances i ON i.id = p.instance_id
+                        WHERE i.app_type = ? AND i.instance_name = ?
                     ''', (app_type, new_instance_name))
                     migrated_count = cursor.fetchone()[0]
                     
@@ -1056,6 +1130,7 @@ class HuntarrDatabase:
                     logger.info(f"Migrated {migrated_history_count} hunt history entries from {app_type}/{old_instance_name} to {app_type}/{new_instance_name}")
                 
                 conn.commit()
+                self._instance_ids.clear()
                 logger.info(f"Successfully completed state management migration from {app_type}/{old_instance_name} to {app_type}/{new_instance_name}")
                 return True
                 
@@ -1067,7 +1142,7 @@ class HuntarrDatabase:
     
     def get_media_stats(self, app_type: str = None) -> Dict[str, Any]:
         """Get media statistics for an app or all apps"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             if app_type:
                 cursor = conn.execute(
                     'SELECT stat_type, stat_value FROM media_stats WHERE app_type = ?',
@@ -1085,25 +1160,27 @@ class HuntarrDatabase:
     
     def set_media_stat(self, app_type: str, stat_type: str, value: int):
         """Set a media statistic value"""
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO media_stats (app_type, stat_type, stat_value, updated_at)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             ''', (app_type, stat_type, value))
-            conn.commit()
+        
+        self.write_behind(_upsert)
     
     def increment_media_stat(self, app_type: str, stat_type: str, increment: int = 1):
         """Increment a media statistic"""
-        with self.get_connection() as conn:
+        def _increment(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO media_stats (app_type, stat_type, stat_value, updated_at)
                 VALUES (?, ?, COALESCE((SELECT stat_value FROM media_stats WHERE app_type = ? AND stat_type = ?), 0) + ?, CURRENT_TIMESTAMP)
             ''', (app_type, stat_type, app_type, stat_type, increment))
-            conn.commit()
+        
+        self.write_behind(_increment)
     
     def get_hourly_caps(self) -> Dict[str, Dict[str, int]]:
         """Get hourly API caps for all apps"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.execute('SELECT app_type, api_hits, last_reset_hour FROM hourly_caps')
             return {
                 row[0]: {"api_hits": row[1], "last_reset_hour": row[2]}
@@ -1116,38 +1193,43 @@ class HuntarrDatabase:
             import datetime
             last_reset_hour = datetime.datetime.now().hour
         
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO hourly_caps (app_type, api_hits, last_reset_hour, updated_at)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             ''', (app_type, api_hits, last_reset_hour))
-            conn.commit()
+        
+        self.execute_write(_upsert)
     
     def increment_hourly_cap(self, app_type: str, increment: int = 1):
         """Increment hourly API usage for an app"""
         import datetime
-        with self.get_connection() as conn:
+        current_hour = datetime.datetime.now().hour
+        
+        def _increment(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO hourly_caps (app_type, api_hits, last_reset_hour, updated_at)
                 VALUES (?, COALESCE((SELECT api_hits FROM hourly_caps WHERE app_type = ?), 0) + ?, 
                         COALESCE((SELECT last_reset_hour FROM hourly_caps WHERE app_type = ?), ?), CURRENT_TIMESTAMP)
-            ''', (app_type, app_type, increment, app_type, datetime.datetime.now().hour))
-            conn.commit()
+            ''', (app_type, app_type, increment, app_type, current_hour))
+        
+        self.write_behind(_increment)
     
     def reset_hourly_caps(self):
         """Reset all hourly API caps"""
         import datetime
         current_hour = datetime.datetime.now().hour
         
-        with self.get_connection() as conn:
+        def _reset(conn):
             conn.execute('''
                 UPDATE hourly_caps SET api_hits = 0, last_reset_hour = ?, updated_at = CURRENT_TIMESTAMP
             ''', (current_hour,))
-            conn.commit()
+        
+        self.execute_write(_reset)
     
     def get_sleep_data(self, app_type: str = None) -> Dict[str, Any]:
         """Get sleep/cycle data for an app or all apps"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             if app_type:
                 cursor = conn.execute('''
                     SELECT next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end 
@@ -1180,8 +1262,8 @@ class HuntarrDatabase:
     def set_sleep_data(self, app_type: str, next_cycle_time: str = None, cycle_lock: bool = None, 
                        last_cycle_start: str = None, last_cycle_end: str = None):
         """Set sleep/cycle data for an app"""
-        with self.get_connection() as conn:
-            # Get current data
+        def _upsert(conn):
+            # Get current data (read and write share the writer's transaction)
             cursor = conn.execute('''
                 SELECT next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end 
                 FROM sleep_data WHERE app_type = ?
@@ -1206,32 +1288,34 @@ class HuntarrDatabase:
                     INSERT INTO sleep_data (app_type, next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end, updated_at)
                     VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (app_type, next_cycle_time, cycle_lock, last_cycle_start, last_cycle_end))
-            
-            conn.commit()
+        
+        self.write_behind(_upsert)
     
     def get_swaparr_stats(self) -> Dict[str, int]:
         """Get Swaparr statistics"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.execute('SELECT stat_key, stat_value FROM swaparr_stats')
             return {row[0]: row[1] for row in cursor.fetchall()}
     
     def set_swaparr_stat(self, stat_key: str, value: int):
         """Set a Swaparr statistic value"""
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO swaparr_stats (stat_key, stat_value, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             ''', (stat_key, value))
-            conn.commit()
+        
+        self.write_behind(_upsert)
     
     def increment_swaparr_stat(self, stat_key: str, increment: int = 1):
         """Increment a Swaparr statistic"""
-        with self.get_connection() as conn:
+        def _increment(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO swaparr_stats (stat_key, stat_value, updated_at)
                 VALUES (?, COALESCE((SELECT stat_value FROM swaparr_stats WHERE stat_key = ?), 0) + ?, CURRENT_TIMESTAMP)
             ''', (stat_key, stat_key, increment))
-            conn.commit()
+        
+        self.write_behind(_increment)
 
     # History methods moved to manager_database.py - Hunt Manager functionality
 
@@ -1408,15 +1492,16 @@ class HuntarrDatabase:
     def set_state_data(self, app_type: str, state_type: str, data: Any):
         """Set state data for a specific app type and state type"""
         data_json = json.dumps(data)
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute(
                 '''INSERT OR REPLACE INTO state_data 
                    (app_type, state_type, state_data, updated_at) 
                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)''',
                 (app_type, state_type, data_json)
             )
-            conn.commit()
-            logger.debug(f"Set state data for {app_type}/{state_type}")
+        
+        self.execute_write(_upsert)
+        logger.debug(f"Set state data for {app_type}/{state_type}")
 
     def get_processed_ids_state(self, app_type: str, state_type: str) -> List[int]:
         """Get processed IDs for a specific app type and state type (missing/upgrades)"""
@@ -1473,15 +1558,16 @@ class HuntarrDatabase:
     def set_swaparr_state_data(self, app_name: str, state_type: str, data: Any):
         """Set Swaparr state data for a specific app name and state type"""
         data_json = json.dumps(data)
-        with self.get_connection() as conn:
+        def _upsert(conn):
             conn.execute(
                 '''INSERT OR REPLACE INTO swaparr_state 
                    (app_name, state_type, state_data, updated_at) 
                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)''',
                 (app_name, state_type, data_json)
             )
-            conn.commit()
-            logger.debug(f"Set Swaparr state data for {app_name}/{state_type}")
+        
+        self.execute_write(_upsert)
+        logger.debug(f"Set Swaparr state data for {app_name}/{state_type}")
 
     def get_swaparr_strike_data(self, app_name: str) -> Dict[str, Any]:
         """Get strike data for a specific Swaparr app"""
@@ -1547,11 +1633,13 @@ class HuntarrDatabase:
 
     # User Management Methods
     def user_exists(self) -> bool:
-        """Check if any user exists in the database"""
+        """Check if any user exists in the database (cached once one does)"""
+        if self._user_exists:
+            return True
         with self.get_connection() as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM users')
-            count = cursor.fetchone()[0]
-            return count > 0
+            cursor = conn.execute('SELECT EXISTS(SELECT 1 FROM users)')
+            self._user_exists = bool(cursor.fetchone()[0])
+            return self._user_exists
     
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """Get user data by username"""
@@ -1608,6 +1696,7 @@ class HuntarrDatabase:
                     VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                 ''', (username, password, two_fa_enabled, two_fa_secret, plex_token, plex_data_json))
                 conn.commit()
+                self._user_exists = True
                 logger.info(f"Created user: {username}")
                 return True
         except Exception as e:
@@ -2131,36 +2220,37 @@ class HuntarrDatabase:
         
         date_time_readable = datetime.fromtimestamp(date_time).strftime('%Y-%m-%d %H:%M:%S')
         
-        with self.get_connection() as conn:
+        def _insert(conn):
             cursor = conn.execute('''
                 INSERT INTO hunt_history 
                 (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (app_type, instance_name, media_id, processed_info, operation_type, discovered, date_time, date_time_readable))
-            
-            entry_id = cursor.lastrowid
-            conn.commit()
-            
-            # Return the created entry
-            entry = {
-                "id": entry_id,
-                "app_type": app_type,
-                "instance_name": instance_name,
-                "media_id": media_id,
-                "processed_info": processed_info,
-                "operation_type": operation_type,
-                "discovered": discovered,
-                "date_time": date_time,
-                "date_time_readable": date_time_readable
-            }
-            
-            logger.info(f"Added hunt history entry for {app_type}-{instance_name}: {processed_info}")
-            return entry
+            return cursor.lastrowid
+        
+        # The writer resolves lastrowid once the batch containing this insert has committed
+        entry_id = self.execute_write(_insert)
+        
+        # Return the created entry
+        entry = {
+            "id": entry_id,
+            "app_type": app_type,
+            "instance_name": instance_name,
+            "media_id": media_id,
+            "processed_info": processed_info,
+            "operation_type": operation_type,
+            "discovered": discovered,
+            "date_time": date_time,
+            "date_time_readable": date_time_readable
+        }
+        
+        logger.info(f"Added hunt history entry for {app_type}-{instance_name}: {processed_info}")
+        return entry
     
     def get_hunt_history(self, app_type: str = None, search_query: str = None, 
                    page: int = 1, page_size: int = 20) -> Dict[str, Any]:
         """Get hunt history entries with pagination and filtering"""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             conn.row_factory = sqlite3.Row
             
             # Build WHERE clause
@@ -2239,11 +2329,7 @@ class HuntarrDatabase:
     def save_setup_progress(self, progress_data: dict) -> bool:
         """Save setup progress data to database"""
         try:
-            with self.get_connection() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO general_settings (setting_key, setting_value, setting_type) 
-                    VALUES ('setup_progress', ?, 'json')
-                """, (json.dumps(progress_data),))
+            self.save_general_settings({'setup_progress': progress_data})
             return True
         except Exception as e:
             logger.error(f"Failed to save setup progress: {e}")
@@ -2252,24 +2338,20 @@ class HuntarrDatabase:
     def get_setup_progress(self) -> dict:
         """Get setup progress data from database"""
         try:
-            with self.get_connection() as conn:
-                result = conn.execute(
-                    "SELECT setting_value FROM general_settings WHERE setting_key = 'setup_progress'"
-                ).fetchone()
-                
-                if result:
-                    return json.loads(result[0])
-                else:
-                    return {
-                        'current_step': 1,
-                        'completed_steps': [],
-                        'account_created': False,
-                        'two_factor_enabled': False,
-                        'plex_setup_done': False,
-                        'auth_mode_selected': False,
-                        'recovery_key_generated': False,
-                        'timestamp': datetime.now().isoformat()
-                    }
+            progress = self.get_general_setting('setup_progress')
+            if isinstance(progress, dict):
+                return progress
+            else:
+                return {
+                    'current_step': 1,
+                    'completed_steps': [],
+                    'account_created': False,
+                    'two_factor_enabled': False,
+                    'plex_setup_done': False,
+                    'auth_mode_selected': False,
+                    'recovery_key_generated': False,
+                    'timestamp': datetime.now().isoformat()
+                }
         except Exception as e:
             logger.error(f"Failed to get setup progress: {e}")
             return {
@@ -2290,6 +2372,7 @@ class HuntarrDatabase:
                 conn.execute(
                     "DELETE FROM general_settings WHERE setting_key = 'setup_progress'"
                 )
+            self._invalidate_general_settings()
             return True
         except Exception as e:
             logger.error(f"Failed to clear setup progress: {e}")
@@ -2298,11 +2381,7 @@ class HuntarrDatabase:
     def is_setup_in_progress(self) -> bool:
         """Check if setup is currently in progress"""
         try:
-            with self.get_connection() as conn:
-                result = conn.execute(
-                    "SELECT 1 FROM general_settings WHERE setting_key = 'setup_progress'"
-                ).fetchone()
-                return result is not None
+            return 'setup_progress' in self._get_general_settings_snapshot()
         except Exception as e:
             logger.error(f"Failed to check setup progress: {e}")
             return False
@@ -2398,8 +2477,43 @@ class HuntarrDatabase:
 class LogsDatabase:
     """Separate database class specifically for logs to keep logs.db separate from huntarr.db"""
     
+    # Log writes come from every logging thread; reads from the logs UI
+    POOL_MAX_SIZE = 8
+    # Read-only pool for the logs UI, sized to the waitress thread count (threads=8 in main.py)
+    READ_POOL_MAX_SIZE = 8
+    # Search totals stop counting here; the API reports them as "at least"
+    SEARCH_COUNT_CAP = 10000
+    # Default retention: whole days of logs kept, and entries kept per app (enforced by the hourly cleanup)
+    RETENTION_DAYS = 30
+    MAX_ENTRIES_PER_APP = 10000
+    # Rows moved per transaction from the pre-partitioning table, and the pause between batches
+    LEGACY_MOVE_BATCH = 5000
+    LEGACY_MOVE_PAUSE = 0.1
+    
     def __init__(self):
+        self._pool = None
+        self._read_pool = None
+        self._pool_lock = threading.Lock()
+        self._maintenance = None
+        self._log_writer = None
+        self._legacy_mover = None
+        self._closing = False
+        self._fts_enabled = False
+        # Days with a partition (oldest first); schema changes to partitions hold _partition_lock
+        self._partition_days = None
+        self._partition_lock = threading.RLock()
+        self.retention_days = self.RETENTION_DAYS
+        self.max_entries_per_app = self.MAX_ENTRIES_PER_APP
+        # Newest rows per app and an in-memory copy of log_counts, so polling the newest page skips SQLite
+        self._recent_logs = RecentLogBuffer(self._load_recent_logs)
+        self._log_totals = None
+        self._log_totals_generation = 0
+        self._log_totals_lock = threading.Lock()
+        # Committed rows are pushed to live log streams (/logs) from here
+        self._log_events = LogEventBus()
         self.db_path = self._get_logs_database_path()
+        # Days dropped by retention are kept as compressed segments next to logs.db
+        self._archive = LogArchive(self.db_path.parent / "logs_archive")
         self.ensure_logs_database_exists()
     
     def _get_logs_database_path(self) -> Path:
@@ -2459,31 +2573,142 @@ class LogsDatabase:
             logger.error(f"Error configuring logs database connection: {e}")
             pass
     
+    def _configure_logs_read_connection(self, conn):
+        """Configure a read-only SQLite connection for the logs UI"""
+        conn.execute('PRAGMA cache_size = -16000')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA busy_timeout = 30000')
+    
+    def _get_pool(self) -> SQLiteConnectionPool:
+        """Get the logs connection pool, rebuilding it if db_path has changed"""
+        pool = self._pool
+        if pool is not None and pool.db_path == Path(self.db_path):
+            return pool
+        with self._pool_lock:
+            if self._pool is None or self._pool.db_path != Path(self.db_path):
+                if self._pool is not None:
+                    self._pool.close_all()
+                self._pool = SQLiteConnectionPool(
+                    self.db_path,
+                    self._configure_logs_connection,
+                    name="logs.db",
+                    max_size=self.POOL_MAX_SIZE
+                )
+            return self._pool
+    
     def get_logs_connection(self):
-        """Get a configured SQLite connection for logs database"""
+        """Get a pooled, pre-configured SQLite connection for logs database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            self._configure_logs_connection(conn)
-            # Test connection
-            conn.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1").fetchone()
-            return conn
+            return self._get_pool().connection()
         except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
-            if "file is not a database" in str(e) or "database disk image is malformed" in str(e):
+            if is_corruption_error(e):
                 logger.error(f"Logs database corruption detected: {e}")
                 self._handle_logs_database_corruption()
                 # Try connecting again after recovery
-                conn = sqlite3.connect(self.db_path)
-                self._configure_logs_connection(conn)
-                return conn
+                return self._get_pool().connection()
             else:
                 raise
     
+    def _get_read_pool(self) -> SQLiteConnectionPool:
+        """Get the read-only logs connection pool, rebuilding it if db_path has changed"""
+        pool = self._read_pool
+        if pool is not None and pool.db_path == Path(self.db_path):
+            return pool
+        with self._pool_lock:
+            if self._read_pool is None or self._read_pool.db_path != Path(self.db_path):
+                if self._read_pool is not None:
+                    self._read_pool.close_all()
+                self._read_pool = SQLiteConnectionPool(
+                    self.db_path,
+                    self._configure_logs_read_connection,
+                    name="logs.db (read)",
+                    max_size=self.READ_POOL_MAX_SIZE,
+                    read_only=True
+                )
+            return self._read_pool
+    
+    def get_logs_read_connection(self):
+        """Get a pooled query_only connection for the logs API"""
+        try:
+            return self._get_read_pool().connection()
+        except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
+            if is_corruption_error(e):
+                logger.error(f"Logs database corruption detected: {e}")
+                self._handle_logs_database_corruption()
+                return self._get_read_pool().connection()
+            else:
+                raise
+    
+    def _get_maintenance(self) -> AdaptiveMaintenance:
+        """Get the adaptive maintenance engine for logs.db"""
+        if self._maintenance is None:
+            def activity():
+                stats = self._get_pool().stats()
+                return stats['created'] + stats['reused'] + stats['overflow']
+            
+            self._maintenance = AdaptiveMaintenance("logs.db", self.db_path, self.get_logs_connection,
+                                                    activity_probe=activity)
+        return self._maintenance
+    
+    def schedule_maintenance(self):
+        """Start the adaptive maintenance scheduler for logs.db"""
+        self._get_maintenance().start()
+    
+    def get_maintenance_status(self) -> Dict[str, Any]:
+        """Get logs.db maintenance metrics, recent actions and pending work"""
+        return self._get_maintenance().get_status()
+    
+    def recycle_connections(self):
+        """Retire pooled logs connections so new ones pick up changed connection settings"""
+        for pool in (self._pool, self._read_pool):
+            if pool is not None:
+                pool.reset()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get logs connection pool and log writer statistics"""
+        stats = self._get_pool().stats()
+        stats["read_pool"] = self._get_read_pool().stats()
+        if self._log_writer is not None:
+            stats["log_writer"] = self._log_writer.stats()
+        stats["recent_logs"] = self._recent_logs.stats()
+        stats["log_streams"] = self._log_events.stats()
+        stats["archive"] = self._archive.stats()
+        return stats
+    
+    def get_log_events(self) -> LogEventBus:
+        """Event bus that live log streams subscribe to for newly committed logs"""
+        return self._log_events
+    
+    def close(self):
+        """Flush queued log rows and close all pooled logs connections (called on shutdown)"""
+        self._closing = True
+        if self._legacy_mover is not None:
+            self._legacy_mover.join(timeout=10)
+        if self._log_writer is not None:
+            self._log_writer.stop()
+        self._log_events.close()
+        if self._maintenance is not None:
+            self._maintenance.stop()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close_all()
+            if self._read_pool is not None:
+                self._read_pool.close_all()
+    
     def _handle_logs_database_corruption(self):
         """Handle logs database corruption"""
         import time
         
         logger.error(f"Handling logs database corruption for: {self.db_path}")
         
+        # Drop pooled connections before the file is moved away
+        if self._pool is not None:
+            self._pool.reset()
+        if self._read_pool is not None:
+            self._read_pool.reset()
+        self._partition_days = None
+        self._logs_removed()
+        
         try:
             if self.db_path.exists():
                 backup_path = self.db_path.parent / f"logs_corrupted_backup_{int(time.time())}.db"
@@ -2503,153 +2728,658 @@ class LogsDatabase:
                 pass
     
     def ensure_logs_database_exists(self):
-        """Create logs database and tables if they don't exist"""
+        """Bring logs.db up to the latest schema version (no-op when current)"""
         try:
+            applied = LOGS_MIGRATIONS.apply_pending(self.get_logs_connection)
+            if applied:
+                logger.info(f"Logs database initialized at: {self.db_path} (schema version {applied[-1]})")
+            
+            # The FTS5 module depends on the SQLite build, so re-check it on every start
             with self.get_logs_connection() as conn:
-                # Create logs table
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp DATETIME NOT NULL,
-                        level TEXT NOT NULL,
-                        app_type TEXT NOT NULL,
-                        message TEXT NOT NULL,
-                        logger_name TEXT,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Create indexes for logs performance
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_type ON logs(app_type)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_level ON logs(app_type, level)')
-                
+                days = list_partitions(conn)
+                self._fts_enabled = fts5_available(conn)
+                for day in days:
+                    ensure_log_search_index(conn, partition_table(day))
                 conn.commit()
-                logger.info(f"Logs database initialized at: {self.db_path}")
+                legacy = legacy_logs_exist(conn)
+            self._partition_days = days
+            if legacy:
+                self._start_legacy_log_move()
+            if not self._fts_enabled:
+                logger.warning("SQLite FTS5 is not available - log search falls back to LIKE scans")
                 
         except (sqlite3.DatabaseError, sqlite3.OperationalError) as e:
             if "file is not a database" in str(e) or "database disk image is malformed" in str(e):
-                logger.error(f"Logs database corruption detected during table creation: {e}")
+                logger.error(f"Logs database corruption detected during schema migration: {e}")
                 self._handle_logs_database_corruption()
-                # Try creating tables again after recovery
+                # Try migrating again after recovery
                 self.ensure_logs_database_exists()
             else:
                 raise
     
-    def insert_log(self, timestamp: datetime, level: str, app_type: str, message: str, logger_name: str = None):
-        """Insert a log entry into the logs database"""
+    def _start_legacy_log_move(self):
+        """Move rows from before partitioning into day partitions in the background"""
+        if self._legacy_mover is not None and self._legacy_mover.is_alive():
+            return
+        self._legacy_mover = threading.Thread(target=self._move_legacy_logs, name="logs.db-partition-move",
+                                              daemon=True)
+        self._legacy_mover.start()
+    
+    def _move_legacy_logs(self):
+        """Drain logs_unpartitioned one short transaction at a time so log writes keep flowing"""
+        moved = 0
         try:
+            while not self._closing:
+                with self._partition_lock:
+                    with self.get_logs_connection() as conn:
+                        batch = move_legacy_logs(conn, self.LEGACY_MOVE_BATCH)
+                        current = list_partitions(conn)
+                        if current != self._partition_days:
+                            rebuild_logs_view(conn, current)
+                        conn.commit()
+                    self._partition_days = current
+                if not batch:
+                    logger.info(f"Moved {moved} log entries into day partitions")
+                    return
+                moved += batch
+                # The moved rows change counts and may belong in buffered pages
+                self._logs_removed()
+                time.sleep(self.LEGACY_MOVE_PAUSE)
+        except Exception as e:
+            logger.error(f"Error moving log entries into day partitions (will resume on next start): {e}")
+    
+    def _get_log_writer(self) -> BatchedLogWriter:
+        """Get the background writer that batches log inserts"""
+        if self._log_writer is None:
+            with self._pool_lock:
+                if self._log_writer is None:
+                    self._log_writer = BatchedLogWriter(self.insert_logs, name="logs.db")
+        return self._log_writer
+    
+    def enqueue_log(self, timestamp: datetime, level: str, app_type: str, message: str, logger_name: str = None,
+                    instance_name: str = None, cycle_id: str = None, operation: str = None) -> bool:
+        """Queue a log entry (with its optional log context) for the batched writer; returns False if it was dropped"""
+        return self._get_log_writer().enqueue(
+            (timestamp, level, app_type, message, logger_name, instance_name, cycle_id, operation)
+        )
+    
+    def flush_logs(self, timeout: float = 5.0) -> bool:
+        """Wait until queued log entries have been written"""
+        if self._log_writer is None:
+            return True
+        return self._log_writer.flush(timeout)
+    
+    def _get_log_totals(self) -> Dict[tuple, int]:
+        """Entries per (app_type, level): an in-memory copy of log_counts kept current by insert_logs"""
+        totals = self._log_totals
+        if totals is not None:
+            return totals
+        with self._log_totals_lock:
+            generation = self._log_totals_generation
+        with self.get_logs_read_connection() as conn:
+            cursor = conn.execute("SELECT app_type, level, SUM(count) FROM log_counts GROUP BY app_type, level")
+            totals = {(app_type, level): count for app_type, level, count in cursor.fetchall()}
+        with self._log_totals_lock:
+            # Only publish if no write happened while we were reading
+            if generation == self._log_totals_generation:
+                self._log_totals = totals
+        return totals
+    
+    def _logs_added(self, rows: List[tuple]):
+        """Feed committed rows (in LOG_COLUMNS order) to the recent-log buffer, the totals and live streams"""
+        columns = [column.strip() for column in LOG_COLUMNS.split(",")]
+        entries = [dict(zip(columns, row)) for row in rows]
+        self._recent_logs.append(entries)
+        self._log_events.publish(entries)
+        with self._log_totals_lock:
+            self._log_totals_generation += 1
+            if self._log_totals is not None:
+                totals = dict(self._log_totals)
+                for row in rows:
+                    key = (row[3], row[2])
+                    totals[key] = totals.get(key, 0) + 1
+                self._log_totals = totals
+    
+    def _logs_removed(self, app_type: str = None, keep_recent: bool = False):
+        """Forget cached totals, and buffered rows unless keep_recent, after entries were deleted"""
+        if not keep_recent:
+            self._recent_logs.invalidate(app_type)
+        with self._log_totals_lock:
+            self._log_totals_generation += 1
+            self._log_totals = None
+    
+    def _get_partition_days(self) -> List[str]:
+        """Days that have a log partition, oldest first"""
+        days = self._partition_days
+        if days is None:
+            with self.get_logs_read_connection() as conn:
+                days = list_partitions(conn)
+            self._partition_days = days
+        return list(days)
+    
+    def _ensure_partitions(self, days) -> None:
+        """Create partitions for days that don't have one yet
+        
+        A new partition usually means a new day has started, so expired
+        partitions are dropped at the same time.
+        """
+        missing = set(days) - set(self._get_partition_days())
+        if not missing:
+            return
+        with self._partition_lock:
             with self.get_logs_connection() as conn:
-                conn.execute('''
-                    INSERT INTO logs (timestamp, level, app_type, message, logger_name)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (timestamp, level, app_type, message, logger_name))
+                existing = set(list_partitions(conn))
+                for day in sorted(missing - existing):
+                    create_partition(conn, day)
+                cutoff = retention_cutoff_day(self.retention_days)
+                expired = [day for day in sorted(existing) if day < cutoff]
+                for day in expired:
+                    self._archive_partition(conn, day)
+                    drop_partition(conn, day)
+                current = list_partitions(conn)
+                rebuild_logs_view(conn, current)
+                conn.commit()
+            self._partition_days = current
+        if expired:
+            self._logs_removed()
+    
+    def _archive_partition(self, conn, day: str):
+        """Copy a partition into the compressed archive before it is dropped
+        
+        Failing to archive (e.g. a full disk) is logged but doesn't stop retention.
+        """
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM {partition_table(day)} ORDER BY timestamp, id"
+            )
+            archived = self._archive.append(day, cursor)
+            logger.debug(f"Archived {archived} log entries from {day}")
+        except Exception as e:
+            logger.warning(f"Could not archive logs from {day}, dropping them anyway: {e}")
+    
+    def _drop_partitions(self, days, archive: bool = False) -> int:
+        """Drop whole days of logs (archiving them first if asked); returns the number of entries removed"""
+        if not days:
+            return 0
+        with self._partition_lock:
+            with self.get_logs_connection() as conn:
+                placeholders = ",".join("?" * len(days))
+                removed = conn.execute(
+                    f"SELECT COALESCE(SUM(count), 0) FROM log_counts WHERE day IN ({placeholders})", list(days)
+                ).fetchone()[0]
+                for day in days:
+                    if archive:
+                        self._archive_partition(conn, day)
+                    drop_partition(conn, day)
+                current = list_partitions(conn)
+                rebuild_logs_view(conn, current)
+                conn.commit()
+            self._partition_days = current
+        self._logs_removed()
+        return removed
+    
+    def _enforce_app_caps(self, app_types) -> int:
+        """Trim apps over max_entries_per_app back to the cap, oldest entries first
+        
+        A partition holding nothing but entries that have to go is dropped
+        instead of being deleted row by row.
+        """
+        cap = self.max_entries_per_app
+        app_types = list(app_types)
+        if not cap or cap <= 0 or not app_types:
+            return 0
+        
+        deleted = 0
+        # Same lock order as _ensure_partitions and _drop_partitions: partition lock, then connection
+        with self._partition_lock:
+            with self.get_logs_connection() as conn:
+                placeholders = ",".join("?" * len(app_types))
+                over_cap = conn.execute(f"""
+                    SELECT app_type, SUM(count) FROM log_counts WHERE app_type IN ({placeholders})
+                    GROUP BY app_type HAVING SUM(count) > ?
+                """, app_types + [cap]).fetchall()
+                if not over_cap:
+                    return 0
+                
+                days = self._get_partition_days()
+                dropped = False
+                for app_type, total in over_cap:
+                    excess = total - cap
+                    for day in list(days):
+                        if excess <= 0:
+                            break
+                        app_count, day_count = conn.execute("""
+                            SELECT COALESCE(SUM(CASE WHEN app_type = ? THEN count END), 0), COALESCE(SUM(count), 0)
+                            FROM log_counts WHERE day = ?
+                        """, (app_type, day)).fetchone()
+                        if app_count == 0:
+                            continue
+                        if app_count == day_count and app_count <= excess:
+                            self._archive_partition(conn, day)
+                            drop_partition(conn, day)
+                            days.remove(day)
+                            dropped = True
+                            removed = app_count
+                        else:
+                            table = partition_table(day)
+                            removed = conn.execute(f"""
+                                DELETE FROM {table} WHERE id IN (
+                                    SELECT id FROM {table} WHERE app_type = ? ORDER BY timestamp ASC, id ASC LIMIT ?
+                                )
+                            """, (app_type, excess)).rowcount
+                        excess -= removed
+                        deleted += removed
+                if dropped:
+                    rebuild_logs_view(conn, days)
                 conn.commit()
+            if dropped:
+                self._partition_days = days
+        if deleted:
+            # Trimmed rows are older than anything buffered unless the cap is below the buffer size
+            self._logs_removed(keep_recent=cap >= self._recent_logs.capacity)
+        return deleted
+    
+    def insert_logs(self, rows: List[tuple]):
+        """Insert (timestamp, level, app_type, message, logger_name[, instance_name, cycle_id, operation])
+        rows in one transaction
+        
+        Timestamps are stored as epoch milliseconds and each row goes to the
+        partition of its UTC day. Apps the batch pushes over max_entries_per_app
+        are trimmed back to the cap afterwards (see _trim_apps_over_cap).
+        """
+        # created_at is set here (same format as CURRENT_TIMESTAMP) so buffered rows match stored ones
+        created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        rows = [(to_epoch_ms(row[0]),) + tuple(row[1:5]) + (created_at,) + (tuple(row[5:8]) + (None,) * 3)[:3]
+                for row in rows]
+        placeholders = ", ".join("?" * len(LOG_COLUMNS.split(",")))
+        days = [partition_day(row[0]) for row in rows]
+        for attempt in range(2):
+            self._ensure_partitions(days)
+            try:
+                with self.get_logs_connection() as conn:
+                    first_id = reserve_log_ids(conn, len(rows))
+                    stored = [(first_id + offset,) + row for offset, row in enumerate(rows)]
+                    by_day = {}
+                    for day, row in zip(days, stored):
+                        by_day.setdefault(day, []).append(row)
+                    for day, day_rows in by_day.items():
+                        conn.executemany(f'''
+                            INSERT INTO {partition_table(day)} ({LOG_COLUMNS})
+                            VALUES ({placeholders})
+                        ''', day_rows)
+                    conn.commit()
+                break
+            except sqlite3.OperationalError as e:
+                # A partition was dropped under us (retention or a cap trim) - recreate it once
+                if "no such table" not in str(e) or attempt:
+                    raise
+                self._partition_days = None
+        
+        self._logs_added(stored)
+        self._trim_apps_over_cap({row[3] for row in stored})
+    
+    def _trim_apps_over_cap(self, app_types) -> int:
+        """Enforce max_entries_per_app at write time for the apps a batch wrote to
+        
+        The check runs against the in-memory log_counts totals, so SQLite is only
+        touched when an app actually went over its cap.
+        """
+        cap = self.max_entries_per_app
+        if not cap or cap <= 0:
+            return 0
+        try:
+            app_totals = {}
+            for (app_type, level), count in self._get_log_totals().items():
+                if app_type in app_types:
+                    app_totals[app_type] = app_totals.get(app_type, 0) + count
+            over_cap = [app_type for app_type, total in app_totals.items() if total > cap]
+            return self._enforce_app_caps(over_cap) if over_cap else 0
+        except Exception as e:
+            # The batch is already committed; the hourly cleanup retries the trim
+            logger.warning(f"Could not trim logs to {cap} entries per app: {e}")
+            return 0
+    
+    def insert_log(self, timestamp: datetime, level: str, app_type: str, message: str, logger_name: str = None,
+                   instance_name: str = None, cycle_id: str = None, operation: str = None):
+        """Insert a log entry into the logs database"""
+        try:
+            self.insert_logs([(timestamp, level, app_type, message, logger_name, instance_name, cycle_id, operation)])
         except Exception as e:
             # Don't let log insertion failures crash the app
             print(f"Error inserting log: {e}")
     
-    def get_logs(self, app_type: str = None, level: str = None, limit: int = 100, offset: int = 0, search: str = None) -> List[Dict[str, Any]]:
-        """Get logs with filtering and pagination"""
+    def _log_filters(self, app_type: str = None, level: str = None, search: str = None,
+                     table: str = "logs", context: Dict[str, str] = None) -> tuple:
+        """Build (join, where_clause, params) for the logs filters on one partition
+        
+        The partition is queried as "logs" and its FTS index as "logs_fts".
+        Searches use the FTS index when available and fall back to a LIKE
+        scan otherwise (or when the text has no searchable words).
+        context maps log context columns (CONTEXT_FIELDS) to required values.
+        """
+        join = ""
+        where_conditions = []
+        params = []
+        
+        if search:
+            match_query = build_match_query(search) if self._fts_enabled else None
+            if match_query:
+                fts_table = fts_table_name(table)
+                join = f"JOIN {fts_table} AS logs_fts ON logs_fts.rowid = logs.id"
+                where_conditions.append(f"logs_fts.{fts_table} MATCH ?")
+                params.append(match_query)
+            else:
+                where_conditions.append("logs.message LIKE ?")
+                params.append(f"%{search}%")
+        
+        if app_type and app_type != "all":
+            where_conditions.append("logs.app_type = ?")
+            params.append(app_type)
+        
+        if level and level != "all":
+            where_conditions.append("logs.level = ?")
+            params.append(level)
+        
+        for field, value in (context or {}).items():
+            if field not in CONTEXT_FIELDS:
+                raise ValueError(f"Unknown log context filter: {field}")
+            where_conditions.append(f"logs.{field} = ?")
+            params.append(value)
+        
+        where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+        return join, where_clause, params
+    
+    @staticmethod
+    def encode_log_cursor(log: Dict[str, Any]) -> str:
+        """Build an opaque page cursor from a log row's (timestamp, id) key"""
+        key = json.dumps([log['timestamp'], log['id']], separators=(',', ':'))
+        return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def decode_log_cursor(cursor: str) -> tuple:
+        """Turn a page cursor back into its (timestamp, id) key; raises ValueError if malformed"""
         try:
-            with self.get_logs_connection() as conn:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            timestamp, log_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except Exception:
+            raise ValueError(f"Invalid log cursor: {cursor!r}")
+        if type(timestamp) is not int or type(log_id) is not int:
+            raise ValueError(f"Invalid log cursor: {cursor!r}")
+        return timestamp, log_id
+    
+    def _partition_count(self, conn, day: str, app_type: str = None, level: str = None) -> int:
+        """Entries in one partition matching the app/level filters, from log_counts"""
+        where_conditions = ["day = ?"]
+        params = [day]
+        if app_type and app_type != "all":
+            where_conditions.append("app_type = ?")
+            params.append(app_type)
+        if level and level != "all":
+            where_conditions.append("level = ?")
+            params.append(level)
+        cursor = conn.execute(
+            f"SELECT COALESCE(SUM(count), 0) FROM log_counts WHERE {' AND '.join(where_conditions)}", params
+        )
+        return cursor.fetchone()[0]
+    
+    def get_logs(self, app_type: str = None, level: str = None, limit: int = 100, offset: int = 0, search: str = None,
+                 sort: str = None, before: tuple = None, after: tuple = None,
+                 since_id: int = None, context: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Get logs with filtering and pagination, newest first
+        
+        before/after are (timestamp, id) keys (see decode_log_cursor): before returns the
+        logs just older than the key, after the logs just newer than it. Keyset pages cost
+        the same at any depth and don't shift as new logs arrive; offset is ignored when a
+        key is given. since_id limits the result to logs written after that log ID.
+        sort="relevance" orders full-text search results by bm25 rank instead and only
+        pages by offset. context filters on the log context columns, e.g.
+        {"instance_name": "Default", "cycle_id": "..."}.
+        """
+        try:
+            with self.get_logs_read_connection() as conn:
                 conn.row_factory = sqlite3.Row
-                
-                where_conditions = []
-                params = []
-                
-                if app_type and app_type != "all":
-                    where_conditions.append("app_type = ?")
-                    params.append(app_type)
-                
-                if level and level != "all":
-                    where_conditions.append("level = ?")
-                    params.append(level)
-                
-                if search:
-                    where_conditions.append("message LIKE ?")
-                    params.append(f"%{search}%")
-                
-                where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-                
-                query = f"""
-                    SELECT * FROM logs {where_clause}
-                    ORDER BY timestamp DESC
-                    LIMIT ? OFFSET ?
-                """
-                
-                cursor = conn.execute(query, params + [limit, offset])
-                return [dict(row) for row in cursor.fetchall()]
+                return self._read_logs(conn, app_type, level, limit, offset, search, sort, before, after, since_id,
+                                       context)
                 
         except Exception as e:
             logger.error(f"Error getting logs: {e}")
             return []
     
-    def get_log_count(self, app_type: str = None, level: str = None, search: str = None) -> int:
-        """Get total count of logs matching filters"""
+    def _read_logs(self, conn, app_type: str = None, level: str = None, limit: int = 100, offset: int = 0,
+                   search: str = None, sort: str = None, before: tuple = None, after: tuple = None,
+                   since_id: int = None, context: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Query for get_logs; errors propagate
+        
+        Partitions are read newest first (oldest first for after) and only until the page
+        is full; partitions outside the key's range are never opened.
+        """
+        days = self._get_partition_days()
+        
+        if search and sort == "relevance" and self._fts_enabled and build_match_query(search):
+            return self._get_logs_by_relevance(conn, days, app_type, level, search, limit, offset, context)
+        
+        descending = before is not None or after is None
+        key = before if before is not None else after
+        conditions = []
+        condition_params = []
+        if key is not None:
+            offset = 0
+            key_day = partition_day(key[0])
+            if descending:
+                conditions.append("(logs.timestamp, logs.id) < (?, ?)")
+                days = [day for day in days if day <= key_day]
+            else:
+                # Walk forward from the key, then flip the page back to newest first
+                conditions.append("(logs.timestamp, logs.id) > (?, ?)")
+                days = [day for day in days if day >= key_day]
+            condition_params += [key[0], key[1]]
+        if since_id is not None:
+            offset = 0
+            conditions.append("logs.id > ?")
+            condition_params.append(since_id)
+        direction = "DESC" if descending else "ASC"
+        if descending:
+            days.reverse()
+        
+        logs = []
+        for day in days:
+            if offset and not logs and not search and not context:
+                # Skip whole partitions that lie before the requested offset
+                day_count = self._partition_count(conn, day, app_type, level)
+                if day_count <= offset:
+                    offset -= day_count
+                    continue
+            
+            table = partition_table(day)
+            join, where_clause, params = self._log_filters(app_type, level, search, table, context)
+            if conditions:
+                where_clause += (" AND " if where_clause else "WHERE ") + " AND ".join(conditions)
+                params += condition_params
+            
+            query = f"""
+                SELECT logs.* FROM {table} AS logs {join} {where_clause}
+                ORDER BY logs.timestamp {direction}, logs.id {direction}
+                LIMIT ?
+            """
+            try:
+                cursor = conn.execute(query, params + [offset + limit - len(logs)])
+            except sqlite3.OperationalError as e:
+                # Partition dropped by retention since we listed it
+                if "no such table" in str(e):
+                    continue
+                raise
+            logs.extend(dict(row) for row in cursor.fetchall())
+            if len(logs) >= offset + limit:
+                break
+        
+        logs = logs[offset:offset + limit]
+        if not descending:
+            logs.reverse()
+        return logs
+    
+    def iter_logs(self, app_type: str = None, level: str = None, start: int = None, end: int = None,
+                  include_archived: bool = True, chunk_size: int = 1000,
+                  context: Dict[str, str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream logs oldest first without loading the whole result (for exports)
+        
+        Archived days come first, then logs.db in keyset chunks; a read connection is
+        only held while a chunk is fetched. start/end are epoch ms (end exclusive).
+        Errors propagate.
+        """
+        if include_archived:
+            yield from self._archive.iter_logs(app_type, level, start, end, context)
+        
+        key = (start if start is not None else 0, 0)
+        while True:
+            with self.get_logs_read_connection() as conn:
+                conn.row_factory = sqlite3.Row
+                chunk = self._read_logs(conn, app_type, level, chunk_size, after=key, context=context)
+            chunk.reverse()
+            for log in chunk:
+                if end is not None and log['timestamp'] >= end:
+                    return
+                yield log
+            if len(chunk) < chunk_size:
+                return
+            key = (chunk[-1]['timestamp'], chunk[-1]['id'])
+    
+    def _load_recent_logs(self, app_type: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Newest logs for the recent-log buffer; raises instead of returning an empty page on errors"""
+        with self.get_logs_read_connection() as conn:
+            conn.row_factory = sqlite3.Row
+            return self._read_logs(conn, app_type=app_type, limit=limit)
+    
+    def _get_logs_by_relevance(self, conn, days: List[str], app_type: str, level: str, search: str,
+                               limit: int, offset: int, context: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Search results ranked by relevance within each day, newest day first
+        
+        bm25 scores depend on each partition's own index statistics (row count,
+        average message length), so scores from different days can't be compared;
+        relevance only orders the matches of one day.
+        """
+        ranked = []
+        for day in reversed(days):
+            table = partition_table(day)
+            join, where_clause, params = self._log_filters(app_type, level, search, table, context)
+            query = f"""
+                SELECT logs.* FROM {table} AS logs {join} {where_clause}
+                ORDER BY logs_fts.rank, logs.timestamp DESC, logs.id DESC
+                LIMIT ?
+            """
+            try:
+                ranked.extend(dict(row) for row in conn.execute(query, params + [offset + limit - len(ranked)]))
+            except sqlite3.OperationalError as e:
+                if "no such table" in str(e):
+                    continue
+                raise
+            if len(ranked) >= offset + limit:
+                break
+        return ranked[offset:offset + limit]
+    
+    def get_logs_page(self, app_type: str = None, level: str = None, limit: int = 100, offset: int = 0,
+                      search: str = None, sort: str = None, before: str = None, after: str = None,
+                      since_id: int = None, context: Dict[str, str] = None) -> Dict[str, Any]:
+        """Get one page of logs plus the cursors around it
+        
+        before/after take cursors from a previous page. next_cursor (pass as before) is set
+        when older logs exist and prev_cursor (pass as after) when newer logs may exist.
+        since_id returns only logs written after that log ID (newest first).
+        The newest page and since_id requests without a search or context filter are served
+        from the recent-log buffer when it holds the answer. Raises ValueError for malformed
+        cursors or unknown context filters.
+        """
+        before_key = self.decode_log_cursor(before) if before else None
+        after_key = self.decode_log_cursor(after) if after and not before_key else None
+        
+        # One extra row tells us whether there is another page in the direction we're moving
+        logs = None
+        if not (search or context or before_key or after_key):
+            if since_id is not None:
+                logs = self._recent_logs.since(app_type, level, since_id, limit + 1)
+            elif not offset:
+                logs = self._recent_logs.newest(app_type, level, limit + 1)
+        if logs is None:
+            if context:
+                # Checked here, get_logs would only log it and return an empty page
+                self._log_filters(context=context)
+            logs = self.get_logs(app_type=app_type, level=level, limit=limit + 1, offset=offset, search=search,
+                                 sort=sort, before=before_key, after=after_key, since_id=since_id,
+                                 context=context)
+        has_more = len(logs) > limit
+        if has_more:
+            logs = logs[1:] if after_key else logs[:limit]
+        
+        # Relevance-ranked search results are not in key order, so they only page by offset
+        keyset = not (sort == "relevance" and search and self._fts_enabled)
+        if after_key:
+            has_older, has_newer = True, has_more
+        else:
+            has_older, has_newer = has_more, bool(before_key) or offset > 0
+        
+        return {
+            'logs': logs,
+            'has_more': has_more,
+            'next_cursor': self.encode_log_cursor(logs[-1]) if keyset and logs and has_older else None,
+            'prev_cursor': self.encode_log_cursor(logs[0]) if keyset and logs and has_newer else None,
+        }
+    
+    def get_log_count(self, app_type: str = None, level: str = None, search: str = None, cap: int = None,
+                      context: Dict[str, str] = None) -> int:
+        """Get total count of logs matching filters
+        
+        Counts without a search or context filter come from the trigger-maintained
+        log_counts table (mirrored in memory, see _get_log_totals).
+        Others have to count matching rows (context filters through their indexes);
+        with cap the scan stops after cap matches, so a result equal to cap means
+        "at least cap".
+        """
         try:
-            with self.get_logs_connection() as conn:
-                where_conditions = []
-                params = []
-                
-                if app_type and app_type != "all":
-                    where_conditions.append("app_type = ?")
-                    params.append(app_type)
-                
-                if level and level != "all":
-                    where_conditions.append("level = ?")
-                    params.append(level)
-                
-                if search:
-                    where_conditions.append("message LIKE ?")
-                    params.append(f"%{search}%")
-                
-                where_clause = "WHERE " + " AND ".join(where_conditions) if where_conditions else ""
-                
-                query = f"SELECT COUNT(*) FROM logs {where_clause}"
-                cursor = conn.execute(query, params)
-                return cursor.fetchone()[0]
+            if not search and not context:
+                app_type = None if app_type == "all" else app_type
+                level = None if level == "all" else level
+                return sum(
+                    count for (row_app_type, row_level), count in self._get_log_totals().items()
+                    if (not app_type or row_app_type == app_type) and (not level or row_level == level)
+                )
+            
+            with self.get_logs_read_connection() as conn:
+                total = 0
+                for day in reversed(self._get_partition_days()):
+                    table = partition_table(day)
+                    join, where_clause, params = self._log_filters(app_type, level, search, table, context)
+                    if cap:
+                        query = f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} AS logs {join} {where_clause} LIMIT ?)"
+                        params = params + [cap - total]
+                    else:
+                        query = f"SELECT COUNT(*) FROM {table} AS logs {join} {where_clause}"
+                    try:
+                        total += conn.execute(query, params).fetchone()[0]
+                    except sqlite3.OperationalError as e:
+                        if "no such table" in str(e):
+                            continue
+                        raise
+                    if cap and total >= cap:
+                        break
+                return total
                 
         except Exception as e:
             logger.error(f"Error getting log count: {e}")
             return 0
     
     def cleanup_old_logs(self, days_to_keep: int = 30, max_entries_per_app: int = 10000):
-        """Clean up old logs to prevent database bloat"""
+        """Apply the retention policy: drop days older than days_to_keep and trim apps to max_entries_per_app
+        
+        The limits are kept, so insert_logs (day rollover and per-app caps) and
+        the scheduled cleanup keep applying them.
+        """
+        self.retention_days = days_to_keep
+        self.max_entries_per_app = max_entries_per_app
         try:
-            with self.get_logs_connection() as conn:
-                # Delete logs older than specified days
-                cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-                cursor = conn.execute("DELETE FROM logs WHERE timestamp < ?", (cutoff_date,))
-                deleted_by_age = cursor.rowcount
-                
-                # Keep only the most recent entries per app
-                apps_cursor = conn.execute("SELECT DISTINCT app_type FROM logs")
-                total_deleted_by_count = 0
-                
-                for (app_type,) in apps_cursor.fetchall():
-                    # Get count for this app
-                    count_cursor = conn.execute("SELECT COUNT(*) FROM logs WHERE app_type = ?", (app_type,))
-                    count = count_cursor.fetchone()[0]
-                    
-                    if count > max_entries_per_app:
-                        # Delete oldest entries beyond the limit
-                        excess_count = count - max_entries_per_app
-                        delete_cursor = conn.execute("""
-                            DELETE FROM logs 
-                            WHERE app_type = ? 
-                            AND id IN (
-                                SELECT id FROM logs 
-                                WHERE app_type = ? 
-                                ORDER BY timestamp ASC 
-                                LIMIT ?
-                            )
-                        """, (app_type, app_type, excess_count))
-                        total_deleted_by_count += delete_cursor.rowcount
-                
-                conn.commit()
-                return deleted_by_age + total_deleted_by_count
+            cutoff = retention_cutoff_day(days_to_keep)
+            deleted_by_age = self._drop_partitions([day for day in self._get_partition_days() if day < cutoff],
+                                                   archive=True)
+            deleted_by_count = self._enforce_app_caps(self.get_app_types_from_logs())
+            return deleted_by_age + deleted_by_count
                 
         except Exception as e:
             logger.error(f"Error cleaning up logs: {e}")
@@ -2658,8 +3388,8 @@ class LogsDatabase:
     def get_app_types_from_logs(self) -> List[str]:
         """Get list of all app types that have logs"""
         try:
-            with self.get_logs_connection() as conn:
-                cursor = conn.execute("SELECT DISTINCT app_type FROM logs ORDER BY app_type")
+            with self.get_logs_read_connection() as conn:
+                cursor = conn.execute("SELECT DISTINCT app_type FROM log_counts WHERE count > 0 ORDER BY app_type")
                 return [row[0] for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Error getting app types from logs: {e}")
@@ -2668,8 +3398,8 @@ class LogsDatabase:
     def get_log_levels(self) -> List[str]:
         """Get list of all log levels that exist"""
         try:
-            with self.get_logs_connection() as conn:
-                cursor = conn.execute("SELECT DISTINCT level FROM logs ORDER BY level")
+            with self.get_logs_read_connection() as conn:
+                cursor = conn.execute("SELECT DISTINCT level FROM log_counts WHERE count > 0 ORDER BY level")
                 return [row[0] for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Error getting log levels: {e}")
@@ -2678,17 +3408,24 @@ class LogsDatabase:
     def clear_logs(self, app_type: str = None):
         """Clear logs for a specific app type or all logs"""
         try:
-            with self.get_logs_connection() as conn:
-                if app_type:
-                    cursor = conn.execute("DELETE FROM logs WHERE app_type = ?", (app_type,))
-                else:
-                    cursor = conn.execute("DELETE FROM logs")
-                
-                deleted_count = cursor.rowcount
-                conn.commit()
-                
-                logger.info(f"Cleared {deleted_count} logs" + (f" for {app_type}" if app_type else ""))
-                return deleted_count
+            if not app_type:
+                deleted_count = self._drop_partitions(self._get_partition_days())
+            else:
+                deleted_count = 0
+                with self._partition_lock:
+                    with self.get_logs_connection() as conn:
+                        for day in self._get_partition_days():
+                            cursor = conn.execute(f"DELETE FROM {partition_table(day)} WHERE app_type = ?", (app_type,))
+                            deleted_count += cursor.rowcount
+                        empty_days = [row[0] for row in conn.execute(
+                            "SELECT day FROM log_counts GROUP BY day HAVING SUM(count) = 0"
+                        )]
+                        conn.commit()
+                    self._logs_removed(app_type)
+                    self._drop_partitions(empty_days)
+            
+            logger.info(f"Cleared {deleted_count} logs" + (f" for {app_type}" if app_type else ""))
+            return deleted_count
         except Exception as e:
             logger.error(f"Error clearing logs: {e}")
             return 0
@@ -2712,6 +3449,13 @@ def get_logs_database() -> LogsDatabase:
         _logs_database_instance = LogsDatabase()
     return _logs_database_instance
 
+def close_databases():
+    """Flush pending writes and close the pooled connections of the global database instances (shutdown hook)"""
+    if _database_instance is not None:
+        _database_instance.close()
+    if _logs_database_instance is not None:
+        _logs_database_instance.close()
+
 def schedule_log_cleanup():
     """Schedule periodic log cleanup - call this from background tasks"""
     import threading
@@ -2723,7 +3467,9 @@ def schedule_log_cleanup():
             try:
                 time.sleep(3600)  # Run every hour
                 logs_db = get_logs_database()
-                deleted_count = logs_db.cleanup_old_logs(days_to_keep=30, max_entries_per_app=10000)
+                # Keep the limits last set through the logs API (the class defaults until then)
+                deleted_count = logs_db.cleanup_old_logs(days_to_keep=logs_db.retention_days,
+                                                         max_entries_per_app=logs_db.max_entries_per_app)
                 if deleted_count > 0:
                     logger.info(f"Scheduled cleanup removed {deleted_count} old log entries")
             except Exception as e:
@@ -2733,6 +3479,9 @@ def schedule_log_cleanup():
     cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
     cleanup_thread.start()
     logger.info("Scheduled log cleanup thread started")
+    
+    # Reclaim space freed by the cleanup and keep the logs WAL short
+    get_logs_database().schedule_maintenance()
 
 # Manager Database Functions (consolidated from manager_database.py)
 def get_manager_database() -> HuntarrDatabase:
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Online database backups for Huntarr
+Copies a live SQLite database with the sqlite3 backup API in small steps
+from a dedicated read-only connection, so backups never take the write lock
+or force a checkpoint. Jobs run in a background thread and report progress;
+finished backups are verified, optionally gzip-compressed and rotated.
+"""
+
+import gzip
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+
+class BackupInProgressError(Exception):
+    """Raised when a backup is requested while another one is still running"""
+
+
+class DatabaseBackupManager:
+    """
+    Runs online backups of one database file.
+
+    - ``pages_per_step`` pages are copied per backup step with ``step_sleep``
+      seconds between steps, holding a read snapshot only while a step runs.
+    - If concurrent writes restart the copy more than ``max_restarts`` times, the
+      remaining copy is done in a single step. In WAL mode that reads one
+      consistent snapshot without blocking writers.
+    - Backups are verified with ``PRAGMA quick_check`` before being kept, and
+      only the newest ``retention`` automatic backups are kept.
+    """
+
+    PAGES_PER_STEP = 256
+    STEP_SLEEP = 0.01
+    MAX_RESTARTS = 3
+    RETENTION = 5
+    JOB_HISTORY = 10
+
+    def __init__(self, db_path: Union[str, Path], prefix: str = "huntarr_backup", backup_dir: Union[str, Path] = None):
+        self.db_path = Path(db_path)
+        self.prefix = prefix
+        self.backup_dir = Path(backup_dir) if backup_dir else self.db_path.parent
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._running: Optional[str] = None
+
+    def _resolve_target(self, backup_name: Optional[str]) -> Path:
+        if not backup_name:
+            timestamp = int(time.time())
+            target = self.backup_dir / f"{self.prefix}_{timestamp}.db"
+            counter = 1
+            while target.exists() or target.with_name(target.name + ".gz").exists():
+                target = self.backup_dir / f"{self.prefix}_{timestamp}_{counter}.db"
+                counter += 1
+            return target
+        target = Path(backup_name)
+        if target.parent == Path('.'):
+            # A bare file name goes into the backup directory
+            target = self.backup_dir / target
+        return target
+
+    def _new_job(self, target: Path, compress: bool, pages_per_step: int, step_sleep: float, retention: int) -> Dict[str, Any]:
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "state": "queued",
+            "database_path": str(self.db_path),
+            "backup_path": str(target) + (".gz" if compress else ""),
+            "compress": compress,
+            "pages_per_step": pages_per_step,
+            "step_sleep": step_sleep,
+            "retention": retention,
+            "pages_total": 0,
+            "pages_remaining": 0,
+            "progress": 0.0,
+            "restarts": 0,
+            "backup_size": None,
+            "removed_backups": [],
+            "error": None,
+            "queued_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None
+        }
+        with self._lock:
+            if self._running is not None:
+                raise BackupInProgressError(f"Backup {self._running} is already running")
+            self._running = job["id"]
+            self._jobs[job["id"]] = job
+            while len(self._jobs) > self.JOB_HISTORY:
+                self._jobs.popitem(last=False)
+        return job
+
+    def start_backup(self, backup_name: str = None, compress: bool = False, pages_per_step: int = None,
+                     step_sleep: float = None, retention: int = None) -> Dict[str, Any]:
+        """Start a backup in a background thread and return its job status"""
+        job = self._new_job(
+            self._resolve_target(backup_name), compress,
+            pages_per_step or self.PAGES_PER_STEP,
+            self.STEP_SLEEP if step_sleep is None else step_sleep,
+            self.RETENTION if retention is None else retention
+        )
+        thread = threading.Thread(target=self._run_job, args=(job,), name=f"backup-{job['id']}", daemon=True)
+        thread.start()
+        return dict(job)
+
+    def run_backup(self, backup_name: str = None, compress: bool = False, pages_per_step: int = None,
+                   step_sleep: float = None, retention: int = None) -> Dict[str, Any]:
+        """Run a backup in the calling thread and return the finished job status"""
+        job = self._new_job(
+            self._resolve_target(backup_name), compress,
+            pages_per_step or self.PAGES_PER_STEP,
+            self.STEP_SLEEP if step_sleep is None else step_sleep,
+            self.RETENTION if retention is None else retention
+        )
+        self._run_job(job)
+        return dict(job)
+
+    def get_status(self, job_id: str = None) -> Optional[Dict[str, Any]]:
+        """Status of one job (latest when job_id is None)"""
+        with self._lock:
+            if job_id is None:
+                if not self._jobs:
+                    return None
+                job_id = next(reversed(self._jobs))
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(job) for job in reversed(self._jobs.values())]
+
+    def is_running(self) -> bool:
+        return self._running is not None
+
+    def _update(self, job: Dict[str, Any], **changes):
+        with self._lock:
+            job.update(changes)
+
+    def _run_job(self, job: Dict[str, Any]):
+        target = Path(job["backup_path"][:-3] if job["compress"] else job["backup_path"])
+        partial = target.with_name(target.name + ".partial")
+        self._update(job, state="running", started_at=datetime.now().isoformat())
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial.unlink(missing_ok=True)
+
+            self._copy(job, partial)
+
+            self._update(job, state="verifying")
+            self._verify(partial)
+            partial.replace(target)
+
+            final_path = target
+            if job["compress"]:
+                self._update(job, state="compressing")
+                final_path = self._compress(target)
+
+            removed = self._apply_retention(job["retention"], keep=final_path)
+            self._update(
+                job, state="completed", progress=100.0, backup_path=str(final_path),
+                backup_size=final_path.stat().st_size, removed_backups=removed,
+                finished_at=datetime.now().isoformat()
+            )
+            logger.info(f"Database backup created successfully: {final_path}")
+        except Exception as e:
+            partial.unlink(missing_ok=True)
+            self._update(job, state="failed", error=str(e), finished_at=datetime.now().isoformat())
+            logger.error(f"Failed to create database backup: {e}")
+        finally:
+            with self._lock:
+                if self._running == job["id"]:
+                    self._running = None
+
+    def _copy(self, job: Dict[str, Any], destination: Path):
+        uri = f"file:{quote(self.db_path.resolve().as_posix())}?mode=ro"
+        source = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        dest = sqlite3.connect(str(destination))
+        state = {"last_remaining": None}
+
+        def progress(status, remaining, total):
+            # remaining growing again means a concurrent write restarted the copy
+            if state["last_remaining"] is not None and remaining > state["last_remaining"]:
+                job["restarts"] += 1
+            state["last_remaining"] = remaining
+            self._update(
+                job, pages_total=total, pages_remaining=remaining,
+                progress=round((total - remaining) / total * 100, 1) if total else 0.0
+            )
+            if job["restarts"] > self.MAX_RESTARTS:
+                raise _RestartLimitReached()
+
+        try:
+            source.execute('PRAGMA busy_timeout = 30000')
+            try:
+                source.backup(dest, pages=job["pages_per_step"], progress=progress, sleep=job["step_sleep"])
+            except _RestartLimitReached:
+                logger.info(f"Backup of {self.db_path.name} restarted {job['restarts']} times by concurrent writes, finishing in one step")
+                source.backup(dest, pages=-1)
+                self._update(job, pages_remaining=0)
+        finally:
+            dest.close()
+            source.close()
+
+    @staticmethod
+    def _verify(path: Path):
+        conn = sqlite3.connect(str(path))
+        try:
+            result = conn.execute('PRAGMA quick_check').fetchone()
+        finally:
+            conn.close()
+        if not result or result[0] != 'ok':
+            raise Exception(f"Backup verification failed: {result[0] if result else 'no result'}")
+
+    @staticmethod
+    def _compress(path: Path) -> Path:
+        compressed = path.with_name(path.name + ".gz")
+        with open(path, 'rb') as src, gzip.open(compressed, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        path.unlink()
+        return compressed
+
+    def _apply_retention(self, retention: int, keep: Path) -> List[str]:
+        """Delete automatic backups beyond the newest ``retention`` files"""
+        if not retention or retention <= 0:
+            return []
+        backups = [
+            p for p in self.backup_dir.glob(f"{self.prefix}_*")
+            if p.is_file() and (p.name.endswith(".db") or p.name.endswith(".db.gz"))
+        ]
+        backups.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        removed = []
+        for old in backups[retention:]:
+            if old == keep:
+                continue
+            try:
+                old.unlink()
+                removed.append(str(old))
+            except OSError as e:
+                logger.warning(f"Could not remove old backup {old}: {e}")
+        if removed:
+            logger.info(f"Backup rotation removed {len(removed)} old backup(s)")
+        return removed
+
+
+class _RestartLimitReached(Exception):
+    pass
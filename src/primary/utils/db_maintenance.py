@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Adaptive database maintenance for Huntarr
+Samples freelist, page count, WAL size and checkpoint lag every minute and
+picks the maintenance that is actually needed (incremental vacuum,
+truncating checkpoint, ANALYZE, quick_check), preferring low-activity
+windows and bounding each step by a time budget so there are no long pauses.
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveMaintenance:
+    """Metric-driven maintenance loop for one SQLite database file"""
+
+    TICK_INTERVAL = 60                      # Seconds between metric samples
+    STEP_BUDGET = 0.5                       # Seconds a blocking maintenance step may take
+    LOW_ACTIVITY_PER_MINUTE = 60            # Connection checkouts/minute considered "quiet"
+    MAX_DEFERRAL = 6 * 60 * 60              # Run needed work even under load after this long
+
+    WAL_TRUNCATE_BYTES = 64 * 1024 * 1024   # Truncate the WAL once it grows past this
+    CHECKPOINT_LAG_FRAMES = 4000            # ...or when this many frames are not checkpointed
+    FREELIST_MIN_PAGES = 256                # Ignore small amounts of free space
+    FREELIST_RATIO = 0.05                   # Reclaim when free pages exceed 5% of the file
+    VACUUM_PAGES_PER_STEP = 256
+    ANALYZE_INTERVAL = 24 * 60 * 60
+    ANALYZE_GROWTH = 0.25                   # Re-analyze when the file grew 25% since last ANALYZE
+    ANALYZE_LIMIT = 1000                    # PRAGMA analysis_limit for bounded ANALYZE
+    QUICK_CHECK_INTERVAL = 6 * 60 * 60
+    QUICK_CHECK_BUDGET = 5.0                # quick_check is read-only but holds a snapshot
+    AUTO_VACUUM_CONVERT_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, name: str, db_path: Union[str, Path], connect: Callable,
+                 activity_probe: Callable[[], int] = None, busy_timeout_ms: int = 30000,
+                 periodic_tasks: List[Tuple[str, float, Callable[[], Any]]] = None,
+                 on_integrity_failure: Callable[[], Any] = None):
+        self.name = name
+        self.db_path = Path(db_path)
+        self._connect = connect
+        self._activity_probe = activity_probe
+        self._busy_timeout_ms = busy_timeout_ms
+        self._periodic_tasks = periodic_tasks or []
+        self._on_integrity_failure = on_integrity_failure
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._run_lock = threading.Lock()
+
+        self._last_activity: Optional[Tuple[float, int]] = None
+        self._needed_since: Dict[str, float] = {}
+        self._last_run: Dict[str, float] = {}
+        self._analyzed_page_count = 0
+        self._metrics: Dict[str, Any] = {}
+        self._actions = deque(maxlen=25)
+        self._deferrals = 0
+
+    # --- Loop control --- #
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"{self.name}-maintenance", daemon=True)
+        self._thread.start()
+        logger.info(f"Adaptive maintenance started for {self.name}")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        # Spread the first sample away from startup work
+        while not self._stop.wait(self.TICK_INTERVAL):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"{self.name} maintenance step failed: {e}")
+
+    # --- Metrics --- #
+
+    def _activity_rate(self) -> Optional[float]:
+        """Connection checkouts per minute since the previous sample"""
+        if self._activity_probe is None:
+            return None
+        now, count = time.monotonic(), self._activity_probe()
+        previous, self._last_activity = self._last_activity, (now, count)
+        if previous is None or now <= previous[0]:
+            return None
+        return (count - previous[1]) * 60.0 / (now - previous[0])
+
+    def sample(self, conn) -> Dict[str, Any]:
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        auto_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+
+        checkpoint_lag = 0
+        if journal_mode == 'wal':
+            # A passive checkpoint never blocks and reports how far behind the WAL is
+            busy, log_frames, checkpointed = conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+            if log_frames >= 0 and checkpointed >= 0:
+                checkpoint_lag = log_frames - checkpointed
+
+        wal_path = Path(str(self.db_path) + '-wal')
+        try:
+            wal_bytes = wal_path.stat().st_size
+        except OSError:
+            wal_bytes = 0
+
+        return {
+            'page_count': page_count,
+            'page_size': page_size,
+            'freelist_count': freelist_count,
+            'freelist_ratio': round(freelist_count / page_count, 4) if page_count else 0.0,
+            'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}.get(auto_vacuum, str(auto_vacuum)),
+            'journal_mode': journal_mode,
+            'wal_bytes': wal_bytes,
+            'checkpoint_lag_frames': checkpoint_lag,
+            'database_bytes': page_count * page_size
+        }
+
+    # --- Scheduling helpers --- #
+
+    def _should_run(self, task: str, needed: bool, low_activity: bool, force: bool) -> bool:
+        """Run needed work in quiet windows, or anyway once it has waited MAX_DEFERRAL"""
+        now = time.time()
+        if not needed:
+            self._needed_since.pop(task, None)
+            return False
+        since = self._needed_since.setdefault(task, now)
+        if force or low_activity or now - since >= self.MAX_DEFERRAL:
+            return True
+        self._deferrals += 1
+        return False
+
+    def _due(self, task: str, interval: float) -> bool:
+        return time.time() - self._last_run.get(task, 0) >= interval
+
+    def _record(self, task: str, **details):
+        self._last_run[task] = time.time()
+        self._needed_since.pop(task, None)
+        entry = {'task': task, 'timestamp': datetime.now().isoformat()}
+        entry.update(details)
+        self._actions.append(entry)
+        logger.debug(f"{self.name} maintenance: {entry}")
+        return entry
+
+    def _budget_handler(self, budget: float):
+        deadline = time.monotonic() + budget
+        return lambda: 1 if time.monotonic() > deadline else 0
+
+    # --- Tasks --- #
+
+    def _checkpoint_truncate(self, conn) -> Dict[str, Any]:
+        start = time.monotonic()
+        # Only wait for readers as long as the step budget allows
+        conn.execute(f'PRAGMA busy_timeout = {int(self.STEP_BUDGET * 1000)}')
+        try:
+            busy, log_frames, checkpointed = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+        finally:
+            conn.execute(f'PRAGMA busy_timeout = {self._busy_timeout_ms}')
+        return self._record('checkpoint_truncate', completed=not busy,
+                            duration_ms=round((time.monotonic() - start) * 1000, 1))
+
+    def _incremental_vacuum(self, conn, freelist_count: int) -> Dict[str, Any]:
+        start = time.monotonic()
+        freed = 0
+        while freed < freelist_count and time.monotonic() - start < self.STEP_BUDGET:
+            pages = min(self.VACUUM_PAGES_PER_STEP, freelist_count - freed)
+            # Each call is its own short write transaction; fetchall() runs it to completion
+            conn.execute(f'PRAGMA incremental_vacuum({pages})').fetchall()
+            freed += pages
+        return self._record('incremental_vacuum', pages=freed,
+                            duration_ms=round((time.monotonic() - start) * 1000, 1))
+
+    def _convert_to_incremental(self, conn, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """One-time VACUUM so incremental_vacuum can be used (small databases only)"""
+        if metrics['database_bytes'] > self.AUTO_VACUUM_CONVERT_MAX_BYTES:
+            return self._record('auto_vacuum_conversion', skipped='database too large for an online VACUUM')
+        start = time.monotonic()
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        return self._record('auto_vacuum_conversion', completed=True,
+                            duration_ms=round((time.monotonic() - start) * 1000, 1))
+
+    def _analyze(self, conn, page_count: int) -> Dict[str, Any]:
+        start = time.monotonic()
+        conn.execute(f'PRAGMA analysis_limit = {self.ANALYZE_LIMIT}')
+        conn.set_progress_handler(self._budget_handler(self.STEP_BUDGET * 4), 10000)
+        try:
+            conn.execute('ANALYZE')
+            completed = True
+        except sqlite3.OperationalError as e:
+            if 'interrupted' not in str(e):
+                raise
+            completed = False
+        finally:
+            conn.set_progress_handler(None, 0)
+            conn.execute('PRAGMA analysis_limit = 0')
+        if completed:
+            self._analyzed_page_count = page_count
+        return self._record('analyze', completed=completed,
+                            duration_ms=round((time.monotonic() - start) * 1000, 1))
+
+    def _quick_check(self, conn) -> Dict[str, Any]:
+        start = time.monotonic()
+        conn.set_progress_handler(self._budget_handler(self.QUICK_CHECK_BUDGET), 10000)
+        try:
+            rows = conn.execute('PRAGMA quick_check').fetchall()
+            result = 'ok' if len(rows) == 1 and rows[0][0] == 'ok' else [r[0] for r in rows[:10]]
+        except sqlite3.OperationalError as e:
+            if 'interrupted' not in str(e):
+                raise
+            result = 'incomplete (time budget exceeded)'
+        finally:
+            conn.set_progress_handler(None, 0)
+        entry = self._record('quick_check', result=result,
+                             duration_ms=round((time.monotonic() - start) * 1000, 1))
+        if isinstance(result, list):
+            logger.error(f"{self.name} quick_check reported problems: {result}")
+            if self._on_integrity_failure is not None:
+                # Full integrity check / repair only when the cheap check finds something
+                self._on_integrity_failure()
+        return entry
+
+    # --- Main step --- #
+
+    def run_once(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Sample metrics and run whatever maintenance is needed now"""
+        if not self.db_path.exists():
+            return []
+        with self._run_lock:
+            actions = []
+            rate = self._activity_rate()
+            low_activity = rate is None or rate <= self.LOW_ACTIVITY_PER_MINUTE
+
+            with self._connect() as conn:
+                metrics = self.sample(conn)
+                metrics['activity_per_minute'] = round(rate, 1) if rate is not None else None
+                metrics['low_activity'] = low_activity
+                metrics['sampled_at'] = datetime.now().isoformat()
+                self._metrics = metrics
+
+                # 1. Keep the WAL short
+                wal_needed = (metrics['wal_bytes'] > self.WAL_TRUNCATE_BYTES or
+                              metrics['checkpoint_lag_frames'] > self.CHECKPOINT_LAG_FRAMES)
+                if metrics['journal_mode'] == 'wal' and self._should_run('checkpoint_truncate', wal_needed or force, low_activity, force):
+                    actions.append(self._checkpoint_truncate(conn))
+
+                # 2. Give free pages back to the filesystem
+                freelist_needed = (metrics['freelist_count'] >= self.FREELIST_MIN_PAGES and
+                                   metrics['freelist_ratio'] >= self.FREELIST_RATIO)
+                if self._should_run('reclaim_free_pages', freelist_needed, low_activity, force):
+                    if metrics['auto_vacuum'] == 'incremental':
+                        actions.append(self._incremental_vacuum(conn, metrics['freelist_count']))
+                    elif metrics['auto_vacuum'] == 'none' and low_activity and 'auto_vacuum_conversion' not in self._last_run:
+                        actions.append(self._convert_to_incremental(conn, metrics))
+
+                # 3. Refresh planner statistics when the data changed shape
+                grown = (self._analyzed_page_count and
+                         metrics['page_count'] > self._analyzed_page_count * (1 + self.ANALYZE_GROWTH))
+                analyze_needed = grown or self._due('analyze', self.ANALYZE_INTERVAL)
+                if self._should_run('analyze', analyze_needed, low_activity, force):
+                    actions.append(self._analyze(conn, metrics['page_count']))
+
+                # 4. Cheap structural check
+                if self._should_run('quick_check', self._due('quick_check', self.QUICK_CHECK_INTERVAL), low_activity, force):
+                    actions.append(self._quick_check(conn))
+
+            # 5. Database-specific housekeeping
+            for task_name, interval, func in self._periodic_tasks:
+                if self._should_run(task_name, self._due(task_name, interval), low_activity, force):
+                    try:
+                        func()
+                        actions.append(self._record(task_name, completed=True))
+                    except Exception as e:
+                        actions.append(self._record(task_name, completed=False, error=str(e)))
+
+            return actions
+
+    def get_status(self) -> Dict[str, Any]:
+        """Latest metrics, recent actions and pending work"""
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'metrics': dict(self._metrics),
+            'recent_actions': list(reversed(self._actions)),
+            'pending': {task: datetime.fromtimestamp(since).isoformat() for task, since in self._needed_since.items()},
+            'last_run': {task: datetime.fromtimestamp(ts).isoformat() for task, ts in self._last_run.items()},
+            'deferrals': self._deferrals
+        }
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Group-commit writer for Huntarr
+A single background thread takes write operations from a queue and applies
+them in batches, one transaction per batch, so concurrent writers share a
+commit instead of each contending for the WAL write lock.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A write operation receives the writer's connection and returns an optional result
+WriteOperation = Callable[[sqlite3.Connection], Any]
+
+
+class GroupCommitWriter:
+    """
+    Single-writer queue with group commit.
+
+    Each submitted operation runs inside its own SAVEPOINT so a failing
+    operation only rolls back itself; the batch is committed once and the
+    futures are resolved after the commit succeeds. Operations must not call
+    commit() themselves.
+    """
+
+    def __init__(self, connect: Callable[[], Any], name: str = "database",
+                 batch_window: float = 0.005, max_batch: int = 256):
+        self._connect = connect
+        self.name = name
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        self._queue: "queue.Queue[Tuple[WriteOperation, Future]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = False
+
+        # Counters exposed through stats()
+        self._batches = 0
+        self._operations = 0
+        self._failed_operations = 0
+        self._failed_batches = 0
+        self._largest_batch = 0
+
+    @property
+    def is_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _start_locked(self):
+        """Start the writer thread if it is not running (caller holds _lock)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"{self.name}-writer",
+                daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, operation: WriteOperation) -> Future:
+        """Queue a write operation; the returned future resolves after its batch commits"""
+        future = Future()
+        if not self.is_writer_thread:
+            # The stopping check and the put share the lock stop() takes before it
+            # queues the sentinel, so nothing can land behind the sentinel
+            with self._lock:
+                if not self._stopping:
+                    self._start_locked()
+                    self._queue.put((operation, future))
+                    return future
+        # Re-entrant call or writer shut down: apply the write inline
+        self._run_inline(operation, future)
+        return future
+
+    def execute(self, operation: WriteOperation, timeout: float = None) -> Any:
+        """Queue a write operation and wait for its committed result"""
+        return self.submit(operation).result(timeout=timeout)
+
+    def _run_inline(self, operation: WriteOperation, future: Future):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            with self._connect() as conn:
+                future.set_result(operation(conn))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _collect_batch(self, first: Tuple[WriteOperation, Future]) -> List[Tuple[WriteOperation, Future]]:
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Stop sentinel - put it back so the run loop sees it after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                if self._queue.empty():
+                    break
+                continue
+            batch = self._collect_batch(item)
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: List[Tuple[WriteOperation, Future]]):
+        results = []
+        conn = None
+        try:
+            conn = self._connect()
+            conn.isolation_level = None  # Manual transaction control for the batch
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT group_commit_op")
+                try:
+                    result = operation(conn)
+                    conn.execute("RELEASE group_commit_op")
+                    results.append((future, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO group_commit_op")
+                    conn.execute("RELEASE group_commit_op")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes to {self.name} failed: {e}")
+            self._failed_batches += 1
+            if conn is not None:
+                try:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                except Exception:
+                    pass
+            for operation, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            if conn is not None:
+                try:
+                    conn.isolation_level = ""
+                except Exception:
+                    pass
+                conn.close()
+
+        self._batches += 1
+        self._operations += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+        for future, result, error in results:
+            if error is not None:
+                self._failed_operations += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush queued writes and stop the writer thread"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+            if thread is not None and thread.is_alive():
+                self._queue.put(None)
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                logger.warning(f"{self.name} writer did not flush within {timeout}s")
+                return
+        # Apply anything the thread left behind so no caller waits on a dead writer
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._run_inline(*item)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return writer counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "batches": self._batches,
+            "operations": self._operations,
+            "failed_operations": self._failed_operations,
+            "failed_batches": self._failed_batches,
+            "largest_batch": self._largest_batch,
+            "average_batch": round(self._operations / self._batches, 2) if self._batches else 0,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
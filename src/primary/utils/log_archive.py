@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Compressed log archive for Huntarr
+Day partitions that leave logs.db through retention are rolled into
+append-only gzip segments (one NDJSON segment per UTC day, each archive run
+appended as a new gzip member) next to logs.db. A small JSON index records
+every segment's time range, row count and per-app counts, so exports only
+open the segments they need.
+"""
+
+import gzip
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+import pytz
+
+from src.primary.utils.log_context import CONTEXT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Segments written before the log context columns existed simply lack those keys
+ARCHIVE_COLUMNS = ("id", "timestamp", "level", "app_type", "message", "logger_name") + CONTEXT_FIELDS
+SEGMENT_SUFFIX = ".ndjson.gz"
+INDEX_FILE = "index.json"
+
+
+def segment_name(day: str) -> str:
+    """File name of the segment for a YYYYMMDD day"""
+    return f"logs-{day}{SEGMENT_SUFFIX}"
+
+
+class LogArchive:
+    """
+    Append-only gzip segments of archived log rows plus their index.
+
+    - ``append(day, rows)`` writes rows (tuples in ARCHIVE_COLUMNS order)
+      as one new gzip member of the day's segment and updates the index.
+    - ``iter_logs()`` streams archived rows, oldest day first, as log dicts.
+    - Segments older than ``retention_days`` are deleted when archiving.
+    """
+
+    RETENTION_DAYS = 90
+
+    def __init__(self, directory: Path, retention_days: int = None):
+        self.directory = Path(directory)
+        self.retention_days = retention_days or self.RETENTION_DAYS
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _index_path(self) -> Path:
+        return self.directory / INDEX_FILE
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Segments by day (lock held); a missing or unreadable index is rebuilt from the segments"""
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = json.load(f)["segments"]
+            except FileNotFoundError:
+                self._index = {}
+            except Exception as e:
+                logger.warning(f"Log archive index unreadable, rebuilding it: {e}")
+                self._index = self._rebuild_index()
+        return self._index
+
+    def _rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        index = {}
+        for path in sorted(self.directory.glob(f"logs-*{SEGMENT_SUFFIX}")):
+            day = path.name[len("logs-"):-len(SEGMENT_SUFFIX)]
+            entry = {"rows": 0, "start": None, "end": None, "apps": {}}
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        self._count(entry, json.loads(line))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable log archive segment {path.name}: {e}")
+                continue
+            index[day] = entry
+        return index
+
+    @staticmethod
+    def _count(entry: Dict[str, Any], log: Dict[str, Any]):
+        entry["rows"] += 1
+        timestamp = log["timestamp"]
+        entry["start"] = timestamp if entry["start"] is None else min(entry["start"], timestamp)
+        entry["end"] = timestamp if entry["end"] is None else max(entry["end"], timestamp)
+        entry["apps"][log["app_type"]] = entry["apps"].get(log["app_type"], 0) + 1
+
+    def _save_index(self):
+        """Write the index atomically (lock held)"""
+        tmp_path = self._index_path().with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": self._index}, f, separators=(",", ":"))
+        os.replace(tmp_path, self._index_path())
+
+    def append(self, day: str, rows: Iterable[tuple]) -> int:
+        """Append rows of one day to its segment; returns the number of rows archived"""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            index = self._load_index()
+            entry = index.get(day) or {"rows": 0, "start": None, "end": None, "apps": {}}
+            archived = 0
+            # "ab" starts a new gzip member; readers see the concatenation as one stream
+            with gzip.open(self.directory / segment_name(day), "ab", compresslevel=6) as f:
+                for row in rows:
+                    log = dict(zip(ARCHIVE_COLUMNS, row))
+                    f.write(json.dumps(log, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n")
+                    self._count(entry, log)
+                    archived += 1
+            if archived:
+                index[day] = entry
+            self._prune(index)
+            self._save_index()
+            return archived
+
+    def _prune(self, index: Dict[str, Dict[str, Any]]):
+        """Delete segments older than retention_days (lock held)"""
+        cutoff = (datetime.now(tz=pytz.UTC) - timedelta(days=self.retention_days)).strftime('%Y%m%d')
+        for day in [day for day in index if day < cutoff]:
+            try:
+                (self.directory / segment_name(day)).unlink()
+            except FileNotFoundError:
+                pass
+            del index[day]
+
+    def iter_logs(self, app_type: str = None, level: str = None, start: int = None,
+                  end: int = None, context: Dict[str, str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream archived logs (oldest day first) matching the filters; start/end are epoch ms, end exclusive
+
+        context maps log context fields (instance_name, cycle_id, operation) to required values.
+        """
+        app_type = None if app_type in (None, "", "all") else app_type
+        level = None if level in (None, "", "all") else level
+        context = list((context or {}).items())
+        with self._lock:
+            segments = sorted(self._load_index().items())
+        for day, entry in segments:
+            if app_type and not entry["apps"].get(app_type):
+                continue
+            if (start is not None and entry["end"] is not None and entry["end"] < start) or \
+                    (end is not None and entry["start"] is not None and entry["start"] >= end):
+                continue
+            try:
+                with gzip.open(self.directory / segment_name(day), "rt", encoding="utf-8") as f:
+                    for line in f:
+                        log = json.loads(line)
+                        if app_type and log["app_type"] != app_type:
+                            continue
+                        if level and log["level"] != level:
+                            continue
+                        if context and any(log.get(field) != value for field, value in context):
+                            continue
+                        if (start is not None and log["timestamp"] < start) or \
+                                (end is not None and log["timestamp"] >= end):
+                            continue
+                        yield log
+            except FileNotFoundError:
+                continue
+            except (EOFError, OSError, ValueError) as e:
+                # A segment cut short by a crash mid-append: keep what could be read
+                logger.warning(f"Log archive segment {segment_name(day)} is damaged: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return segment count, archived rows and size on disk"""
+        with self._lock:
+            index = self._load_index()
+            size = 0
+            for day in index:
+                try:
+                    size += (self.directory / segment_name(day)).stat().st_size
+                except OSError:
+                    pass
+            return {
+                "segments": len(index),
+                "rows": sum(entry["rows"] for entry in index.values()),
+                "size_bytes": size,
+                "oldest_day": min(index) if index else None,
+                "retention_days": self.retention_days,
+            }
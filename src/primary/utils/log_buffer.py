@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Recent log buffer for Huntarr
+Keeps the newest log rows per app type (plus one buffer across all apps) in
+memory so the logs page and dashboard polls for the newest entries, or for
+everything after a known log ID, are answered without querying logs.db.
+
+A buffer is loaded from the database the first time it is read and then
+follows the batched log writer, which appends rows once they are committed.
+Rows are kept in the (timestamp, id) order logs.db pages by.
+Whenever rows are removed from logs.db the affected buffers are dropped and
+reloaded on their next read. Callers fall back to the database whenever a
+buffer cannot answer a request completely.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ALL_APPS = "all"
+
+
+def _sort_key(row: Dict[str, Any]) -> Tuple[int, int]:
+    """The (timestamp, id) key logs.db pages by; IDs alone are not in timestamp order
+    (a repeat summary row gets a new ID but the timestamp of the row it summarizes)"""
+    return row['timestamp'], row['id']
+
+
+class _AppBuffer:
+    """One app's newest rows, oldest first by (timestamp, id) (guarded by the buffer lock)"""
+
+    __slots__ = ("rows", "keys", "complete", "floor_id", "last_id")
+
+    def __init__(self, rows: List[Dict[str, Any]], capacity: int):
+        self.rows = sorted(rows, key=_sort_key)
+        self.keys = [_sort_key(row) for row in self.rows]
+        # Every row with an ID above floor_id is in the buffer
+        self.complete = len(rows) < capacity
+        self.last_id = max((row['id'] for row in rows), default=0)
+        self.floor_id = 0 if self.complete else self.last_id
+
+
+class RecentLogBuffer:
+    """
+    Bounded per-app buffers of the newest log rows.
+
+    - Rows are log dicts as returned by LogsDatabase.get_logs, held in the
+      same (timestamp, id) order the database pages by, so answers and
+      cursors match the database path. Each buffer is the newest contiguous
+      run of its app's rows in that order.
+    - A buffer is "complete" while it holds every row of its app (it was
+      loaded with fewer rows than its capacity and nothing has been evicted
+      since), so it can also answer filters that match few rows.
+    - "Since ID" requests are only answered when every row with a higher ID
+      is known to be buffered (IDs above the buffer's floor).
+    - Buffers are loaded from the database outside the lock; rows committed
+      while a load runs are merged in when it finishes.
+    """
+
+    CAPACITY = 500
+
+    def __init__(self, load_newest: Callable[[Optional[str], int], List[Dict[str, Any]]], capacity: int = None):
+        self._load_newest = load_newest
+        self.capacity = capacity or self.CAPACITY
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, _AppBuffer] = {}
+        # Rows appended while a buffer is being loaded, per key
+        self._loading: Dict[str, List[Dict[str, Any]]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(app_type: Optional[str]) -> str:
+        return app_type if app_type and app_type != ALL_APPS else ALL_APPS
+
+    def _get_buffer(self, key: str) -> Optional[_AppBuffer]:
+        """Return the buffer for key, loading it from the database first if needed (lock not held)"""
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                return buffer
+            pending = self._loading.setdefault(key, [])
+        try:
+            rows = self._load_newest(None if key == ALL_APPS else key, self.capacity)
+        except Exception:
+            with self._lock:
+                if self._loading.get(key) is pending:
+                    del self._loading[key]
+            return None
+        with self._lock:
+            if self._loading.get(key) is not pending:
+                # Invalidated (or loaded by another reader) while we were reading
+                return self._buffers.get(key)
+            del self._loading[key]
+            buffer = _AppBuffer(rows, self.capacity)
+            loaded_ids = {row['id'] for row in rows}
+            for row in pending:
+                if row['id'] not in loaded_ids:
+                    self._insert(buffer, row)
+            self._buffers[key] = buffer
+            return buffer
+
+    def _insert(self, buffer: _AppBuffer, row: Dict[str, Any]):
+        """Place a row by its key, evicting the oldest row when full (lock held)"""
+        key = _sort_key(row)
+        buffer.last_id = max(buffer.last_id, row['id'])
+        full = len(buffer.rows) >= self.capacity
+        if full and buffer.keys and key < buffer.keys[0]:
+            # Older than everything buffered: not part of the newest run
+            buffer.complete = False
+            buffer.floor_id = max(buffer.floor_id, row['id'])
+            return
+        index = bisect_left(buffer.keys, key)
+        buffer.keys.insert(index, key)
+        buffer.rows.insert(index, row)
+        if full:
+            buffer.keys.pop(0)
+            evicted = buffer.rows.pop(0)
+            buffer.complete = False
+            buffer.floor_id = max(buffer.floor_id, evicted['id'])
+
+    def append(self, rows: List[Dict[str, Any]]):
+        """Add newly committed rows (in ID order) to every loaded or loading buffer they belong to"""
+        if not rows:
+            return
+        with self._lock:
+            for key, pending in self._loading.items():
+                pending.extend(row for row in rows if key == ALL_APPS or row['app_type'] == key)
+            for key, buffer in list(self._buffers.items()):
+                for row in rows:
+                    if key != ALL_APPS and row['app_type'] != key:
+                        continue
+                    if row['id'] <= buffer.last_id:
+                        # Rows committed out of order (a synchronous insert racing the writer) - reload later
+                        del self._buffers[key]
+                        break
+                    self._insert(buffer, row)
+
+    def invalidate(self, app_type: str = None):
+        """Drop buffers after rows were deleted (one app's and the all-apps buffer, or every buffer)"""
+        with self._lock:
+            if app_type is None:
+                self._buffers.clear()
+                self._loading.clear()
+            else:
+                for key in (self._key(app_type), ALL_APPS):
+                    self._buffers.pop(key, None)
+                    self._loading.pop(key, None)
+
+    def newest(self, app_type: str = None, level: str = None, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """Newest rows for an app (and level), newest first; None if the buffer can't tell"""
+        key = self._key(app_type)
+        level = None if level in (None, "", "all") else level
+        buffer = self._get_buffer(key)
+        with self._lock:
+            if buffer is None or self._buffers.get(key) is not buffer:
+                self._misses += 1
+                return None
+            rows = []
+            for row in reversed(buffer.rows):
+                if level and row['level'] != level:
+                    continue
+                rows.append(dict(row))
+                if len(rows) >= limit:
+                    break
+            if len(rows) < limit and not buffer.complete:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return rows
+
+    def since(self, app_type: str = None, level: str = None, after_id: int = 0,
+              limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """Newest rows with an ID above after_id, newest first; None if some may be missing"""
+        key = self._key(app_type)
+        level = None if level in (None, "", "all") else level
+        buffer = self._get_buffer(key)
+        with self._lock:
+            # Rows between after_id and the floor may have been evicted (or never loaded)
+            if buffer is None or self._buffers.get(key) is not buffer or after_id < buffer.floor_id:
+                self._misses += 1
+                return None
+            rows = []
+            for row in reversed(buffer.rows):
+                if row['id'] <= after_id:
+                    continue
+                if level and row['level'] != level:
+                    continue
+                rows.append(dict(row))
+                if len(rows) >= limit:
+                    break
+            self._hits += 1
+            return rows
+
+    def stats(self) -> Dict[str, Any]:
+        """Return buffer sizes and hit/miss counters"""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "buffers": {key: len(buffer.rows) for key, buffer in self._buffers.items()},
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Repeated log message coalescing for Huntarr
+Most of logs.db is the same few lines over and over (per-ID processed checks,
+"Still sleeping" countdowns, per-instance connection debug). Before rows are
+queued for the database they pass through a LogCoalescer, which groups them
+by message template: logger, level, log context and the %-format string of
+the call. Messages formatted by the caller (f-strings) have no format
+string, so their template is the message with numbers masked.
+
+Within each window the first few occurrences of a template are written as
+they are. The rest are counted, and one summary row carrying the repeat
+count is written when the window closes (sweep() runs on a timer, so a
+burst followed by silence is still summarized). The summary keeps the text
+of the first and last suppressed message. Warnings and errors are
+never coalesced: rows that differ only by an ID or status code are still
+different problems. Per-template emit rates are kept for the database
+status page.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Rows are (timestamp, level, app_type, message, logger_name, instance_name, cycle_id, operation),
+# as queued for BatchedLogWriter
+LogRow = tuple
+
+WINDOW_SECONDS = 10.0    # Repeats of a template are summarized once per window
+BURST = 3                # Occurrences per window written verbatim before coalescing starts
+MAX_TEMPLATES = 2000     # Templates tracked; beyond this new templates are written uncoalesced
+IDLE_SECONDS = 300.0     # Templates not seen for this long are forgotten
+SWEEP_INTERVAL = 1.0     # Closed windows of quiet templates are summarized at most this often
+PASS_THROUGH_LEVELS = frozenset(("WARNING", "ERROR", "CRITICAL"))  # Always written as they are
+
+_NUMBER_RE = re.compile(r'\d+')
+
+
+def message_template(message: str) -> str:
+    """Reduce a log message to its template (every run of digits becomes #)"""
+    return _NUMBER_RE.sub('#', message)
+
+
+class _TemplateState:
+    __slots__ = ("window_start", "window_count", "last_window_count", "last_seen", "last_written",
+                 "suppressed", "first_suppressed", "suppressed_row", "identical", "total", "suppressed_total")
+
+    def __init__(self, now: float):
+        self.window_start = now
+        self.window_count = 0
+        self.last_window_count = 0
+        self.last_seen = now
+        self.last_written = None
+        self.suppressed = 0
+        self.first_suppressed = None
+        self.suppressed_row = None
+        self.identical = True
+        self.total = 0
+        self.suppressed_total = 0
+
+
+class LogCoalescer:
+    """
+    Collapses bursts of same-template log rows into a summary row.
+
+    - ``add()`` returns the rows to write now: the row itself while the
+      template is within its burst allowance, plus summaries of any windows
+      that have closed since the last call.
+    - ``sweep()`` returns summaries of windows that have closed (call
+      periodically so quiet templates are summarized without a new row).
+    - ``flush()`` returns summaries for every window with suppressed rows
+      (call before the log writer is flushed or stopped).
+    - Rows at a level in PASS_THROUGH_LEVELS are returned untouched.
+    """
+
+    def __init__(self, window: float = None, burst: int = None, max_templates: int = None):
+        self.window = window or WINDOW_SECONDS
+        self.burst = BURST if burst is None else burst
+        self.max_templates = max_templates or MAX_TEMPLATES
+        self._lock = threading.Lock()
+        self._templates: Dict[tuple, _TemplateState] = {}
+        self._last_sweep = time.monotonic()
+        self._coalesced = 0
+        self._summaries = 0
+        self._untracked = 0
+
+    def add(self, row: LogRow, template: Optional[str] = None, now: float = None) -> List[LogRow]:
+        """Offer a row; template is its %-format string, or None if the caller formatted the message"""
+        now = time.monotonic() if now is None else now
+        _, level, app_type, message, logger_name = row[:5]
+        if level in PASS_THROUGH_LEVELS:
+            return [row]
+        if template is None:
+            template = message_template(message)
+        key = (logger_name, level, app_type, template, tuple(row[5:]))
+        out = []
+        with self._lock:
+            state = self._templates.get(key)
+            if state is None:
+                if len(self._templates) >= self.max_templates:
+                    self._untracked += 1
+                    return [row]
+                state = self._templates[key] = _TemplateState(now)
+            elif now - state.window_start >= self.window:
+                self._close_window(state, out)
+                state.window_start = now
+            state.window_count += 1
+            state.total += 1
+            state.last_seen = now
+            if state.window_count <= self.burst:
+                state.last_written = message
+                out.append(row)
+            else:
+                if not state.suppressed:
+                    state.first_suppressed = message
+                state.suppressed += 1
+                state.suppressed_total += 1
+                state.suppressed_row = row
+                state.identical = state.identical and message == state.last_written
+                self._coalesced += 1
+            if now - self._last_sweep >= SWEEP_INTERVAL:
+                self._sweep(now, out)
+        return out
+
+    def sweep(self, now: float = None) -> List[LogRow]:
+        """Summaries for windows that have closed since the last sweep"""
+        now = time.monotonic() if now is None else now
+        out = []
+        with self._lock:
+            self._sweep(now, out)
+        return out
+
+    def flush(self) -> List[LogRow]:
+        """Summaries for every window with suppressed rows, open or not"""
+        out = []
+        with self._lock:
+            for state in self._templates.values():
+                self._close_window(state, out)
+                state.window_start = time.monotonic()
+        return out
+
+    def _close_window(self, state: _TemplateState, out: List[LogRow]):
+        """End a template's window, adding its summary row if anything was suppressed (lock held)"""
+        state.last_window_count = state.window_count
+        state.window_count = 0
+        if state.suppressed:
+            row = state.suppressed_row
+            message = row[3]
+            if state.identical:
+                out.append(row[:3] + (f"{message} (repeated {state.suppressed} more times)",) + row[4:])
+            elif state.suppressed == 1:
+                # A lone different message is written as it is
+                out.append(row)
+            else:
+                summary = f"{message} ({state.suppressed} similar messages, first: {state.first_suppressed})"
+                out.append(row[:3] + (summary,) + row[4:])
+            self._summaries += 1
+        state.suppressed = 0
+        state.first_suppressed = None
+        state.suppressed_row = None
+        state.identical = True
+
+    def _sweep(self, now: float, out: List[LogRow]):
+        """Summarize closed windows of templates that went quiet and forget idle ones (lock held)"""
+        self._last_sweep = now
+        for key, state in list(self._templates.items()):
+            if now - state.window_start >= self.window and (state.window_count or state.suppressed):
+                self._close_window(state, out)
+                state.window_start = now
+            elif now - state.last_seen >= IDLE_SECONDS:
+                del self._templates[key]
+
+    def stats(self, top: int = 25) -> Dict[str, Any]:
+        """Coalescing counters and the templates with the highest emit rates"""
+        with self._lock:
+            templates = [
+                {
+                    "logger": key[0],
+                    "level": key[1],
+                    "app_type": key[2],
+                    "template": key[3],
+                    # Emits per minute in the busier of the last full window and the current one
+                    "per_minute": round(max(state.last_window_count, state.window_count) * 60 / self.window, 1),
+                    "total": state.total,
+                    "coalesced": state.suppressed_total,
+                }
+                for key, state in self._templates.items()
+            ]
+            counters = {
+                "window_seconds": self.window,
+                "burst": self.burst,
+                "templates": len(self._templates),
+                "coalesced": self._coalesced,
+                "summaries": self._summaries,
+                "untracked": self._untracked,
+            }
+        templates.sort(key=lambda entry: (entry["per_minute"], entry["total"]), reverse=True)
+        counters["top_templates"] = templates[:top]
+        return counters
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Structured log context for Huntarr
+The hunting loops tag everything they log with the instance being processed,
+the id of the current cycle and the operation (missing, upgrade, swaparr).
+The context is kept per thread; the log queue copies it onto each record in
+the logging thread, and the database handler stores it in indexed columns of
+logs.db so one instance's cycle can be read back without a text search.
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Record attributes and logs.db columns, in storage order
+CONTEXT_FIELDS = ("instance_name", "cycle_id", "operation")
+
+_local = threading.local()
+
+
+def new_cycle_id() -> str:
+    """A short random id for one cycle of a hunting loop"""
+    return uuid.uuid4().hex[:12]
+
+
+def get_log_context() -> Optional[Dict[str, str]]:
+    """The calling thread's log context (None when nothing is set)"""
+    return getattr(_local, "context", None)
+
+
+def set_log_context(**fields):
+    """Set context fields for the calling thread; a None value removes the field"""
+    context = dict(getattr(_local, "context", None) or {})
+    for name, value in fields.items():
+        if name not in CONTEXT_FIELDS:
+            raise ValueError(f"Unknown log context field: {name}")
+        if value is None:
+            context.pop(name, None)
+        else:
+            context[name] = str(value)
+    _local.context = context or None
+
+
+def clear_log_context():
+    """Remove every context field of the calling thread"""
+    _local.context = None
+
+
+@contextmanager
+def log_context(**fields):
+    """Set context fields for the duration of a with block"""
+    previous = getattr(_local, "context", None)
+    set_log_context(**fields)
+    try:
+        yield
+    finally:
+        _local.context = previous
+
+
+def apply_log_context(record):
+    """Copy the calling thread's context onto a log record (fields passed via extra= win)"""
+    context = getattr(_local, "context", None)
+    if context:
+        for name, value in context.items():
+            if name not in record.__dict__:
+                record.__dict__[name] = value
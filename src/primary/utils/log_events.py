@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Live log event bus for Huntarr
+The batched log writer publishes every committed log row here and each live
+log stream (/logs SSE) holds a subscription filtered by app type and level.
+Subscribers sleep on their own condition variable, so an idle stream costs
+nothing and a new row wakes only the streams it matches.
+
+Every subscription has a bounded queue. A consumer that falls too far behind
+is cut off instead of slowing down everyone else; it reconnects and resumes
+from its last event ID through the database.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+class LogSubscription:
+    """One live stream's filter and pending rows (guarded by the bus lock)"""
+
+    def __init__(self, lock: threading.Lock, app_type: str = None, level: str = None, max_pending: int = 1000):
+        self.app_type = None if app_type in (None, "", "all") else app_type
+        self.level = None if level in (None, "", "all") else level
+        self.max_pending = max_pending
+        self.overflowed = False
+        self.closed = False
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._condition = threading.Condition(lock)
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        return ((self.app_type is None or row['app_type'] == self.app_type)
+                and (self.level is None or row['level'] == self.level))
+
+
+class LogEventBus:
+    """
+    Fan-out of committed log rows to live log streams.
+
+    - ``publish()`` is a no-op without subscribers.
+    - ``wait()`` blocks until the subscription has rows, is cut off
+      (``overflowed``), the bus is closed, or the timeout passes (keep-alive).
+    """
+
+    # Each open stream holds a waitress worker thread for as long as it lasts (main.py
+    # runs 8), so keep this well below that: the API, the login page and the 429 for
+    # rejected streams all need a free worker
+    MAX_SUBSCRIBERS = 4
+    MAX_PENDING = 1000
+
+    def __init__(self, max_subscribers: int = None, max_pending: int = None):
+        self.max_subscribers = max_subscribers or self.MAX_SUBSCRIBERS
+        self.max_pending = max_pending or self.MAX_PENDING
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._closed = False
+        self._published = 0
+        self._overflowed = 0
+
+    def subscribe(self, app_type: str = None, level: str = None) -> Optional[LogSubscription]:
+        """Register a live stream; returns None when the subscriber limit is reached"""
+        with self._lock:
+            if self._closed or len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = LogSubscription(self._lock, app_type, level, self.max_pending)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: LogSubscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            subscription.closed = True
+
+    def publish(self, rows: List[Dict[str, Any]]):
+        """Hand committed rows (in ID order) to every matching subscriber"""
+        if not self._subscribers or not rows:
+            return
+        with self._lock:
+            self._published += len(rows)
+            for subscription in self._subscribers:
+                if subscription.overflowed:
+                    continue
+                matched = [row for row in rows if subscription.matches(row)]
+                if not matched:
+                    continue
+                if len(subscription._pending) + len(matched) > subscription.max_pending:
+                    # Slow consumer: drop what it has queued and cut it off
+                    subscription._pending.clear()
+                    subscription.overflowed = True
+                    self._overflowed += 1
+                else:
+                    subscription._pending.extend(matched)
+                subscription._condition.notify()
+
+    def wait(self, subscription: LogSubscription, timeout: float) -> List[Dict[str, Any]]:
+        """Return pending rows for a subscription, waiting up to timeout for some to arrive"""
+        with self._lock:
+            if not subscription._pending and not subscription.overflowed and not subscription.closed:
+                subscription._condition.wait(timeout)
+            rows = list(subscription._pending)
+            subscription._pending.clear()
+            return rows
+
+    def close(self):
+        """Wake and end every live stream (shutdown)"""
+        with self._lock:
+            self._closed = True
+            for subscription in self._subscribers:
+                subscription.closed = True
+                subscription._condition.notify()
+            self._subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return subscriber and delivery counters"""
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "max_subscribers": self.max_subscribers,
+                "published": self._published,
+                "overflowed": self._overflowed,
+            }
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Time-partitioned log storage for Huntarr
+Logs live in one table per UTC day (logs_pYYYYMMDD) with its own indexes,
+FTS index and counter trigger. A `logs` view unions the partitions for ad-hoc
+queries; LogsDatabase reads the partitions directly so a page only touches
+the days it needs. Retention drops whole partitions instead of deleting rows.
+
+Log IDs stay unique across partitions through the log_id_sequence table, so
+(timestamp, id) page cursors and "new since id" keep working. Rows from the
+single table that predates partitioning (kept as logs_unpartitioned by the
+migration) are moved into partitions in small batches after startup. Timestamps are
+stored as integer milliseconds since the epoch (UTC). The log context
+columns (instance_name, cycle_id, operation; see log_context.py) have
+partial indexes, so one instance's or one cycle's logs are a range scan.
+"""
+
+import re
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+import pytz
+
+from src.primary.utils.log_context import CONTEXT_FIELDS
+from src.primary.utils.log_search import ensure_log_search_index, fts_table_name
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "logs_p"
+LOG_COLUMNS = "id, timestamp, level, app_type, message, logger_name, created_at, " + ", ".join(CONTEXT_FIELDS)
+# The single logs table that predates partitioning, and its columns
+LEGACY_LOGS_TABLE = "logs_unpartitioned"
+_UNPARTITIONED_COLUMNS = "id, timestamp, level, app_type, message, logger_name, created_at"
+
+_PARTITION_GLOB = PARTITION_PREFIX + "[0-9]" * 8
+_DAY_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+
+
+def partition_table(day: str) -> str:
+    """Table name of the partition for a YYYYMMDD day"""
+    return f"{PARTITION_PREFIX}{day}"
+
+
+def to_epoch_ms(timestamp) -> int:
+    """Convert a log timestamp (datetime, ISO string or epoch ms) to integer epoch milliseconds
+
+    Naive datetimes and strings without an offset are taken as UTC, which is
+    how log timestamps have always been recorded.
+    """
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return int(timestamp)
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime.fromisoformat(str(timestamp).strip().replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = pytz.UTC.localize(timestamp)
+    return int(timestamp.timestamp() * 1000)
+
+
+def partition_day(timestamp) -> str:
+    """Return the YYYYMMDD partition day of a log timestamp (epoch ms, datetime or stored string)"""
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        return datetime.fromtimestamp(timestamp / 1000, tz=pytz.UTC).strftime('%Y%m%d')
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(pytz.UTC)
+        return timestamp.strftime('%Y%m%d')
+    match = _DAY_RE.match(str(timestamp))
+    if not match:
+        raise ValueError(f"Unrecognised log timestamp: {timestamp!r}")
+    return "".join(match.groups())
+
+
+def retention_cutoff_day(days_to_keep: int) -> str:
+    """Oldest partition day that is still inside the retention window"""
+    return (datetime.now(tz=pytz.UTC) - timedelta(days=days_to_keep)).strftime('%Y%m%d')
+
+
+def list_partitions(conn) -> List[str]:
+    """Return the days that have a partition, oldest first"""
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? ORDER BY name",
+        (_PARTITION_GLOB,)
+    )
+    return [row[0][len(PARTITION_PREFIX):] for row in cursor.fetchall()]
+
+
+def reserve_log_ids(conn, count: int) -> int:
+    """Reserve count consecutive log IDs and return the first one (call inside the write transaction)"""
+    conn.execute('UPDATE log_id_sequence SET last_id = last_id + ?', (count,))
+    return conn.execute('SELECT last_id FROM log_id_sequence').fetchone()[0] - count + 1
+
+
+def create_partition(conn, day: str) -> str:
+    """Create the partition for a day with its indexes, counter trigger and FTS index"""
+    table = partition_table(day)
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER NOT NULL,
+            level TEXT NOT NULL,
+            app_type TEXT NOT NULL,
+            message TEXT NOT NULL,
+            logger_name TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            instance_name TEXT,
+            cycle_id TEXT,
+            operation TEXT
+        )
+    ''')
+    # Same keyset indexes as the unpartitioned table had, just one day's worth each
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table}(timestamp)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_app_level_time ON {table}(app_type, level, timestamp, id)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_app_time ON {table}(app_type, timestamp, id)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_level_time ON {table}(level, timestamp, id)')
+    create_context_indexes(conn, table)
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_counts_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO log_counts (app_type, level, day, count) VALUES (new.app_type, new.level, '{day}', 1)
+            ON CONFLICT(app_type, level, day) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_counts_delete AFTER DELETE ON {table} BEGIN
+            UPDATE log_counts SET count = count - 1
+            WHERE app_type = old.app_type AND level = old.level AND day = '{day}';
+        END
+    ''')
+    ensure_log_search_index(conn, table)
+    return table
+
+
+def create_context_indexes(conn, table: str):
+    """Index a partition's log context columns (partial: most web and system logs have no context)
+
+    The cycle index leads with cycle_id and then instance_name, so "one instance's
+    part of a cycle" is a single range; a cycle's rows are few enough to sort.
+    """
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_{table}_cycle_instance ON {table}(cycle_id, instance_name, timestamp, id)
+        WHERE cycle_id IS NOT NULL
+    ''')
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_{table}_instance_time ON {table}(instance_name, timestamp, id)
+        WHERE instance_name IS NOT NULL
+    ''')
+
+
+def drop_partition(conn, day: str):
+    """Drop a whole day of logs (table, indexes, triggers, FTS index and counters)"""
+    table = partition_table(day)
+    conn.execute(f'DROP TABLE IF EXISTS {fts_table_name(table)}')
+    conn.execute(f'DROP TABLE IF EXISTS {table}')
+    conn.execute('DELETE FROM log_counts WHERE day = ?', (day,))
+
+
+def rebuild_logs_view(conn, days: List[str]):
+    """Point the `logs` view at the current set of partitions"""
+    conn.execute('DROP VIEW IF EXISTS logs')
+    if days:
+        body = " UNION ALL ".join(f"SELECT {LOG_COLUMNS} FROM {partition_table(day)}" for day in days)
+    else:
+        body = ("SELECT NULL AS id, NULL AS timestamp, NULL AS level, NULL AS app_type, "
+                "NULL AS message, NULL AS logger_name, NULL AS created_at, "
+                + ", ".join(f"NULL AS {field}" for field in CONTEXT_FIELDS) + " WHERE 0")
+    conn.execute(f'CREATE VIEW logs AS {body}')
+
+
+def legacy_logs_exist(conn) -> bool:
+    """Return True while rows from before partitioning are still waiting to be moved"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (LEGACY_LOGS_TABLE,)
+    ).fetchone() is not None
+
+
+def move_legacy_logs(conn, batch_size: int) -> int:
+    """Move the oldest batch_size rows of the pre-partitioning table into their day partitions
+
+    Rows keep their IDs; timestamps become epoch milliseconds. The table is
+    dropped once it is empty. Returns the number of rows taken from it (0
+    when it is gone); call inside a write transaction.
+    """
+    if not legacy_logs_exist(conn):
+        return 0
+    rows = conn.execute(
+        f"SELECT {_UNPARTITIONED_COLUMNS} FROM {LEGACY_LOGS_TABLE} ORDER BY id LIMIT ?", (batch_size,)
+    ).fetchall()
+    if not rows:
+        conn.execute(f'DROP TABLE {LEGACY_LOGS_TABLE}')
+        return 0
+
+    by_day = {}
+    for row in rows:
+        try:
+            timestamp = to_epoch_ms(row[1])
+        except ValueError:
+            logger.warning(f"Skipping log entry {row[0]} with unrecognised timestamp {row[1]!r}")
+            continue
+        by_day.setdefault(partition_day(timestamp), []).append((row[0], timestamp) + tuple(row[2:]))
+    placeholders = ", ".join("?" * len(_UNPARTITIONED_COLUMNS.split(",")))
+    for day, day_rows in by_day.items():
+        table = create_partition(conn, day)
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({_UNPARTITIONED_COLUMNS}) VALUES ({placeholders})", day_rows
+        )
+    conn.execute(f'DELETE FROM {LEGACY_LOGS_TABLE} WHERE id <= ?', (rows[-1][0],))
+    return len(rows)
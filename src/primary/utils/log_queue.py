@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Queued logging for Huntarr
+Huntarr loggers don't write to their sinks (console, log file, logs.db)
+themselves. Each logger has a single LogQueueHandler that puts the record on
+one bounded queue, and one QueueListener thread hands it to that logger's
+sinks. A slow disk, a blocked stdout or a busy logs.db therefore never stalls
+the hunting loops.
+
+When the queue is full, WARNING and above wait briefly for space and lower
+levels are dropped and counted; the listener reports drops in the log.
+Records logged after stop_log_listener() are written synchronously so
+shutdown messages are not lost.
+"""
+
+import copy
+import logging
+import logging.handlers
+import queue
+import threading
+from typing import Any, Dict, Iterable, Tuple
+
+from src.primary.utils.log_context import apply_log_context
+
+QUEUE_SIZE = 10000
+BLOCK_TIMEOUT = 0.05  # seconds a WARNING+ record may wait for queue space
+
+_queue: "queue.Queue[Any]" = queue.Queue(maxsize=QUEUE_SIZE)
+_listener = None
+_listener_lock = threading.Lock()
+_exception_formatter = logging.Formatter()
+
+# Counters exposed through get_log_queue_stats(); producers update them under _counter_lock
+_counter_lock = threading.Lock()
+_enqueued = 0
+_dropped = 0
+_dropped_reported = 0
+_handled = 0
+_high_water = 0
+
+
+def _dispatch(record: logging.LogRecord):
+    """Hand a prepared record to the sinks of the logger that queued it"""
+    for handler in record.__dict__.get('_log_sinks', ()):
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+def _report_dropped():
+    """Log how many records were dropped since the last report (listener thread)"""
+    global _dropped_reported
+    dropped = _dropped - _dropped_reported
+    if dropped <= 0:
+        return
+    _dropped_reported += dropped
+    main_logger = logging.getLogger("huntarr")
+    record = main_logger.makeRecord("huntarr", logging.WARNING, __file__, 0,
+                                    f"Log queue full: dropped {dropped} log record(s)", None, None)
+    record._log_sinks = get_log_sinks(main_logger)
+    _dispatch(record)
+
+
+class _SinkRouter(logging.Handler):
+    """The listener's only handler: routes each record to its own logger's sinks"""
+
+    def handle(self, record):
+        global _handled
+        if isinstance(record, threading.Event):
+            # flush_log_queue() marker
+            record.set()
+            return True
+        if _dropped != _dropped_reported:
+            _report_dropped()
+        try:
+            _dispatch(record)
+        except Exception:
+            self.handleError(record)
+        with _counter_lock:
+            _handled += 1
+        return True
+
+    def emit(self, record):
+        self.handle(record)
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; wait for room instead of failing
+        self.queue.put(self._sentinel, timeout=5)
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for the listener, which passes them on to ``sinks``.
+
+    ``sinks`` is the logger's own handlers (console, file; replaced whenever
+    the logger is configured again) followed by added sinks (logs.db), which
+    survive reconfiguration.
+    """
+
+    def __init__(self):
+        super().__init__(_queue)
+        self.own_sinks: Tuple[logging.Handler, ...] = ()
+        self.added_sinks: Tuple[logging.Handler, ...] = ()
+        self.sinks: Tuple[logging.Handler, ...] = ()
+
+    def prepare(self, record):
+        # Render the message now: arguments may change before the listener gets to the record.
+        # The copy keeps the caller's record intact for any other handlers.
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        # The listener thread has no idea which instance/cycle the caller was working on
+        apply_log_context(record)
+        if record.args:
+            record.msg_template = record.msg
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record._log_sinks = self.sinks
+        return record
+
+    def emit(self, record):
+        try:
+            record = self.prepare(record)
+            if _listener is None:
+                _dispatch(record)
+            else:
+                self.enqueue(record)
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record):
+        global _enqueued, _dropped, _high_water
+        try:
+            _queue.put_nowait(record)
+        except queue.Full:
+            # Backpressure: warnings and errors may wait a little for the listener
+            try:
+                if record.levelno < logging.WARNING or BLOCK_TIMEOUT <= 0:
+                    raise queue.Full
+                _queue.put(record, timeout=BLOCK_TIMEOUT)
+            except queue.Full:
+                with _counter_lock:
+                    _dropped += 1
+                return
+        depth = _queue.qsize()
+        with _counter_lock:
+            _enqueued += 1
+            if depth > _high_water:
+                _high_water = depth
+
+
+def _queue_handler(target_logger: logging.Logger) -> LogQueueHandler:
+    """The logger's queue handler, created (replacing any direct handlers) if needed"""
+    for handler in target_logger.handlers:
+        if isinstance(handler, LogQueueHandler):
+            return handler
+    for handler in target_logger.handlers[:]:
+        target_logger.removeHandler(handler)
+    handler = LogQueueHandler()
+    target_logger.addHandler(handler)
+    start_log_listener()
+    return handler
+
+
+def set_log_sinks(target_logger: logging.Logger, sinks: Iterable[logging.Handler]):
+    """Route a logger through the log queue to these handlers (replacing its previous ones)"""
+    handler = _queue_handler(target_logger)
+    handler.own_sinks = tuple(sinks)
+    handler.sinks = handler.own_sinks + handler.added_sinks
+
+
+def add_log_sink(target_logger: logging.Logger, sink: logging.Handler):
+    """Add a sink that is kept when the logger is configured again (no-op if already there)"""
+    handler = _queue_handler(target_logger)
+    if sink not in handler.sinks:
+        handler.added_sinks = handler.added_sinks + (sink,)
+        handler.sinks = handler.own_sinks + handler.added_sinks
+
+
+def get_log_sinks(target_logger: logging.Logger) -> Tuple[logging.Handler, ...]:
+    """The sinks a logger's records are delivered to"""
+    for handler in target_logger.handlers:
+        if isinstance(handler, LogQueueHandler):
+            return handler.sinks
+    return tuple(target_logger.handlers)
+
+
+def start_log_listener():
+    """Start the listener thread (idempotent)"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            listener = _Listener(_queue, _SinkRouter())
+            listener.start()
+            listener._thread.name = "log-queue-listener"
+            _listener = listener
+
+
+def flush_log_queue(timeout: float = 5.0) -> bool:
+    """Wait until every record queued before this call has reached its sinks"""
+    if _listener is None:
+        return True
+    marker = threading.Event()
+    try:
+        _queue.put(marker, timeout=timeout)
+    except queue.Full:
+        return False
+    return marker.wait(timeout)
+
+
+def stop_log_listener():
+    """Deliver queued records and stop the listener; later records are written synchronously"""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except queue.Full:
+            print("Log queue still full at shutdown")
+        # Anything queued between the sentinel and the switch to synchronous writes
+        while True:
+            try:
+                record = _queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(record, threading.Event):
+                record.set()
+            elif record is not None:
+                _dispatch(record)
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    """Return queue depth and throughput counters"""
+    with _counter_lock:
+        counters = {
+            "high_water": _high_water,
+            "enqueued": _enqueued,
+            "handled": _handled,
+            "dropped": _dropped,
+        }
+    return {
+        "queued": _queue.qsize(),
+        "queue_capacity": _queue.maxsize,
+        **counters,
+        "running": _listener is not None,
+    }
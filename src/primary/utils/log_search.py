@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Full-text log search for Huntarr
+Each log table gets an external-content FTS5 index over its message column
+(<table>_fts), kept in sync by triggers on the table. SQLite builds without
+FTS5 keep working: the index and its triggers are simply not created and
+searches fall back to LIKE.
+"""
+
+import re
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_TRIGGERS = {
+    "{table}_fts_insert": '''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts(rowid, message) VALUES (new.id, new.message);
+        END
+    ''',
+    "{table}_fts_delete": '''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END
+    ''',
+    "{table}_fts_update": '''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF message ON {table} BEGIN
+            INSERT INTO {table}_fts({table}_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO {table}_fts(rowid, message) VALUES (new.id, new.message);
+        END
+    ''',
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_MAX_TERMS = 16
+
+
+def fts5_available(conn) -> bool:
+    """Return True if this SQLite build has the FTS5 module"""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE IF EXISTS temp._fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def fts_table_name(table: str) -> str:
+    """Name of the FTS index for a log table"""
+    return f"{table}_fts"
+
+
+def ensure_log_search_index(conn, table: str = "logs") -> bool:
+    """Create (and backfill) the FTS index and triggers for a log table when FTS5 is available
+
+    Without FTS5 any leftover sync triggers are dropped, since inserts into
+    the table would fail on them. Returns True if full-text search can be used.
+    """
+    fts_table = fts_table_name(table)
+    triggers = {name.format(table=table): sql.format(table=table) for name, sql in _TRIGGERS.items()}
+    if not fts5_available(conn):
+        for trigger in triggers:
+            conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        return False
+
+    existing = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = ? OR (type = 'trigger' AND tbl_name = ?)",
+            (fts_table, table)
+        )
+    }
+    if fts_table in existing and all(trigger in existing for trigger in triggers):
+        return True
+
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+            message,
+            content='{table}',
+            content_rowid='id'
+        )
+    ''')
+    for sql in triggers.values():
+        conn.execute(sql)
+    # Backfill existing rows (also repairs an index that missed writes while triggers were gone)
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    logger.debug(f"Built full-text index for {table}")
+    return True
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """Turn free text from the search box into an FTS5 MATCH expression
+
+    Every word must match as a token prefix ("sonar" finds "sonarr"), which is
+    the closest FTS5 gets to the old substring search. Words are quoted, so
+    FTS5 operators in user input are never interpreted. Returns None if the
+    text has no searchable words.
+    """
+    terms = _TOKEN_RE.findall(search or "")[:_MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
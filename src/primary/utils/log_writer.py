@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Batched log writer for Huntarr
+Log records are queued by the logging threads and written to logs.db by a
+single background flusher, many rows per transaction, so logging never
+waits on SQLite. The queue is bounded: when it is full, WARNING and above
+wait briefly for space and lower levels are dropped and counted.
+"""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import pytz
+
+# Rows are (timestamp, level, app_type, message, logger_name)
+LogRow = tuple
+
+_PRIORITY_LEVELS = frozenset(("WARNING", "ERROR", "CRITICAL"))
+
+
+class BatchedLogWriter:
+    """
+    Queue-backed log writer with a background flusher.
+
+    - A batch is written once ``max_batch`` rows are queued or ``flush_interval``
+      seconds after its first row, whichever comes first.
+    - ``flush()`` waits until everything queued before the call is written;
+      ``stop()`` flushes and stops the thread. Rows logged after ``stop()`` are
+      written synchronously so shutdown messages are not lost.
+    """
+
+    QUEUE_SIZE = 10000
+    MAX_BATCH = 500
+    FLUSH_INTERVAL = 0.25
+    BLOCK_TIMEOUT = 0.05
+
+    def __init__(self, write_batch: Callable[[List[LogRow]], None], name: str = "logs.db",
+                 queue_size: int = None, max_batch: int = None, flush_interval: float = None,
+                 block_timeout: float = None):
+        self._write_batch = write_batch
+        self.name = name
+        self.max_batch = max_batch or self.MAX_BATCH
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.block_timeout = self.BLOCK_TIMEOUT if block_timeout is None else block_timeout
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size or self.QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = False
+
+        # Counters exposed through stats()
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._dropped_reported = 0
+        self._failed = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._last_flush_ms = 0.0
+
+    def _ensure_started(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._stopping:
+                return False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-log-writer", daemon=True)
+                self._thread.start()
+        return True
+
+    def enqueue(self, row: LogRow) -> bool:
+        """Queue a log row; returns False if it had to be dropped"""
+        if not self._ensure_started():
+            self._write([row])
+            return True
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Backpressure: warnings and errors may wait a little for the flusher
+            try:
+                if row[1] not in _PRIORITY_LEVELS or self.block_timeout <= 0:
+                    raise queue.Full
+                self._queue.put(row, timeout=self.block_timeout)
+            except queue.Full:
+                self._dropped += 1
+                return False
+        self._enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every row queued before this call has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush queued rows and stop the flusher thread"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                print(f"{self.name} log writer queue still full at shutdown")
+                return
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                print(f"{self.name} log writer did not flush within {timeout}s")
+
+    def _collect_batch(self, first) -> tuple:
+        """Collect rows for one batch; returns (rows, flush markers, stop requested)"""
+        rows, markers, stop = [], [], False
+        item = first
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if item is None:
+                stop = True
+                break
+            if isinstance(item, threading.Event):
+                # Flush requested - write what we have now
+                markers.append(item)
+                break
+            rows.append(item)
+            if len(rows) >= self.max_batch:
+                break
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return rows, markers, stop
+
+    def _run(self):
+        while True:
+            rows, markers, stop = self._collect_batch(self._queue.get())
+            if rows:
+                self._write(rows)
+            for marker in markers:
+                marker.set()
+            if stop:
+                # Write anything queued behind the stop sentinel
+                remaining = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    elif item is not None:
+                        remaining.append(item)
+                for start in range(0, len(remaining), self.max_batch):
+                    self._write(remaining[start:start + self.max_batch])
+                break
+
+    def _write(self, rows: List[LogRow]):
+        dropped = self._dropped - self._dropped_reported
+        if dropped > 0:
+            self._dropped_reported += dropped
+            rows = rows + [(
+                datetime.now(tz=pytz.UTC), "WARNING", "system",
+                f"Log queue full: dropped {dropped} log record(s)", "huntarr.log_writer"
+            )]
+        start = time.perf_counter()
+        try:
+            self._write_batch(rows)
+        except Exception as e:
+            # Don't use logger here to avoid infinite recursion
+            self._failed += len(rows)
+            print(f"Error writing {len(rows)} logs to {self.name}: {e}")
+            return
+        self._last_flush_ms = (time.perf_counter() - start) * 1000
+        self._written += len(rows)
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(rows))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return writer counters"""
+        return {
+            "queued": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "batches": self._batches,
+            "largest_batch": self._largest_batch,
+            "average_batch": round(self._written / self._batches, 2) if self._batches else 0,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
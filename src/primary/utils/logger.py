@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Logging configuration for Huntarr
-Supports separate log files for each application type
+Supports separate log files for each application type.
+Loggers only queue their records; the console, file and database handlers
+are sinks run by the log queue listener (see log_queue.py).
 """
 
 import logging
@@ -9,10 +11,13 @@ import sys
 import os
 import pathlib
 import time
+import datetime
 from typing import Dict, Optional
 
 # Use the centralized path configuration
 from src.primary.utils.config_paths import LOG_DIR
+from src.primary.utils.timezone_utils import get_timezone_generation, get_user_timezone
+from src.primary.utils.log_queue import get_log_sinks, set_log_sinks
 
 # Log directory is already created by config_paths module
 # LOG_DIR already exists as pathlib.Path object pointing to the correct location
@@ -37,26 +42,44 @@ app_loggers: Dict[str, logging.Logger] = {}
 
 # Custom formatter that uses user's selected timezone instead of UTC
 class LocalTimeFormatter(logging.Formatter):
-    """Custom formatter that uses user's selected timezone for log timestamps"""
+    """Custom formatter that uses user's selected timezone for log timestamps
+    
+    The rendered timestamp is reused for every record logged in the same second
+    (until the timezone cache is cleared), and a record passed to several handlers
+    sharing this formatter (console and file) is only formatted once.
+    """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.converter = time.localtime  # Still use local time as fallback
+        # ((timezone generation, second, datefmt), rendered time) of the last record
+        self._time_cache = (None, None)
     
     def _get_user_timezone(self):
         """Get the user's selected timezone from general settings"""
         try:
-            from src.primary.utils.timezone_utils import get_user_timezone
             return get_user_timezone()
         except Exception:
-            # Final fallback if timezone_utils can't be imported
+            # Final fallback if the timezone can't be resolved
             import pytz
             return pytz.UTC
     
+    def format(self, record):
+        cached = record.__dict__.get('_local_time_formatted')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        text = super().format(record)
+        record._local_time_formatted = (self, text)
+        return text
+    
     def formatTime(self, record, datefmt=None):
         try:
+            key = (get_timezone_generation(), int(record.created), datefmt)
+            cached_key, cached_text = self._time_cache
+            if key == cached_key:
+                return cached_text
+            
             # Try to use user's selected timezone
             user_tz = self._get_user_timezone()
-            import datetime
             ct = datetime.datetime.fromtimestamp(record.created, tz=user_tz)
             
             if datefmt:
@@ -69,6 +92,7 @@ class LocalTimeFormatter(logging.Formatter):
             timezone_name = str(user_tz)
             s += f" {timezone_name}"
             
+            self._time_cache = (key, s)
             return s
         except Exception:
             # Fallback to system local time if timezone handling fails
@@ -97,8 +121,6 @@ def setup_main_logger():
     # Get or create the main logger instance
     current_logger = logging.getLogger(log_name)
 
-    # Reset handlers to avoid duplicates
-    current_logger.handlers.clear()
     current_logger.setLevel(use_log_level)
     
     # Prevent propagation to root logger to avoid duplicate messages
@@ -118,9 +140,9 @@ def setup_main_logger():
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
-    # Add handlers to the main logger
-    current_logger.addHandler(console_handler)
-    current_logger.addHandler(file_handler)
+    # Route the main logger through the log queue to its handlers
+    # (replaces any previous console/file handlers, so there are no duplicates)
+    set_log_sinks(current_logger, [console_handler, file_handler])
 
     current_logger.debug("Debug logging enabled for main logger")
 
@@ -163,11 +185,6 @@ def get_logger(app_type: str) -> logging.Logger:
         
     app_logger.setLevel(log_level)
     
-    # Reset handlers in case this logger existed before but wasn't cached
-    # (e.g., across restarts without clearing logging._handlers)
-    for handler in app_logger.handlers[:]:
-        app_logger.removeHandler(handler)
-
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
@@ -184,9 +201,10 @@ def get_logger(app_type: str) -> logging.Logger:
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
     
-    # Add the handlers specific to this app logger
-    app_logger.addHandler(console_handler)
-    app_logger.addHandler(file_handler)
+    # Route this app logger through the log queue to its own handlers; this replaces
+    # the handlers of a logger that existed before but wasn't cached (e.g. configured
+    # through the other import path of this module) and keeps its database sink
+    set_log_sinks(app_logger, [console_handler, file_handler])
     
     # Cache the configured logger
     app_loggers[log_name] = app_logger
@@ -226,8 +244,9 @@ def refresh_timezone_formatters():
     
     # Update main logger handlers
     if logger:
-        for handler in logger.handlers:
-            handler.setFormatter(new_formatter)
+        for handler in get_log_sinks(logger):
+            if isinstance(handler.formatter, LocalTimeFormatter):
+                handler.setFormatter(new_formatter)
     
     # Update all app logger handlers
     for app_name, app_logger in app_loggers.items():
@@ -235,8 +254,9 @@ def refresh_timezone_formatters():
         app_format = f"%(asctime)s - huntarr.{app_type} - %(levelname)s - %(message)s"
         app_formatter = LocalTimeFormatter(app_format, datefmt="%Y-%m-%d %H:%M:%S")
         
-        for handler in app_logger.handlers:
-            handler.setFormatter(app_formatter)
+        for handler in get_log_sinks(app_logger):
+            if isinstance(handler.formatter, LocalTimeFormatter):
+                handler.setFormatter(app_formatter)
     
     print("[Logger] Timezone formatters refreshed for all loggers")
 
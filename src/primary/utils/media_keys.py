@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compact media keys for stateful processed-ID storage
+Processed IDs are stored as SQLite integers whenever the ID allows it:
+
+- plain IDs ("12345") are stored as the non-negative integer itself
+- Sonarr season keys ("<series_id>_<season_number>") are packed into one
+  negative integer: -((series_id << 16) | season_number) - 1
+- anything else (non-canonical numbers, "S01", free text) is stored as TEXT
+
+The key column has no type affinity, so integers and text can share the
+same primary key and every encoding round-trips to the original string.
+"""
+
+SEASON_BITS = 16
+_SEASON_MASK = (1 << SEASON_BITS) - 1
+_MAX_SERIES_ID = (1 << (63 - SEASON_BITS)) - 1
+_MAX_PLAIN_ID = (1 << 63) - 1
+
+
+def _canonical_int(value: str):
+    """Return int(value) if value is a canonical non-negative decimal, else None"""
+    if not value.isdigit() or not value.isascii():
+        return None
+    if len(value) > 1 and value[0] == '0':
+        return None
+    return int(value)
+
+
+def encode_media_key(media_id):
+    """Encode a processed media ID as an int where possible, else as text"""
+    if isinstance(media_id, int) and not isinstance(media_id, bool) and 0 <= media_id <= _MAX_PLAIN_ID:
+        return media_id
+    media_id = str(media_id)
+
+    number = _canonical_int(media_id)
+    if number is not None:
+        return number if number <= _MAX_PLAIN_ID else media_id
+
+    series, sep, season = media_id.partition('_')
+    if sep:
+        series_id = _canonical_int(series)
+        season_number = _canonical_int(season)
+        if (series_id is not None and season_number is not None
+                and series_id <= _MAX_SERIES_ID and season_number <= _SEASON_MASK):
+            return -((series_id << SEASON_BITS) | season_number) - 1
+
+    return media_id
+
+
+def decode_media_key(media_key) -> str:
+    """Inverse of encode_media_key - always returns the original string ID"""
+    if isinstance(media_key, int):
+        if media_key >= 0:
+            return str(media_key)
+        packed = -media_key - 1
+        return f"{packed >> SEASON_BITS}_{packed & _SEASON_MASK}"
+    return str(media_key)
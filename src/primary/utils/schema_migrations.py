@@ -0,0 +1,677 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for Huntarr
+Each database keeps a schema_version table; startup applies only the
+migrations newer than the recorded version, each in its own transaction,
+and does nothing else when the schema is already current.
+"""
+
+import sqlite3
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+
+from src.primary.utils.media_keys import encode_media_key
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+class MigrationRegistry:
+    """Ordered set of schema migrations for one database file"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._migrations: Dict[int, Migration] = {}
+
+    def register(self, version: int, description: str):
+        """Decorator registering ``func(conn)`` as migration ``version``"""
+        def decorator(func: Callable[[sqlite3.Connection], None]):
+            if version in self._migrations:
+                raise ValueError(f"Duplicate {self.name} migration version {version}")
+            self._migrations[version] = Migration(version, description, func)
+            return func
+        return decorator
+
+    @property
+    def migrations(self) -> List[Migration]:
+        return [self._migrations[v] for v in sorted(self._migrations)]
+
+    @property
+    def latest_version(self) -> int:
+        return max(self._migrations) if self._migrations else 0
+
+    @staticmethod
+    def current_version(conn) -> int:
+        """Return the applied schema version (0 for a database without schema_version)"""
+        try:
+            row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                return 0
+            raise
+        return row[0] or 0
+
+    def apply_pending(self, connect: Callable) -> List[int]:
+        """Apply every migration newer than the database's schema version
+
+        ``connect`` returns a connection usable as a context manager. Each
+        migration runs in one BEGIN IMMEDIATE transaction together with its
+        schema_version row, so a failed migration leaves the previous version
+        intact. Returns the list of versions applied.
+        """
+        with connect() as conn:
+            current = self.current_version(conn)
+
+        if current >= self.latest_version:
+            if current > self.latest_version:
+                logger.warning(f"{self.name} schema version {current} is newer than this build ({self.latest_version})")
+            return []
+
+        applied = []
+        conn = connect()
+        try:
+            conn.isolation_level = None  # Explicit transactions so DDL is atomic per migration
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            for migration in self.migrations:
+                if migration.version <= current:
+                    continue
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    # Another Huntarr process or database instance may have got here first
+                    if self.current_version(conn) >= migration.version:
+                        conn.execute('COMMIT')
+                        continue
+                    migration.apply(conn)
+                    conn.execute(
+                        'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                        (migration.version, migration.description)
+                    )
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    logger.error(f"{self.name} migration {migration.version} ({migration.description}) failed")
+                    raise
+                applied.append(migration.version)
+                logger.info(f"Applied {self.name} migration {migration.version}: {migration.description}")
+        finally:
+            conn.isolation_level = ""
+            conn.close()
+        return applied
+
+
+def column_exists(conn, table: str, column: str) -> bool:
+    """Return True if ``table`` already has ``column``"""
+    return any(row[1] == column for row in conn.execute(f'PRAGMA table_info({table})'))
+
+
+def add_column_if_missing(conn, table: str, column: str, definition: str):
+    """ALTER TABLE ... ADD COLUMN for databases created before the column existed"""
+    if not column_exists(conn, table, column):
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        logger.info(f"Added {column} column to {table} table")
+
+
+HUNTARR_MIGRATIONS = MigrationRegistry("huntarr.db")
+LOGS_MIGRATIONS = MigrationRegistry("logs.db")
+
+
+# --- huntarr.db --- #
+
+@HUNTARR_MIGRATIONS.register(1, "Initial schema")
+def _huntarr_initial_schema(conn):
+    # Idempotent so databases created before schema_version existed adopt version 1 safely
+
+    # Create app_configs table for all app settings
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS app_configs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL UNIQUE,
+            config_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create general_settings table for general/global settings
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS general_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            setting_key TEXT NOT NULL UNIQUE,
+            setting_value TEXT NOT NULL,
+            setting_type TEXT DEFAULT 'string',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create stateful_lock table for stateful management lock info
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stateful_lock (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create stateful_processed_ids table for processed media IDs
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stateful_processed_ids (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            instance_name TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(app_type, instance_name, media_id)
+        )
+    ''')
+
+    # Create stateful_instance_locks table for per-instance state management
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stateful_instance_locks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            instance_name TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            expiration_hours INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(app_type, instance_name)
+        )
+    ''')
+
+    # Create media_stats table for tracking hunted/upgraded media statistics
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS media_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            stat_type TEXT NOT NULL,
+            stat_value INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(app_type, stat_type)
+        )
+    ''')
+
+    # Create hourly_caps table for API usage tracking
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS hourly_caps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL UNIQUE,
+            api_hits INTEGER DEFAULT 0,
+            last_reset_hour INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create sleep_data table for cycle tracking
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sleep_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL UNIQUE,
+            next_cycle_time TEXT,
+            cycle_lock BOOLEAN DEFAULT FALSE,
+            last_cycle_start TEXT,
+            last_cycle_end TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create swaparr_stats table for Swaparr-specific statistics
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS swaparr_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            stat_key TEXT NOT NULL UNIQUE,
+            stat_value INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # History table moved to manager.db - remove this table if it exists
+    conn.execute('DROP TABLE IF EXISTS history')
+
+    # Create schedules table for storing scheduled actions
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id TEXT PRIMARY KEY,
+            app_type TEXT NOT NULL,
+            action TEXT NOT NULL,
+            time_hour INTEGER NOT NULL,
+            time_minute INTEGER NOT NULL,
+            days TEXT NOT NULL,
+            app_instance TEXT NOT NULL,
+            enabled BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create state_data table for state management (processed IDs and reset times)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS state_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            state_type TEXT NOT NULL,
+            state_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(app_type, state_type)
+        )
+    ''')
+
+    # Create swaparr_state table for Swaparr-specific state management
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS swaparr_state (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_name TEXT NOT NULL,
+            state_type TEXT NOT NULL,
+            state_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(app_name, state_type)
+        )
+    ''')
+
+    # Create users table for authentication and user management
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            two_fa_enabled BOOLEAN DEFAULT FALSE,
+            two_fa_secret TEXT,
+            temp_2fa_secret TEXT,
+            plex_token TEXT,
+            plex_user_data TEXT,
+            recovery_key TEXT
+        )
+    ''')
+
+    # Create sponsors table for GitHub sponsors data
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sponsors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            login TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            avatar_url TEXT NOT NULL,
+            url TEXT NOT NULL,
+            tier TEXT DEFAULT 'Supporter',
+            monthly_amount INTEGER DEFAULT 0,
+            category TEXT DEFAULT 'past',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Logs table moved to separate logs.db - remove if it exists
+    conn.execute('DROP TABLE IF EXISTS logs')
+
+    # Create recovery_key_rate_limit table for tracking failed recovery key attempts
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recovery_key_rate_limit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ip_address TEXT NOT NULL,
+            username TEXT,
+            failed_attempts INTEGER DEFAULT 0,
+            locked_until TIMESTAMP,
+            last_attempt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(ip_address)
+        )
+    ''')
+
+    # Create requestarr_requests table for tracking media requests
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS requestarr_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tmdb_id INTEGER NOT NULL,
+            media_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            year INTEGER,
+            overview TEXT,
+            poster_path TEXT,
+            backdrop_path TEXT,
+            app_type TEXT NOT NULL,
+            instance_name TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(tmdb_id, media_type, app_type, instance_name)
+        )
+    ''')
+
+    # Create hunt_history table for tracking processed media history
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS hunt_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            instance_name TEXT NOT NULL,
+            media_id TEXT NOT NULL,
+            processed_info TEXT NOT NULL,
+            operation_type TEXT DEFAULT 'missing',
+            discovered BOOLEAN DEFAULT FALSE,
+            date_time INTEGER NOT NULL,
+            date_time_readable TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Columns added to users after the table was first released
+    add_column_if_missing(conn, 'users', 'temp_2fa_secret', 'TEXT')
+    add_column_if_missing(conn, 'users', 'recovery_key', 'TEXT')
+    add_column_if_missing(conn, 'users', 'plex_linked_at', 'INTEGER')
+
+    # Create reset_requests table for reset request management
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reset_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_type TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            processed INTEGER NOT NULL,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create indexes for better performance
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_app_configs_type ON app_configs(app_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_general_settings_key ON general_settings(setting_key)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_processed_app_instance ON stateful_processed_ids(app_type, instance_name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_processed_media_id ON stateful_processed_ids(media_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_stateful_instance_locks_app_instance ON stateful_instance_locks(app_type, instance_name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_media_stats_app_type ON media_stats(app_type, stat_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hourly_caps_app_type ON hourly_caps(app_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sleep_data_app_type ON sleep_data(app_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_stats_key ON swaparr_stats(stat_key)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_app_type ON schedules(app_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_enabled ON schedules(enabled)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_time ON schedules(time_hour, time_minute)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_state_data_app_type ON state_data(app_type, state_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_swaparr_state_app_name ON swaparr_state(app_name, state_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sponsors_login ON sponsors(login)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_app_instance ON hunt_history(app_type, instance_name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_date_time ON hunt_history(date_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_media_id ON hunt_history(media_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_hunt_history_operation_type ON hunt_history(operation_type)')
+
+
+
+@HUNTARR_MIGRATIONS.register(2, "Compact integer-keyed stateful processed IDs")
+def _huntarr_compact_stateful_processed(conn):
+    # Instance dictionary: each app instance is stored once and referenced by id
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stateful_instances (
+            id INTEGER PRIMARY KEY,
+            app_type TEXT NOT NULL,
+            instance_name TEXT NOT NULL,
+            UNIQUE(app_type, instance_name)
+        )
+    ''')
+
+    # Processed IDs clustered by (instance_id, media_key); no rowid, no secondary indexes
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stateful_processed (
+            instance_id INTEGER NOT NULL,
+            media_key NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (instance_id, media_key)
+        ) WITHOUT ROWID
+    ''')
+
+    table = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'stateful_processed_ids'"
+    ).fetchone()
+    if not table:
+        return
+
+    conn.execute('''
+        INSERT OR IGNORE INTO stateful_instances (app_type, instance_name)
+        SELECT DISTINCT app_type, instance_name FROM stateful_processed_ids
+    ''')
+    conn.create_function("encode_media_key", 1, encode_media_key, deterministic=True)
+    try:
+        conn.execute('''
+            INSERT OR IGNORE INTO stateful_processed (instance_id, media_key, created_at)
+            SELECT i.id, encode_media_key(p.media_id),
+                   COALESCE(CAST(strftime('%s', p.created_at) AS INTEGER), CAST(strftime('%s', 'now') AS INTEGER))
+            FROM stateful_processed_ids p
+            JOIN stateful_instances i ON i.app_type = p.app_type AND i.instance_name = p.instance_name
+        ''')
+    finally:
+        conn.create_function("encode_media_key", 1, None)
+    migrated = conn.execute('SELECT COUNT(*) FROM stateful_processed').fetchone()[0]
+
+    # Dropping the table also drops idx_stateful_processed_app_instance and idx_stateful_processed_media_id
+    conn.execute('DROP TABLE stateful_processed_ids')
+    logger.info(f"Moved {migrated} processed IDs to the compact stateful_processed table")
+
+@HUNTARR_MIGRATIONS.register(3, "Settings change counter")
+def _huntarr_settings_version(conn):
+    # Bumped by every write to the settings tables, whoever makes it, so settings
+    # caches can tell when they are stale (see HuntarrDatabase.get_settings_version)
+    conn.execute('CREATE TABLE IF NOT EXISTS settings_version (version INTEGER NOT NULL)')
+    if conn.execute('SELECT COUNT(*) FROM settings_version').fetchone()[0] == 0:
+        conn.execute('INSERT INTO settings_version (version) VALUES (0)')
+    for table in ('app_configs', 'general_settings'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_settings_version_{event.lower()}
+                AFTER {event} ON {table} BEGIN
+                    UPDATE settings_version SET version = version + 1;
+                END
+            ''')
+
+# --- logs.db --- #
+
+@LOGS_MIGRATIONS.register(1, "Initial logs schema")
+def _logs_initial_schema(conn):
+    # Create logs table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME NOT NULL,
+            level TEXT NOT NULL,
+            app_type TEXT NOT NULL,
+            message TEXT NOT NULL,
+            logger_name TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Create indexes for logs performance
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_type ON logs(app_type)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_level ON logs(app_type, level)')
+
+
+@LOGS_MIGRATIONS.register(2, "Full-text index for log search")
+def _logs_full_text_index(conn):
+    # External-content FTS5 table over logs.message plus sync triggers; backfills existing rows
+    try:
+        conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS temp._fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE IF EXISTS temp._fts5_probe')
+    except sqlite3.OperationalError:
+        logger.warning("SQLite FTS5 is not available - log search will use LIKE scans")
+        return
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+            message,
+            content='logs',
+            content_rowid='id'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+            INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS logs_fts_update AFTER UPDATE OF message ON logs BEGIN
+            INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+        END
+    ''')
+    conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')")
+
+
+@LOGS_MIGRATIONS.register(3, "Composite indexes for keyset log pagination")
+def _logs_keyset_indexes(conn):
+    # Log pages are read newest first by (timestamp, id) under the app/level filters, so each
+    # filter combination gets an index ending in (timestamp, id). That lets SQLite seek straight
+    # to a page cursor instead of sorting every matching row. The single-column app/level indexes
+    # are prefixes of these and go away.
+    conn.execute('DROP INDEX IF EXISTS idx_logs_app_type')
+    conn.execute('DROP INDEX IF EXISTS idx_logs_level')
+    conn.execute('DROP INDEX IF EXISTS idx_logs_app_level')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_level_time ON logs(app_type, level, timestamp, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_app_time ON logs(app_type, timestamp, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_level_time ON logs(level, timestamp, id)')
+
+
+@LOGS_MIGRATIONS.register(4, "Trigger-maintained log counters")
+def _logs_counters(conn):
+    # Per (app_type, level) row counts kept current by triggers, so page totals don't need COUNT(*)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS log_counts (
+            app_type TEXT NOT NULL,
+            level TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (app_type, level)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS log_counts_insert AFTER INSERT ON logs BEGIN
+            INSERT INTO log_counts (app_type, level, count) VALUES (new.app_type, new.level, 1)
+            ON CONFLICT(app_type, level) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS log_counts_delete AFTER DELETE ON logs BEGIN
+            UPDATE log_counts SET count = count - 1
+            WHERE app_type = old.app_type AND level = old.level;
+        END
+    ''')
+    conn.execute('DELETE FROM log_counts')
+    conn.execute('''
+        INSERT INTO log_counts (app_type, level, count)
+        SELECT app_type, level, COUNT(*) FROM logs GROUP BY app_type, level
+    ''')
+
+
+@LOGS_MIGRATIONS.register(5, "Day-partitioned log storage")
+def _logs_partitioned_storage(conn):
+    # Schema only: existing rows stay in logs_unpartitioned and are moved into day partitions
+    # in small batches after startup (log_partitions.move_legacy_logs), so a large logs table
+    # doesn't hold up boot. Partitions themselves are created on demand.
+    # log_counts gains a day column so a dropped partition takes its counts with it
+    conn.execute('DROP TRIGGER IF EXISTS log_counts_insert')
+    conn.execute('DROP TRIGGER IF EXISTS log_counts_delete')
+    conn.execute('DROP TABLE IF EXISTS log_counts')
+    conn.execute('''
+        CREATE TABLE log_counts (
+            app_type TEXT NOT NULL,
+            level TEXT NOT NULL,
+            day TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (app_type, level, day)
+        ) WITHOUT ROWID
+    ''')
+    # Log IDs continue after the existing ones, which keep their IDs when moved
+    first_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM logs').fetchone()[0]
+    conn.execute('CREATE TABLE IF NOT EXISTS log_id_sequence (last_id INTEGER NOT NULL)')
+    conn.execute('DELETE FROM log_id_sequence')
+    conn.execute('INSERT INTO log_id_sequence (last_id) VALUES (?)', (first_id,))
+    # Each partition gets its own full-text index; the single table's goes
+    for trigger in ('logs_fts_insert', 'logs_fts_delete', 'logs_fts_update'):
+        conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    conn.execute('DROP TABLE IF EXISTS logs_fts')
+    if conn.execute('SELECT EXISTS(SELECT 1 FROM logs)').fetchone()[0]:
+        conn.execute('ALTER TABLE logs RENAME TO logs_unpartitioned')
+        logger.info("Existing log entries will be moved into day partitions in the background")
+    else:
+        conn.execute('DROP TABLE logs')
+    conn.execute('''
+        CREATE VIEW logs AS SELECT NULL AS id, NULL AS timestamp, NULL AS level, NULL AS app_type,
+        NULL AS message, NULL AS logger_name, NULL AS created_at WHERE 0
+    ''')
+
+
+def _day_partition_tables(conn) -> List[str]:
+    """Day partition tables (logs_pYYYYMMDD) as named when migrations 5-7 were written"""
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? ORDER BY name",
+        ('logs_p' + '[0-9]' * 8,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+@LOGS_MIGRATIONS.register(6, "Integer epoch-millisecond log timestamps")
+def _logs_epoch_timestamps(conn):
+    def epoch_ms(value):
+        # Text timestamps were naive UTC ISO strings
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+        except ValueError:
+            # Leave unparseable values alone rather than fail the migration
+            return value
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+
+    conn.create_function("log_epoch_ms", 1, epoch_ms, deterministic=True)
+    converted = 0
+    try:
+        for table in _day_partition_tables(conn):
+            cursor = conn.execute(f'''
+                UPDATE {table} SET timestamp = log_epoch_ms(timestamp)
+                WHERE typeof(timestamp) = 'text'
+            ''')
+            converted += cursor.rowcount
+    finally:
+        conn.create_function("log_epoch_ms", 1, None)
+    logger.info(f"Converted {converted} log timestamps to epoch milliseconds")
+
+
+@LOGS_MIGRATIONS.register(7, "Indexed log context columns")
+def _logs_context_columns(conn):
+    tables = _day_partition_tables(conn)
+    for table in tables:
+        add_column_if_missing(conn, table, 'instance_name', 'TEXT')
+        add_column_if_missing(conn, table, 'cycle_id', 'TEXT')
+        add_column_if_missing(conn, table, 'operation', 'TEXT')
+        conn.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{table}_cycle_instance ON {table}(cycle_id, instance_name, timestamp, id)
+            WHERE cycle_id IS NOT NULL
+        ''')
+        conn.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{table}_instance_time ON {table}(instance_name, timestamp, id)
+            WHERE instance_name IS NOT NULL
+        ''')
+    columns = "id, timestamp, level, app_type, message, logger_name, created_at, instance_name, cycle_id, operation"
+    conn.execute('DROP VIEW IF EXISTS logs')
+    if tables:
+        body = " UNION ALL ".join(f"SELECT {columns} FROM {table}" for table in tables)
+    else:
+        body = ("SELECT NULL AS id, NULL AS timestamp, NULL AS level, NULL AS app_type, NULL AS message, "
+                "NULL AS logger_name, NULL AS created_at, NULL AS instance_name, NULL AS cycle_id, "
+                "NULL AS operation WHERE 0")
+    conn.execute(f'CREATE VIEW logs AS {body}')
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Opt-in SQL statement instrumentation for Huntarr
+When enabled, pooled connections are opened with an instrumented connection
+class that times every execute/fetch, aggregates the timings per normalized
+statement template and keeps a slow-query log with EXPLAIN QUERY PLAN output.
+
+Enable with HUNTARR_SQL_INSTRUMENTATION=true (threshold via
+HUNTARR_SLOW_QUERY_MS) or at runtime through /api/database/instrumentation.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_TEMPLATES = 500          # Distinct statement templates tracked before bucketing into "(other)"
+SAMPLES_PER_TEMPLATE = 512   # Recent latencies kept per template for percentiles
+SLOW_QUERY_LOG_SIZE = 100    # Recent slow queries kept in memory
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)', re.IGNORECASE)
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(sql: str) -> str:
+    """Reduce a SQL statement to its template (literals and IN-lists collapsed)"""
+    template = _WHITESPACE_RE.sub(' ', sql).strip()
+    template = _STRING_LITERAL_RE.sub('?', template)
+    template = _NUMBER_LITERAL_RE.sub('?', template)
+    return _IN_LIST_RE.sub('IN (?, ...)', template)
+
+
+def _percentile(sorted_samples: List[float], fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class _TemplateStats:
+    __slots__ = ("calls", "total_ms", "max_ms", "rows", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=SAMPLES_PER_TEMPLATE)
+
+
+class SQLStatsRecorder:
+    """Thread-safe aggregation of statement timings and the slow-query log"""
+
+    def __init__(self, enabled: bool = False, slow_query_ms: float = 250.0):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._stats: Dict[tuple, _TemplateStats] = {}
+        self._slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._plans: Dict[tuple, List[str]] = {}
+        self._since = time.time()
+
+    def record(self, database: str, template: str, duration_ms: float, rows: int):
+        key = (database, template)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_TEMPLATES:
+                    key = (database, "(other)")
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = _TemplateStats()
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.rows += rows
+            if duration_ms > stats.max_ms:
+                stats.max_ms = duration_ms
+            stats.samples.append(duration_ms)
+
+    def cached_plan(self, database: str, template: str) -> Optional[List[str]]:
+        return self._plans.get((database, template))
+
+    def record_slow(self, database: str, template: str, duration_ms: float, rows: int, plan: Optional[List[str]]):
+        if plan is not None:
+            self._plans[(database, template)] = plan
+        else:
+            plan = self._plans.get((database, template))
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "database": database,
+            "statement": template,
+            "duration_ms": round(duration_ms, 2),
+            "rows": rows,
+            "plan": plan or []
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+        plan_text = "; ".join(plan) if plan else "n/a"
+        logger.warning(f"Slow query on {database} ({duration_ms:.1f} ms, {rows} rows): {template} | plan: {plan_text}")
+
+    def snapshot(self, top: int = 25) -> Dict[str, Any]:
+        with self._lock:
+            items = [(key, stats.calls, stats.total_ms, stats.max_ms, stats.rows, sorted(stats.samples))
+                     for key, stats in self._stats.items()]
+            slow_queries = list(self._slow_queries)
+
+        statements = []
+        for (database, template), calls, total_ms, max_ms, rows, samples in items:
+            statements.append({
+                "database": database,
+                "statement": template,
+                "calls": calls,
+                "rows": rows,
+                "total_ms": round(total_ms, 2),
+                "avg_ms": round(total_ms / calls, 3) if calls else 0,
+                "p50_ms": round(_percentile(samples, 0.50), 3),
+                "p95_ms": round(_percentile(samples, 0.95), 3),
+                "p99_ms": round(_percentile(samples, 0.99), 3),
+                "max_ms": round(max_ms, 3)
+            })
+        statements.sort(key=lambda s: s["total_ms"], reverse=True)
+
+        return {
+            "enabled": self.enabled,
+            "slow_query_threshold_ms": self.slow_query_ms,
+            "collecting_since": datetime.fromtimestamp(self._since).isoformat(),
+            "templates_tracked": len(statements),
+            "statements": statements[:top] if top else statements,
+            "slow_queries": list(reversed(slow_queries))
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+            self._plans.clear()
+            self._since = time.time()
+
+
+_recorder = SQLStatsRecorder(
+    enabled=os.environ.get('HUNTARR_SQL_INSTRUMENTATION', 'false').lower() == 'true',
+    slow_query_ms=float(os.environ.get('HUNTARR_SLOW_QUERY_MS', 250))
+)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports execute + fetch time and row counts per statement"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._observation = None  # [sql, parameters, elapsed_ms, rows]
+
+    def _finish(self, explain: bool = True):
+        observation = self._observation
+        if observation is None:
+            return
+        self._observation = None
+        if not _recorder.enabled:
+            # Disabled at runtime; the connection is retired when it returns to the pool
+            return
+        sql, parameters, elapsed_ms, rows = observation
+        database = getattr(self.connection, "database_name", "database")
+        template = normalize_statement(sql)
+        _recorder.record(database, template, elapsed_ms, rows)
+        if elapsed_ms >= _recorder.slow_query_ms:
+            plan = None
+            if explain and _recorder.cached_plan(database, template) is None:
+                plan = self._explain(sql, parameters)
+            _recorder.record_slow(database, template, elapsed_ms, rows, plan)
+
+    def _explain(self, sql: str, parameters) -> Optional[List[str]]:
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        try:
+            # Plain cursor so the EXPLAIN itself is not instrumented
+            cursor = sqlite3.Cursor(self.connection)
+            cursor.row_factory = None
+            rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            cursor.close()
+            return [row[-1] for row in rows]
+        except sqlite3.Error as e:
+            return [f"EXPLAIN failed: {e}"]
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.description is None:
+            # Statement returns no rows - record it now with the affected row count
+            self._observation = [sql, parameters, elapsed_ms, max(self.rowcount, 0)]
+            self._finish()
+        else:
+            self._observation = [sql, parameters, elapsed_ms, 0]
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._observation = [sql, (), (time.perf_counter() - start) * 1000, max(self.rowcount, 0)]
+        self._finish(explain=False)
+        return self
+
+    def _add_fetch(self, start: float, rows: int):
+        if self._observation is not None:
+            self._observation[2] += (time.perf_counter() - start) * 1000
+            self._observation[3] += rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add_fetch(start, 0 if row is None else 1)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add_fetch(start, len(rows))
+        if len(rows) < (self.arraysize if size is None else size):
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add_fetch(start, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._add_fetch(start, 0)
+            self._finish()
+            raise
+        self._add_fetch(start, 1)
+        return row
+
+    def close(self):
+        self._finish(explain=False)
+        super().close()
+
+    def __del__(self):
+        # The connection may already be back in the pool, so never EXPLAIN here
+        try:
+            self._finish(explain=False)
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3.Connection whose statements all go through InstrumentedCursor"""
+
+    database_name = "database"
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_factory():
+    """Connection class for newly opened pooled connections"""
+    return InstrumentedConnection if _recorder.enabled else sqlite3.Connection
+
+
+def is_enabled() -> bool:
+    return _recorder.enabled
+
+
+def set_enabled(enabled: bool, slow_query_ms: float = None):
+    """Turn instrumentation on or off; pools must be recycled for open connections to follow"""
+    _recorder.enabled = bool(enabled)
+    if slow_query_ms is not None:
+        _recorder.slow_query_ms = float(slow_query_ms)
+    logger.info(f"SQL instrumentation {'enabled' if enabled else 'disabled'} (slow query threshold {_recorder.slow_query_ms} ms)")
+
+
+def get_sql_stats(top: int = 25) -> Dict[str, Any]:
+    """Per-template statement statistics and recent slow queries"""
+    return _recorder.snapshot(top=top)
+
+
+def reset_sql_stats():
+    _recorder.reset()
@@ -5,20 +5,31 @@ Centralized timezone handling with proper fallbacks
 """
 
 import os
+import time
 import pytz
 from typing import Union
 
-# Cache for timezone to avoid repeated settings lookups
+# The resolved timezone is kept until clear_timezone_cache() is called (every
+# timezone change goes through save_settings/apply_timezone, which call it).
+# Only a fallback picked because the settings could not be read is retried.
 _timezone_cache = None
-_cache_timestamp = 0
-_cache_ttl = 5  # 5 seconds cache TTL
+_cache_expires = None  # None: valid until cleared
+_retry_after_error = 5  # seconds
+# Bumped on every clear so per-formatter caches can tell the timezone may have changed
+_timezone_generation = 0
 
 
 def clear_timezone_cache():
     """Clear the timezone cache to force a fresh lookup."""
-    global _timezone_cache, _cache_timestamp
+    global _timezone_cache, _cache_expires, _timezone_generation
     _timezone_cache = None
-    _cache_timestamp = 0
+    _cache_expires = None
+    _timezone_generation += 1
+
+
+def get_timezone_generation() -> int:
+    """Counter that changes whenever the timezone cache is cleared"""
+    return _timezone_generation
 
 
 def validate_timezone(timezone_str: str) -> bool:
@@ -78,16 +89,18 @@ def get_user_timezone() -> pytz.BaseTzInfo:
     Returns:
         pytz.BaseTzInfo: The timezone object to use (always valid)
     """
-    global _timezone_cache, _cache_timestamp
+    global _timezone_cache, _cache_expires
     
     # Check cache first
-    import time
-    current_time = time.time()
-    if _timezone_cache and (current_time - _cache_timestamp) < _cache_ttl:
-        return _timezone_cache
+    tz = _timezone_cache
+    if tz is not None and (_cache_expires is None or time.monotonic() < _cache_expires):
+        return tz
     
+    generation = _timezone_generation
+    expires = None
     try:
         # First try to get timezone from user settings
+        tz = None
         try:
             from src.primary import settings_manager
             general_settings = settings_manager.load_settings("general", use_cache=False)  # Force fresh read
@@ -95,36 +108,30 @@ def get_user_timezone() -> pytz.BaseTzInfo:
             
             if timezone_name and timezone_name != "UTC":
                 tz = safe_get_timezone(timezone_name)
-                if tz:
-                    # Cache the result
-                    _timezone_cache = tz
-                    _cache_timestamp = current_time
-                    return tz
         except Exception:
-            pass  # Fall through to TZ environment variable
+            # Settings not readable (yet) - use a fallback for now and look again shortly
+            expires = time.monotonic() + _retry_after_error
         
         # Second try TZ environment variable
-        tz_env = os.environ.get('TZ')
-        if tz_env:
-            tz = safe_get_timezone(tz_env)
-            if tz:
-                # Cache the result
-                _timezone_cache = tz
-                _cache_timestamp = current_time
-                return tz
+        if tz is None:
+            tz_env = os.environ.get('TZ')
+            if tz_env:
+                tz = safe_get_timezone(tz_env)
         
         # Final fallback to UTC
-        tz = pytz.UTC
-        _timezone_cache = tz
-        _cache_timestamp = current_time
-        return tz
+        if tz is None:
+            tz = pytz.UTC
         
     except Exception:
         # Ultimate fallback if everything fails
         tz = pytz.UTC
+        expires = time.monotonic() + _retry_after_error
+    
+    # Don't cache a lookup that raced with clear_timezone_cache()
+    if generation == _timezone_generation:
         _timezone_cache = tz
-        _cache_timestamp = current_time
-        return tz
+        _cache_expires = expires
+    return tz
 
 
 def get_timezone_name() -> str: